@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+SOLACE Case Note Tag Backfill
+
+Tags every row in `case_notes` with a category from the zero-shot classifier.
+Notes are read in keyset-paginated pages (ordered by id), classified in large
+batches, and written to `case_note_tags` with batched upserts. After each page
+the last id is checkpointed in `job_checkpoints`, so a crashed run resumes
+from the last completed page. Upserts are idempotent, so replaying a page is safe.
+
+Usage:
+    python scripts/backfill_case_note_tags.py
+    python scripts/backfill_case_note_tags.py --page-size 2000 --batch-size 32 --concurrency 4
+    python scripts/backfill_case_note_tags.py --restart --dry-run
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add the backend src directory to Python path
+backend_dir = Path(__file__).resolve().parent.parent
+src_dir = backend_dir / "src"
+sys.path.insert(0, str(src_dir))
+
+from dotenv import load_dotenv
+load_dotenv(backend_dir / ".env")
+
+from config.database import get_supabase
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("backfill_case_note_tags")
+
+# Categories match CaseNotesService._determine_category
+CATEGORIES = [
+    "housing", "medical", "family", "employment", "financial",
+    "legal", "mental_health", "safety", "education", "general"
+]
+
+MAX_TEXT_CHARS = 2000
+
+
+class CaseNoteTagBackfill:
+    """Resumable bulk classifier run over the case_notes table"""
+
+    def __init__(
+        self,
+        job_name: str = "case_note_tags",
+        page_size: int = 1000,
+        batch_size: int = 32,
+        concurrency: int = 2,
+        upsert_chunk_size: int = 500,
+        dry_run: bool = False
+    ):
+        self.job_name = job_name
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.upsert_chunk_size = upsert_chunk_size
+        self.dry_run = dry_run
+        self.supabase = get_supabase()
+
+        # Human-readable labels for the classifier, mapped back to category keys
+        self.label_to_category = {category.replace("_", " "): category for category in CATEGORIES}
+        self.labels = list(self.label_to_category.keys())
+
+        from services.classification_service import classification_service
+        self.classifier = classification_service
+
+    # ===== CHECKPOINTS =====
+
+    def load_checkpoint(self) -> Dict[str, Any]:
+        """Load the last completed keyset position for this job"""
+        result = self.supabase.table("job_checkpoints").select("*").eq("job_name", self.job_name).execute()
+        if result.data:
+            return result.data[0]
+        return {"job_name": self.job_name, "last_key": None, "rows_processed": 0}
+
+    def save_checkpoint(self, last_key: str, rows_processed: int):
+        """Record that every note up to and including last_key has been tagged"""
+        if self.dry_run:
+            return
+        self.supabase.table("job_checkpoints").upsert({
+            "job_name": self.job_name,
+            "last_key": last_key,
+            "rows_processed": rows_processed,
+            "updated_at": datetime.utcnow().isoformat()
+        }, on_conflict="job_name").execute()
+
+    def reset_checkpoint(self):
+        """Forget previous progress so the next run starts from the first note"""
+        self.supabase.table("job_checkpoints").delete().eq("job_name", self.job_name).execute()
+
+    # ===== READ / WRITE =====
+
+    def fetch_page(self, after_id: Optional[str]) -> List[Dict[str, Any]]:
+        """Fetch the next page of notes with id greater than after_id"""
+        query = self.supabase.table("case_notes").select("id, title, content")
+        if after_id:
+            query = query.gt("id", after_id)
+        result = query.order("id").limit(self.page_size).execute()
+        return result.data or []
+
+    def upsert_tags(self, rows: List[Dict[str, Any]]):
+        """Write tag rows in multi-row upserts of upsert_chunk_size"""
+        if self.dry_run:
+            return
+        for start in range(0, len(rows), self.upsert_chunk_size):
+            chunk = rows[start:start + self.upsert_chunk_size]
+            self.supabase.table("case_note_tags").upsert(chunk, on_conflict="case_note_id").execute()
+
+    # ===== CLASSIFICATION =====
+
+    def classify_notes(self, notes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Classify one batch of notes and build case_note_tags rows"""
+        texts = [
+            f"{note.get('title') or ''}. {note.get('content') or ''}"[:MAX_TEXT_CHARS]
+            for note in notes
+        ]
+        results = self.classifier.classify_batch(texts, self.labels)
+        model_name = self.classifier.classifier.model.name_or_path
+
+        rows = []
+        tagged_at = datetime.utcnow().isoformat()
+        for note, result in zip(notes, results):
+            if not result.get("labels"):
+                continue
+            rows.append({
+                "case_note_id": note["id"],
+                "category": self.label_to_category[result["labels"][0]],
+                "score": round(result["scores"][0], 4),
+                "label_scores": {
+                    self.label_to_category[label]: round(score, 4)
+                    for label, score in zip(result["labels"], result["scores"])
+                },
+                "model": model_name,
+                "tagged_at": tagged_at
+            })
+        return rows
+
+    async def classify_page(self, notes: List[Dict[str, Any]], semaphore: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        """Split a page into batches and classify up to `concurrency` at once"""
+        async def run_batch(batch):
+            async with semaphore:
+                return await asyncio.to_thread(self.classify_notes, batch)
+
+        batches = [notes[i:i + self.batch_size] for i in range(0, len(notes), self.batch_size)]
+        batch_rows = await asyncio.gather(*(run_batch(batch) for batch in batches))
+        return [row for rows in batch_rows for row in rows]
+
+    # ===== DRIVER =====
+
+    async def run(self, max_rows: Optional[int] = None) -> Dict[str, Any]:
+        """Run the backfill until the table is exhausted or max_rows is reached"""
+        if not self.classifier.classifier:
+            raise RuntimeError("Classifier not available")
+
+        checkpoint = self.load_checkpoint()
+        last_key = checkpoint.get("last_key")
+        rows_processed = int(checkpoint.get("rows_processed") or 0)
+        rows_this_run = 0
+
+        if last_key:
+            logger.info(f"🔄 Resuming after id {last_key} ({rows_processed} rows already tagged)")
+        else:
+            logger.info("🚀 Starting backfill from the beginning")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started = time.perf_counter()
+
+        # Prefetch the next page while the current one is being classified
+        next_page = asyncio.create_task(asyncio.to_thread(self.fetch_page, last_key))
+
+        while True:
+            notes = await next_page
+            if not notes:
+                break
+
+            page_started = time.perf_counter()
+            page_last_key = notes[-1]["id"]
+            next_page = asyncio.create_task(asyncio.to_thread(self.fetch_page, page_last_key))
+
+            rows = await self.classify_page(notes, semaphore)
+            await asyncio.to_thread(self.upsert_tags, rows)
+
+            rows_processed += len(notes)
+            rows_this_run += len(notes)
+            last_key = page_last_key
+            await asyncio.to_thread(self.save_checkpoint, last_key, rows_processed)
+
+            elapsed = time.perf_counter() - started
+            page_elapsed = time.perf_counter() - page_started
+            logger.info(
+                f"📊 {rows_this_run} rows this run ({rows_processed} total) | "
+                f"page {len(notes) / page_elapsed:.1f} rows/s | "
+                f"overall {rows_this_run / elapsed:.1f} rows/s | last id {last_key}"
+            )
+
+            if max_rows and rows_this_run >= max_rows:
+                next_page.cancel()
+                break
+
+        elapsed = time.perf_counter() - started
+        summary = {
+            "job_name": self.job_name,
+            "rows_this_run": rows_this_run,
+            "rows_processed": rows_processed,
+            "last_key": last_key,
+            "elapsed_seconds": round(elapsed, 2),
+            "rows_per_second": round(rows_this_run / elapsed, 2) if elapsed else 0.0,
+            "dry_run": self.dry_run
+        }
+        logger.info(f"✅ Backfill finished: {summary}")
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tag historical case notes with classifier categories")
+    parser.add_argument("--page-size", type=int, default=1000, help="Notes fetched per keyset page")
+    parser.add_argument("--batch-size", type=int, default=32, help="Notes per classifier call")
+    parser.add_argument("--concurrency", type=int, default=2, help="Classifier batches run at once")
+    parser.add_argument("--upsert-chunk-size", type=int, default=500, help="Rows per upsert statement")
+    parser.add_argument("--max-rows", type=int, default=None, help="Stop after this many rows")
+    parser.add_argument("--job-name", type=str, default="case_note_tags", help="Checkpoint key")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint")
+    parser.add_argument("--dry-run", action="store_true", help="Classify without writing tags or checkpoints")
+    args = parser.parse_args()
+
+    job = CaseNoteTagBackfill(
+        job_name=args.job_name,
+        page_size=args.page_size,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        upsert_chunk_size=args.upsert_chunk_size,
+        dry_run=args.dry_run
+    )
+
+    if args.restart and not args.dry_run:
+        job.reset_checkpoint()
+
+    try:
+        asyncio.run(job.run(max_rows=args.max_rows))
+    except KeyboardInterrupt:
+        print("\n👋 Backfill interrupted - rerun to resume from the last checkpoint")
+
+
+if __name__ == "__main__":
+    main()
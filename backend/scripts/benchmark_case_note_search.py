@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+SOLACE Case Note Search Benchmark
+
+Measures full-text search (search_case_notes, GIN index on
+case_notes.search_vector) against the leading-wildcard ilike scan it
+replaces, on a synthetic corpus seeded straight into Postgres.
+
+The corpus is generated server-side with generate_series, since pushing a
+million rows through PostgREST would benchmark the network instead. Words
+are drawn with a skewed distribution over a small common vocabulary plus a
+long tail of rare terms, so queries of every selectivity exist.
+
+Usage:
+    # 1. Seed one million notes (owned by a benchmark social worker id)
+    python scripts/benchmark_case_note_search.py seed-sql --notes 1000000 \\
+        --client-id <existing clients.id> | psql "$DATABASE_URL"
+
+    # 2. Time searches through the API's database path
+    python scripts/benchmark_case_note_search.py run --repeat 20 --output bench-search.json
+
+    # 3. Remove the synthetic notes
+    python scripts/benchmark_case_note_search.py cleanup-sql | psql "$DATABASE_URL"
+"""
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add the backend src directory to Python path
+backend_dir = Path(__file__).resolve().parent.parent
+src_dir = backend_dir / "src"
+sys.path.insert(0, str(src_dir))
+
+# All synthetic notes belong to this social worker, so they are easy to find and remove
+BENCHMARK_WORKER_ID = "00000000-0000-4000-8000-00000000be01"
+
+COMMON_WORDS = [
+    "client", "reported", "visit", "home", "family", "children", "school", "support", "housing",
+    "rent", "landlord", "benefits", "application", "appointment", "follow", "medical", "doctor",
+    "medication", "employment", "job", "interview", "court", "hearing", "safety", "plan", "progress",
+    "stable", "concern", "discussed", "referral", "shelter", "food", "assistance", "counseling",
+    "therapy", "anxiety", "depression", "eviction", "notice", "utility", "payment", "transport",
+    "childcare", "custody", "caseworker", "phone", "call", "office", "week", "month", "today"
+]
+CATEGORIES = ["housing", "medical", "family", "employment", "financial", "legal", "mental_health", "safety", "education", "general"]
+PRIORITIES = ["low", "medium", "high", "urgent"]
+RARE_TERMS = 20000  # tail vocabulary: rare0 .. rare19999
+
+# (label, search text) from very common to very rare, plus prefix-only input
+QUERIES = [
+    ("common", "client"),
+    ("mid", "eviction"),
+    ("two_terms", "eviction notice"),
+    ("prefix", "evic"),
+    ("rare", "rare12345"),
+    ("no_match", "zzzyxw")
+]
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def sql_literal_array(words):
+    return "ARRAY[" + ", ".join("'" + word.replace("'", "''") + "'" for word in words) + "]::text[]"
+
+
+def seed_sql(notes, client_id, batch_size):
+    """INSERT statements for the synthetic corpus, one per batch so psql commits as it goes"""
+    client_id = str(uuid.UUID(client_id))
+    statements = [
+        "-- Synthetic case notes for scripts/benchmark_case_note_search.py",
+        "SET synchronous_commit = off;"
+    ]
+    for start in range(1, notes + 1, batch_size):
+        end = min(notes, start + batch_size - 1)
+        statements.append(f"""
+INSERT INTO case_notes (client_id, social_worker_id, title, content, category, priority, tags, status, created_at)
+SELECT
+    '{client_id}',
+    '{BENCHMARK_WORKER_ID}',
+    initcap(v.words[1 + floor(power(random(), 2) * v.n)::int]) || ' ' || v.words[1 + floor(random() * v.n)::int] || ' note',
+    (
+        SELECT string_agg(
+            CASE WHEN random() < 0.03
+                THEN 'rare' || floor(random() * {RARE_TERMS})::int
+                ELSE v.words[1 + floor(power(random(), 2) * v.n)::int]
+            END, ' ')
+        FROM generate_series(1, 60 + (g % 240)) AS w
+        WHERE g > 0
+    ),
+    v.categories[1 + (g % array_length(v.categories, 1))],
+    v.priorities[1 + (g % array_length(v.priorities, 1))],
+    ARRAY[v.words[1 + floor(random() * v.n)::int], v.words[1 + floor(random() * v.n)::int]],
+    CASE WHEN g % 10 = 0 THEN 'archived' ELSE 'active' END,
+    NOW() - (random() * INTERVAL '730 days')
+FROM generate_series({start}, {end}) AS g,
+    (SELECT {sql_literal_array(COMMON_WORDS)} AS words, {len(COMMON_WORDS)} AS n,
+            {sql_literal_array(CATEGORIES)} AS categories, {sql_literal_array(PRIORITIES)} AS priorities) AS v;""")
+    statements.append("ANALYZE case_notes;")
+    return "\n".join(statements)
+
+
+def cleanup_sql():
+    return f"DELETE FROM case_notes WHERE social_worker_id = '{BENCHMARK_WORKER_ID}';\nANALYZE case_notes;"
+
+
+def time_query(func, repeat):
+    """Per-call latencies in milliseconds and the row count of the last call"""
+    latencies_ms, rows = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = len(func())
+        latencies_ms.append((time.perf_counter() - started) * 1000)
+    return latencies_ms, rows
+
+
+def summarize(latencies_ms, rows):
+    return {
+        "rows": rows,
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+        "mean_ms": round(statistics.mean(latencies_ms), 2)
+    }
+
+
+def run_benchmark(args):
+    from dotenv import load_dotenv
+    load_dotenv(backend_dir / ".env")
+
+    from config.database import get_supabase
+    from services.case_notes_service import build_search_query
+
+    supabase = get_supabase()
+    count = supabase.table("case_notes").select("id", count="exact").eq(
+        "social_worker_id", args.worker_id
+    ).limit(1).execute().count
+    print(f"📚 Corpus: {count} notes for social worker {args.worker_id}", file=sys.stderr)
+
+    def full_text(search):
+        return supabase.rpc("search_case_notes", {
+            "p_social_worker_id": args.worker_id,
+            "p_query": build_search_query(search),
+            "p_status": "active",
+            "p_limit": args.limit
+        }).execute().data or []
+
+    def ilike(search):
+        # The pattern ClientService uses today: no index can serve a leading wildcard
+        return supabase.table("case_notes").select("id, title").eq(
+            "social_worker_id", args.worker_id
+        ).eq("status", "active").or_(
+            f"title.ilike.*{search}*,content.ilike.*{search}*"
+        ).limit(args.limit).execute().data or []
+
+    results = []
+    for label, search in QUERIES:
+        entry = {"query": label, "text": search, "full_text": summarize(*time_query(lambda: full_text(search), args.repeat))}
+        if not args.skip_ilike:
+            entry["ilike"] = summarize(*time_query(lambda: ilike(search), args.ilike_repeat))
+            entry["speedup_p50"] = round(entry["ilike"]["p50_ms"] / entry["full_text"]["p50_ms"], 2) if entry["full_text"]["p50_ms"] else None
+        results.append(entry)
+        print(
+            f"🔎 {label:<10} full-text p50={entry['full_text']['p50_ms']}ms"
+            + (f" ilike p50={entry['ilike']['p50_ms']}ms" if "ilike" in entry else ""),
+            file=sys.stderr
+        )
+
+    return {
+        "benchmark": "case_note_search",
+        "generated_at": datetime.utcnow().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform()
+        },
+        "corpus_notes": count,
+        "config": vars(args),
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark case note full-text search")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    seed = subparsers.add_parser("seed-sql", help="Print SQL that seeds the synthetic corpus")
+    seed.add_argument("--notes", type=int, default=1_000_000)
+    seed.add_argument("--client-id", type=str, required=True, help="Existing clients.id to attach notes to")
+    seed.add_argument("--batch-size", type=int, default=50_000)
+
+    subparsers.add_parser("cleanup-sql", help="Print SQL that removes the synthetic corpus")
+
+    run = subparsers.add_parser("run", help="Time searches against the seeded corpus")
+    run.add_argument("--worker-id", type=str, default=BENCHMARK_WORKER_ID)
+    run.add_argument("--limit", type=int, default=50, help="Page size, as the API uses")
+    run.add_argument("--repeat", type=int, default=20, help="Timed calls per full-text query")
+    run.add_argument("--ilike-repeat", type=int, default=3, help="Timed calls per ilike query (slow)")
+    run.add_argument("--skip-ilike", action="store_true", help="Only time full-text search")
+    run.add_argument("--output", type=str, default=None, help="Write JSON results to this file (default: stdout)")
+
+    args = parser.parse_args()
+
+    if args.command == "seed-sql":
+        print(seed_sql(args.notes, args.client_id, args.batch_size))
+        print(f"🌱 Seed SQL for {args.notes} notes written", file=sys.stderr)
+        return
+    if args.command == "cleanup-sql":
+        print(cleanup_sql())
+        return
+
+    payload = json.dumps(run_benchmark(args), indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n")
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+SOLACE Classifier Latency Benchmark
+
+Measures p50/p95/p99 latency and throughput of the zero-shot classifier
+across text length, label count and batch size. Results are written as
+JSON so runs from different releases can be diffed.
+
+Usage:
+    python scripts/benchmark_classifier.py --output bench-classifier.json
+    python scripts/benchmark_classifier.py --text-lengths 32 256 --label-counts 4 --batch-sizes 1 8
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add the backend src directory to Python path
+backend_dir = Path(__file__).resolve().parent.parent
+src_dir = backend_dir / "src"
+sys.path.insert(0, str(src_dir))
+
+VOCABULARY = [
+    "client", "housing", "rent", "eviction", "shelter", "medical", "doctor", "appointment",
+    "medication", "family", "children", "school", "custody", "job", "interview", "employment",
+    "benefits", "application", "court", "lawyer", "safety", "counseling", "therapy", "food",
+    "assistance", "utility", "bills", "transportation", "follow-up", "called", "discussed",
+    "scheduled", "referred", "reported", "needs", "support", "week", "tomorrow", "stable"
+]
+
+LABELS = [
+    "housing", "medical", "family", "employment", "financial", "legal",
+    "mental health", "safety", "education", "transportation", "food security", "general"
+]
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def make_text(rng, word_count):
+    """Build a deterministic pseudo case note with the given number of words"""
+    return " ".join(rng.choice(VOCABULARY) for _ in range(word_count)).capitalize() + "."
+
+
+def git_revision():
+    """Return the current git commit, if available"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=backend_dir, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def run_case(service, rng, text_length, label_count, batch_size, iterations):
+    """Time `iterations` classify_batch calls for one grid point"""
+    labels = LABELS[:label_count]
+    latencies_ms = []
+
+    for _ in range(iterations):
+        texts = [make_text(rng, text_length) for _ in range(batch_size)]
+        started = time.perf_counter()
+        service.classify_batch(texts, labels)
+        latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    total_seconds = sum(latencies_ms) / 1000
+    return {
+        "text_length_words": text_length,
+        "label_count": label_count,
+        "batch_size": batch_size,
+        "iterations": iterations,
+        "latency_ms": {
+            "p50": round(percentile(latencies_ms, 50), 3),
+            "p95": round(percentile(latencies_ms, 95), 3),
+            "p99": round(percentile(latencies_ms, 99), 3),
+            "mean": round(statistics.mean(latencies_ms), 3),
+            "min": round(min(latencies_ms), 3),
+            "max": round(max(latencies_ms), 3)
+        },
+        "throughput": {
+            "texts_per_second": round(batch_size * iterations / total_seconds, 3) if total_seconds else None,
+            "pairs_per_second": round(batch_size * label_count * iterations / total_seconds, 3) if total_seconds else None
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the zero-shot classifier")
+    parser.add_argument("--text-lengths", type=int, nargs="+", default=[16, 64, 256], help="Words per text")
+    parser.add_argument("--label-counts", type=int, nargs="+", default=[2, 5, 10], help="Candidate labels per call")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 16], help="Texts per call")
+    parser.add_argument("--iterations", type=int, default=30, help="Timed calls per grid point")
+    parser.add_argument("--warmup-iterations", type=int, default=3, help="Untimed calls per grid point")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed for generated texts")
+    parser.add_argument("--output", type=str, default=None, help="Write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    if max(args.label_counts) > len(LABELS):
+        parser.error(f"--label-counts must be <= {len(LABELS)}")
+
+    from services.classification_service import classification_service
+
+    if not classification_service.classifier:
+        print("❌ Classifier not available - cannot run benchmark", file=sys.stderr)
+        sys.exit(1)
+
+    warmup_seconds = classification_service.warmup()
+    print(f"✅ Classifier warm ({warmup_seconds:.2f}s)", file=sys.stderr)
+
+    results = []
+    for text_length in args.text_lengths:
+        for label_count in args.label_counts:
+            for batch_size in args.batch_sizes:
+                rng = random.Random(f"{args.seed}-{text_length}-{label_count}-{batch_size}")
+                if args.warmup_iterations:
+                    run_case(classification_service, rng, text_length, label_count, batch_size, args.warmup_iterations)
+                case = run_case(classification_service, rng, text_length, label_count, batch_size, args.iterations)
+                results.append(case)
+                print(
+                    f"📊 words={text_length} labels={label_count} batch={batch_size} "
+                    f"p50={case['latency_ms']['p50']}ms p95={case['latency_ms']['p95']}ms "
+                    f"p99={case['latency_ms']['p99']}ms texts/s={case['throughput']['texts_per_second']}",
+                    file=sys.stderr
+                )
+
+    import torch
+    import transformers
+
+    report = {
+        "benchmark": "classifier_latency",
+        "generated_at": datetime.utcnow().isoformat(),
+        "git_revision": git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "torch": torch.__version__,
+            "transformers": transformers.__version__,
+            "device": str(classification_service.classifier.device),
+            "model": classification_service.classifier.model.name_or_path
+        },
+        "config": vars(args),
+        "warmup_seconds": round(warmup_seconds, 3),
+        "label_cache": classification_service.label_cache_info(),
+        "results": results
+    }
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n")
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+SOLACE Outbound Provider Load Test
+
+Drives the real VoiceService Vapi upload path and ReportAnalysisService
+Claude path at a fixed concurrency and reports throughput, latency
+percentiles, failures and the outbound governor state as JSON. Intended to
+run against scripts/provider_standins.py, so no provider credits are spent.
+
+Usage:
+    python scripts/provider_standins.py --port 8900 --vapi-error-rate 0.05 &
+    python scripts/benchmark_providers.py --base-url http://127.0.0.1:8900 \\
+        --requests 200 --concurrency 16 --output bench-providers.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add the backend src directory to Python path
+backend_dir = Path(__file__).resolve().parent.parent
+src_dir = backend_dir / "src"
+sys.path.insert(0, str(src_dir))
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+async def run_load(name, call, requests, concurrency):
+    """Issue `requests` calls with at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], {}
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await call()
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+
+    print(f"🚀 {name}: {requests} requests at concurrency {concurrency}", file=sys.stderr)
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    result = {
+        "requests": requests,
+        "succeeded": len(latencies),
+        "failed": sum(errors.values()),
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0
+    }
+    if latencies:
+        result["latency_ms"] = {
+            "mean": round(statistics.mean(latencies) * 1000, 1),
+            "p50": round(percentile(latencies, 50) * 1000, 1),
+            "p95": round(percentile(latencies, 95) * 1000, 1),
+            "p99": round(percentile(latencies, 99) * 1000, 1),
+            "max": round(max(latencies) * 1000, 1)
+        }
+    print(f"   ✅ {result['succeeded']} ok, {result['failed']} failed, {result['throughput_rps']} req/s", file=sys.stderr)
+    return result
+
+
+async def main_async(args):
+    # Settings are read when the services are constructed, so set them before importing
+    os.environ["VAPI_API_BASE"] = args.base_url
+    os.environ["ANTHROPIC_BASE_URL"] = args.base_url
+    os.environ.setdefault("VAPI_API_KEY", "standin")
+    os.environ.setdefault("ANTHROPIC_API_KEY", "standin")
+
+    from config.http_client import close_http_session
+    from config.outbound_governor import get_governor_metrics
+    from services.voice_service import VoiceService
+    from services.report_analysis_service import ReportAnalysisService
+
+    voice_service = VoiceService()
+    report_service = ReportAnalysisService()
+    results = {}
+
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as audio_file:
+        audio_file.write(os.urandom(args.audio_kb * 1024))
+        audio_path = audio_file.name
+
+    try:
+        if "vapi" in args.providers:
+            results["vapi"] = await run_load(
+                "Vapi /file",
+                lambda: voice_service._vapi_transcribe_file(audio_path),
+                args.requests,
+                args.concurrency
+            )
+        if "anthropic" in args.providers:
+            prompt = "Summarise this case note. " * (args.prompt_words // 5)
+            results["anthropic"] = await run_load(
+                "Anthropic /v1/messages",
+                lambda: report_service._create_message(
+                    model="claude-3-5-sonnet-20241022",
+                    max_tokens=1000,
+                    messages=[{"role": "user", "content": prompt}]
+                ),
+                args.requests,
+                args.concurrency
+            )
+    finally:
+        os.remove(audio_path)
+        await close_http_session()
+
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "base_url": args.base_url,
+        "audio_kb": args.audio_kb,
+        "prompt_words": args.prompt_words,
+        "results": results,
+        "governors": get_governor_metrics()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test outbound provider calls against the stand-ins")
+    parser.add_argument("--base-url", type=str, default="http://127.0.0.1:8900")
+    parser.add_argument("--providers", nargs="+", choices=["vapi", "anthropic"], default=["vapi", "anthropic"])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--audio-kb", type=int, default=512, help="Size of the uploaded audio payload")
+    parser.add_argument("--prompt-words", type=int, default=2000, help="Approximate prompt size sent to Claude")
+    parser.add_argument("--output", type=str, default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        print(f"📄 Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
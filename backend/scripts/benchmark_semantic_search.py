@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+SOLACE Semantic Search Benchmark
+
+Builds a SemanticIndex from synthetic clustered embeddings and measures:
+  - recall@k of the float16 memory-mapped index against exact float32
+    top-k over the same owner's notes
+  - search latency percentiles, for owner-scoped and client-scoped queries
+  - incremental insert throughput and size on disk
+With --embed-queries, the local embedding model's per-query encode latency
+is measured too (the model is downloaded on first use).
+
+Usage:
+    python scripts/benchmark_semantic_search.py --notes 200000 --owners 50 --output bench-semantic.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend src directory to Python path
+backend_dir = Path(__file__).resolve().parent.parent
+src_dir = backend_dir / "src"
+sys.path.insert(0, str(src_dir))
+
+from services.semantic_index import SemanticIndex, TextEmbedder
+
+SAMPLE_QUERIES = [
+    "client worried about losing apartment",
+    "trouble paying for medication",
+    "kids missing school",
+    "feels unsafe at home",
+    "looking for work after layoff"
+]
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize_ms(latencies_ms):
+    return {
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+        "mean_ms": round(statistics.mean(latencies_ms), 3)
+    }
+
+
+def make_corpus(rng, notes, dim, clusters):
+    """Unit vectors scattered around random topic centroids"""
+    centroids = rng.standard_normal((clusters, dim)).astype(np.float32)
+    assignments = rng.integers(0, clusters, size=notes)
+    vectors = centroids[assignments] + 0.6 * rng.standard_normal((notes, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def exact_top_k(vectors, rows, query, k):
+    scores = vectors[rows] @ query
+    top = np.argsort(-scores)[:k]
+    return {int(rows[i]) for i in top}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the semantic case note index")
+    parser.add_argument("--notes", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=384, help="Embedding size (384 = all-MiniLM-L6-v2)")
+    parser.add_argument("--owners", type=int, default=50, help="Social workers the notes are spread across")
+    parser.add_argument("--clients-per-owner", type=int, default=40)
+    parser.add_argument("--clusters", type=int, default=200, help="Synthetic topics")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--insert-batch", type=int, default=1000, help="Notes per incremental upsert")
+    parser.add_argument("--embed-queries", action="store_true", help="Also time the local embedding model")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", type=str, default=None, help="Write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = make_corpus(rng, args.notes, args.dim, args.clusters)
+    owners = rng.integers(0, args.owners, size=args.notes)
+    clients = owners * args.clients_per_owner + rng.integers(0, args.clients_per_owner, size=args.notes)
+    note_ids = [f"note-{i}" for i in range(args.notes)]
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        index = SemanticIndex(index_dir, args.dim, "synthetic")
+
+        print(f"🏗️ Inserting {args.notes} notes in batches of {args.insert_batch}...", file=sys.stderr)
+        started = time.perf_counter()
+        for start in range(0, args.notes, args.insert_batch):
+            end = min(args.notes, start + args.insert_batch)
+            index.upsert(
+                [(note_ids[i], f"owner-{owners[i]}", f"client-{clients[i]}") for i in range(start, end)],
+                vectors[start:end]
+            )
+        insert_seconds = time.perf_counter() - started
+
+        # Queries are perturbed copies of real notes, so near neighbours exist
+        query_rows = rng.integers(0, args.notes, size=args.queries)
+        results = {}
+        for scope in ("owner", "client"):
+            latencies_ms, recalls = [], []
+            for row in query_rows:
+                query = vectors[row] + 0.3 * rng.standard_normal(args.dim).astype(np.float32)
+                query /= np.linalg.norm(query)
+                owner = f"owner-{owners[row]}"
+                client = f"client-{clients[row]}" if scope == "client" else None
+
+                started = time.perf_counter()
+                hits = index.search(query, owner, client_id=client, k=args.k)
+                latencies_ms.append((time.perf_counter() - started) * 1000)
+
+                mask = owners == owners[row]
+                if client:
+                    mask &= clients == clients[row]
+                truth = exact_top_k(vectors, np.flatnonzero(mask), query, args.k)
+                found = {int(note_id.split("-")[1]) for note_id, _ in hits}
+                recalls.append(len(truth & found) / len(truth))
+
+            results[scope] = {
+                "avg_rows_scanned": round(args.notes / args.owners / (args.clients_per_owner if scope == "client" else 1)),
+                f"recall_at_{args.k}": round(statistics.mean(recalls), 4),
+                "latency": summarize_ms(latencies_ms)
+            }
+            print(
+                f"🔎 {scope:<6} recall@{args.k}={results[scope][f'recall_at_{args.k}']} "
+                f"p50={results[scope]['latency']['p50_ms']}ms p99={results[scope]['latency']['p99_ms']}ms",
+                file=sys.stderr
+            )
+
+        index_stats = index.stats()
+
+    report = {
+        "benchmark": "semantic_search",
+        "generated_at": datetime.utcnow().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__
+        },
+        "config": vars(args),
+        "insert": {
+            "seconds": round(insert_seconds, 3),
+            "notes_per_second": round(args.notes / insert_seconds, 1) if insert_seconds else None
+        },
+        "index": index_stats,
+        "float32_bytes_equivalent": args.notes * args.dim * 4,
+        "search": results
+    }
+
+    if args.embed_queries:
+        embedder = TextEmbedder()
+        embedder.encode(SAMPLE_QUERIES[:1])  # load and warm up
+        latencies_ms = []
+        for _ in range(5):
+            for query in SAMPLE_QUERIES:
+                started = time.perf_counter()
+                embedder.encode([query])
+                latencies_ms.append((time.perf_counter() - started) * 1000)
+        report["query_embedding"] = {"model": embedder.model_name, **summarize_ms(latencies_ms)}
+        print(f"🧠 query embedding p50={report['query_embedding']['p50_ms']}ms", file=sys.stderr)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n")
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
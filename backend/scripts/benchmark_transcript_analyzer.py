@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+SOLACE Transcript Analyzer Microbenchmark
+
+Compares the single-pass TranscriptAnalyzer with the previous
+substring-scan implementation across transcript lengths, and measures
+analyze_many batch throughput. Results are written as JSON.
+
+Usage:
+    python scripts/benchmark_transcript_analyzer.py --output bench-analyzer.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add the backend src directory to Python path
+backend_dir = Path(__file__).resolve().parent.parent
+src_dir = backend_dir / "src"
+sys.path.insert(0, str(src_dir))
+
+from services.transcript_analyzer import (
+    TranscriptAnalyzer, CASE_KEYWORDS, URGENCY_WORDS, SENTIMENT_WEIGHTS
+)
+
+FILLER_WORDS = [
+    "client", "called", "today", "about", "the", "appointment", "and", "said", "that", "she",
+    "needs", "to", "talk", "with", "landlord", "we", "discussed", "options", "for", "next",
+    "week", "helpful", "school", "benefits", "worker", "follow", "up", "schedule", "paperwork"
+]
+LEXICON_WORDS = CASE_KEYWORDS + URGENCY_WORDS + list(SENTIMENT_WEIGHTS)
+
+
+def legacy_analyze(text):
+    """The previous VoiceService._analyze_transcript (substring scans), for comparison"""
+    if not text:
+        return {"word_count": 0, "keywords": [], "sentiment": "neutral", "urgency_indicators": []}
+
+    words = text.lower().split()
+    found_keywords = [keyword for keyword in CASE_KEYWORDS if keyword in text.lower()]
+    urgency_indicators = [word for word in URGENCY_WORDS if word in text.lower()]
+    positive_words = ["good", "better", "improving", "stable", "safe", "progress"]
+    negative_words = ["bad", "worse", "crisis", "danger", "unsafe", "problems"]
+    positive_count = sum(1 for word in positive_words if word in text.lower())
+    negative_count = sum(1 for word in negative_words if word in text.lower())
+    if positive_count > negative_count:
+        sentiment = "positive"
+    elif negative_count > positive_count:
+        sentiment = "negative"
+    else:
+        sentiment = "neutral"
+    return {
+        "word_count": len(words),
+        "keywords": found_keywords,
+        "sentiment": sentiment,
+        "urgency_indicators": urgency_indicators
+    }
+
+
+def make_transcript(rng, word_count, lexicon_rate=0.05):
+    """Deterministic pseudo transcript with a share of lexicon terms"""
+    words = [
+        rng.choice(LEXICON_WORDS) if rng.random() < lexicon_rate else rng.choice(FILLER_WORDS)
+        for _ in range(word_count)
+    ]
+    return " ".join(words).capitalize() + "."
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def time_calls(func, texts, repeat):
+    """Per-call latencies in microseconds"""
+    latencies_us = []
+    for _ in range(repeat):
+        for text in texts:
+            started = time.perf_counter()
+            func(text)
+            latencies_us.append((time.perf_counter() - started) * 1e6)
+    return latencies_us
+
+
+def summarize(latencies_us):
+    return {
+        "p50_us": round(percentile(latencies_us, 50), 2),
+        "p95_us": round(percentile(latencies_us, 95), 2),
+        "p99_us": round(percentile(latencies_us, 99), 2),
+        "mean_us": round(statistics.mean(latencies_us), 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the transcript analyzer")
+    parser.add_argument("--word-counts", type=int, nargs="+", default=[50, 500, 5000], help="Words per transcript")
+    parser.add_argument("--transcripts", type=int, default=50, help="Transcripts per word count")
+    parser.add_argument("--repeat", type=int, default=5, help="Passes over the transcript set")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Transcripts per analyze_many call")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed for generated transcripts")
+    parser.add_argument("--output", type=str, default=None, help="Write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    analyzer = TranscriptAnalyzer()
+    results = []
+
+    for word_count in args.word_counts:
+        rng = random.Random(f"{args.seed}-{word_count}")
+        texts = [make_transcript(rng, word_count) for _ in range(args.transcripts)]
+
+        legacy = summarize(time_calls(legacy_analyze, texts, args.repeat))
+        single_pass = summarize(time_calls(analyzer.analyze, texts, args.repeat))
+        results.append({
+            "word_count": word_count,
+            "transcripts": args.transcripts,
+            "legacy": legacy,
+            "single_pass": single_pass,
+            "speedup_p50": round(legacy["p50_us"] / single_pass["p50_us"], 2) if single_pass["p50_us"] else None
+        })
+        print(
+            f"📊 words={word_count} legacy p50={legacy['p50_us']}us "
+            f"single-pass p50={single_pass['p50_us']}us",
+            file=sys.stderr
+        )
+
+    rng = random.Random(f"{args.seed}-batch")
+    batch = [make_transcript(rng, rng.randint(50, 500)) for _ in range(args.batch_size)]
+    started = time.perf_counter()
+    analyzer.analyze_many(batch)
+    batch_seconds = time.perf_counter() - started
+
+    report = {
+        "benchmark": "transcript_analyzer",
+        "generated_at": datetime.utcnow().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform()
+        },
+        "config": vars(args),
+        "results": results,
+        "batch": {
+            "transcripts": args.batch_size,
+            "seconds": round(batch_seconds, 4),
+            "transcripts_per_second": round(args.batch_size / batch_seconds, 1) if batch_seconds else None
+        }
+    }
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n")
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
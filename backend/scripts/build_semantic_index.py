@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+SOLACE Semantic Index Build / Catch-up
+
+Embeds case notes into the local semantic index (SEMANTIC_INDEX_DIR).
+Notes are read in keyset pages ordered by (updated_at, id) and the position
+is checkpointed in `job_checkpoints`, so each run only embeds notes created
+or changed since the previous one. The API indexes notes it writes itself;
+run this on a schedule to pick up edits made elsewhere, or with --rebuild
+to start the index from scratch (e.g. after changing SEMANTIC_MODEL_NAME).
+It shares the index with running API workers through the index's file lock.
+
+Usage:
+    python scripts/build_semantic_index.py
+    python scripts/build_semantic_index.py --rebuild --page-size 2000
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add the backend src directory to Python path
+backend_dir = Path(__file__).resolve().parent.parent
+src_dir = backend_dir / "src"
+sys.path.insert(0, str(src_dir))
+
+from dotenv import load_dotenv
+load_dotenv(backend_dir / ".env")
+
+from config.database import get_supabase
+from services.semantic_index import semantic_search_service
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("build_semantic_index")
+
+JOB_NAME = "semantic_index"
+NOTE_COLUMNS = "id, social_worker_id, client_id, title, content, status, updated_at"
+
+
+def load_checkpoint(supabase) -> Optional[Dict[str, str]]:
+    result = supabase.table("job_checkpoints").select("last_key").eq("job_name", JOB_NAME).execute()
+    if result.data and result.data[0].get("last_key"):
+        return json.loads(result.data[0]["last_key"])
+    return None
+
+
+def save_checkpoint(supabase, last_key: Dict[str, str], rows_processed: int):
+    supabase.table("job_checkpoints").upsert({
+        "job_name": JOB_NAME,
+        "last_key": json.dumps(last_key),
+        "rows_processed": rows_processed,
+        "updated_at": datetime.utcnow().isoformat()
+    }, on_conflict="job_name").execute()
+
+
+def fetch_page(supabase, after: Optional[Dict[str, str]], page_size: int) -> List[Dict[str, Any]]:
+    """Next notes in (updated_at, id) order after the checkpoint"""
+    query = supabase.table("case_notes").select(NOTE_COLUMNS)
+    if after:
+        query = query.or_(
+            f'updated_at.gt."{after["updated_at"]}",'
+            f'and(updated_at.eq."{after["updated_at"]}",id.gt.{after["id"]})'
+        )
+    return query.order("updated_at").order("id").limit(page_size).execute().data or []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or catch up the semantic case note index")
+    parser.add_argument("--page-size", type=int, default=1000, help="Notes fetched and embedded per page")
+    parser.add_argument("--max-rows", type=int, default=None, help="Stop after this many notes")
+    parser.add_argument("--rebuild", action="store_true", help="Clear the index and embed every note again")
+    args = parser.parse_args()
+
+    supabase = get_supabase()
+    if args.rebuild:
+        semantic_search_service.index.clear()
+        supabase.table("job_checkpoints").delete().eq("job_name", JOB_NAME).execute()
+        logger.info(f"🧹 Cleared {semantic_search_service.index_dir}")
+
+    after = load_checkpoint(supabase)
+    logger.info(f"🔄 Resuming after {after}" if after else "🚀 Embedding every note")
+
+    rows_this_run = 0
+    started = time.perf_counter()
+    try:
+        while True:
+            notes = fetch_page(supabase, after, args.page_size)
+            if not notes:
+                break
+            semantic_search_service.index_notes(notes)
+            rows_this_run += len(notes)
+            after = {"updated_at": notes[-1]["updated_at"], "id": notes[-1]["id"]}
+            save_checkpoint(supabase, after, rows_this_run)
+
+            elapsed = time.perf_counter() - started
+            logger.info(f"📊 {rows_this_run} notes embedded | {rows_this_run / elapsed:.1f} notes/s")
+            if args.max_rows and rows_this_run >= args.max_rows:
+                break
+    except KeyboardInterrupt:
+        print("\n👋 Interrupted - rerun to resume from the last checkpoint")
+
+    logger.info(f"✅ Index holds {len(semantic_search_service.index)} notes: {semantic_search_service.index.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+SOLACE Near-Duplicate Case Note Clustering
+
+Finds groups of near-identical case notes (voice retries, copy-paste) across
+the existing `case_notes` table with the same MinHash/LSH settings the API
+uses on insert (NEAR_DUP_* env vars). Notes are read in keyset pages ordered
+by (created_at, id) and bucketed per (social worker, client); candidate pairs
+that share an LSH band are verified against NEAR_DUP_THRESHOLD and joined
+into clusters with union-find. The oldest note of a cluster is its canonical
+note.
+
+Options:
+  --write       upsert every non-canonical note into `case_note_duplicates`
+  --load-index  also load every signature into the shared Redis index, so
+                notes written before the API started are seen on insert
+
+Usage:
+    python scripts/cluster_near_duplicate_notes.py --output duplicates.json
+    python scripts/cluster_near_duplicate_notes.py --social-worker-id <uuid> --write --load-index
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add the backend src directory to Python path
+backend_dir = Path(__file__).resolve().parent.parent
+src_dir = backend_dir / "src"
+sys.path.insert(0, str(src_dir))
+
+from dotenv import load_dotenv
+load_dotenv(backend_dir / ".env")
+
+from config.database import get_supabase
+from config.redis_client import init_redis, get_redis
+from services.near_duplicates import near_duplicate_index, cluster_pairs
+from utils.pagination import keyset_filter
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("cluster_near_duplicate_notes")
+
+NOTE_COLUMNS = "id, social_worker_id, client_id, title, content, created_at"
+
+
+def fetch_page(supabase, social_worker_id: Optional[str], after: Optional[Tuple[str, str]], page_size: int) -> List[Dict[str, Any]]:
+    query = supabase.table("case_notes").select(NOTE_COLUMNS).neq("status", "deleted")
+    if social_worker_id:
+        query = query.eq("social_worker_id", social_worker_id)
+    if after:
+        query = query.or_(keyset_filter(*after, descending=False))
+    return query.order("created_at").order("id").limit(page_size).execute().data or []
+
+
+def write_duplicates(supabase, rows: List[Dict[str, Any]], chunk_size: int = 500):
+    for start in range(0, len(rows), chunk_size):
+        supabase.table("case_note_duplicates").upsert(
+            rows[start:start + chunk_size], on_conflict="case_note_id"
+        ).execute()
+
+
+async def run(args) -> Dict[str, Any]:
+    supabase = get_supabase()
+    index = near_duplicate_index
+    if args.load_index:
+        await init_redis()
+        if index._redis() is None:
+            logger.warning("⚠️ Redis is not available - --load-index has nothing to load into")
+
+    buckets: Dict[str, List[int]] = {}
+    signatures = []
+    notes: List[Dict[str, Any]] = []
+    pairs = []
+    candidate_checks = 0
+
+    started = time.perf_counter()
+    after = None
+    try:
+        while True:
+            page = await asyncio.to_thread(fetch_page, supabase, args.social_worker_id, after, args.page_size)
+            for note in page:
+                position = len(notes)
+                signature = index.hasher.signature(f"{note.get('title') or ''}\n{note.get('content') or ''}")
+                scope = index.scope(note["social_worker_id"], note["client_id"])
+
+                candidates = set()
+                for key in index.band_keys(scope, signature):
+                    bucket = buckets.setdefault(key, [])
+                    candidates.update(bucket)
+                    bucket.append(position)
+                for candidate in candidates:
+                    candidate_checks += 1
+                    if index.hasher.similarity(signature, signatures[candidate]) >= index.threshold:
+                        pairs.append((candidate, position))
+
+                if args.load_index:
+                    await index.add(note["id"], scope, signature)
+                notes.append({"id": note["id"], "client_id": note["client_id"],
+                              "title": note.get("title"), "created_at": note["created_at"],
+                              "chars": len(note.get("content") or "")})
+                signatures.append(signature)
+
+            if page:
+                elapsed = time.perf_counter() - started
+                logger.info(f"📊 {len(notes)} notes hashed | {len(pairs)} near-duplicate pairs | {len(notes) / elapsed:.1f} notes/s")
+            if len(page) < args.page_size or (args.max_rows and len(notes) >= args.max_rows):
+                break
+            after = (page[-1]["created_at"], page[-1]["id"])
+    except KeyboardInterrupt:
+        print("\n👋 Interrupted - reporting the notes read so far", file=sys.stderr)
+    finally:
+        if args.load_index:
+            await get_redis().close()
+
+    elapsed = time.perf_counter() - started
+
+    # Notes are read oldest first, so the smallest position is the canonical note
+    clusters = []
+    for members in cluster_pairs(range(len(notes)), pairs):
+        members.sort()
+        canonical = members[0]
+        clusters.append({
+            "canonical": notes[canonical],
+            "duplicates": [
+                {**notes[member], "similarity": round(index.hasher.similarity(signatures[canonical], signatures[member]), 3)}
+                for member in members[1:]
+            ]
+        })
+    clusters.sort(key=lambda cluster: len(cluster["duplicates"]), reverse=True)
+
+    duplicate_rows = [
+        {
+            "case_note_id": duplicate["id"],
+            "canonical_note_id": cluster["canonical"]["id"],
+            "similarity": duplicate["similarity"],
+            "detected_at": datetime.utcnow().isoformat()
+        }
+        for cluster in clusters for duplicate in cluster["duplicates"]
+    ]
+    if args.write and duplicate_rows:
+        await asyncio.to_thread(write_duplicates, supabase, duplicate_rows)
+        logger.info(f"💾 Recorded {len(duplicate_rows)} duplicates in case_note_duplicates")
+
+    return {
+        "job": "cluster_near_duplicate_notes",
+        "generated_at": datetime.utcnow().isoformat(),
+        "config": {**vars(args), "near_duplicates": index.stats()},
+        "summary": {
+            "notes_scanned": len(notes),
+            "candidate_checks": candidate_checks,
+            "near_duplicate_pairs": len(pairs),
+            "clusters": len(clusters),
+            "duplicate_notes": len(duplicate_rows),
+            "duplicate_content_chars": sum(duplicate["chars"] for cluster in clusters for duplicate in cluster["duplicates"]),
+            "seconds": round(elapsed, 3),
+            "notes_per_second": round(len(notes) / elapsed, 1) if elapsed else None
+        },
+        "clusters": clusters[:args.max_clusters]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster near-duplicate case notes")
+    parser.add_argument("--social-worker-id", type=str, default=None, help="Only this social worker's notes")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--max-rows", type=int, default=None, help="Stop after this many notes")
+    parser.add_argument("--max-clusters", type=int, default=100, help="Largest clusters listed in the output")
+    parser.add_argument("--write", action="store_true", help="Upsert duplicates into case_note_duplicates")
+    parser.add_argument("--load-index", action="store_true", help="Load signatures into the shared Redis index")
+    parser.add_argument("--output", type=str, default=None, help="Write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    summary = report["summary"]
+    print(
+        f"✅ {summary['notes_scanned']} notes, {summary['clusters']} clusters, "
+        f"{summary['duplicate_notes']} near-duplicates ({summary['seconds']}s)",
+        file=sys.stderr
+    )
+
+    payload = json.dumps(report, indent=2, default=str)
+    if args.output:
+        Path(args.output).write_text(payload + "\n")
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+SOLACE Provider Stand-ins
+
+Local HTTP servers that implement the slice of the Vapi and Anthropic APIs
+the backend uses, with configurable latency, error rates and payload sizes,
+so voice and report endpoints can be load-tested offline.
+
+    Vapi:      POST /file (multipart upload), GET /file
+    Anthropic: POST /v1/messages
+
+Latency distributions (milliseconds):
+    fixed:100            always 100 ms
+    uniform:50:300       uniformly between 50 and 300 ms
+    lognormal:120:1500   median 120 ms, p99 1500 ms (long tail)
+
+Usage:
+    python scripts/provider_standins.py --port 8900 \\
+        --vapi-latency lognormal:400:3000 --vapi-error-rate 0.02 \\
+        --anthropic-latency lognormal:2000:9000 --anthropic-rate-limit-rate 0.05
+
+Then point the backend at it:
+    VAPI_API_BASE=http://localhost:8900 VAPI_API_KEY=standin
+    ANTHROPIC_BASE_URL=http://localhost:8900 ANTHROPIC_API_KEY=standin
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional
+
+from fastapi import FastAPI, Request, UploadFile, File
+from fastapi.responses import JSONResponse
+
+FILLER_WORDS = [
+    "client", "reported", "housing", "stable", "follow", "up", "scheduled", "benefits",
+    "application", "submitted", "children", "school", "appointment", "progress", "support"
+]
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """Turn a latency spec into a sampler returning seconds"""
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(":") if value]
+
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0] / 1000.0
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(values[0], values[1]) / 1000.0
+    if kind == "lognormal" and len(values) == 2:
+        median, p99 = values
+        sigma = math.log(p99 / median) / 2.326  # z-score of the 99th percentile
+        return lambda: random.lognormvariate(math.log(median), sigma) / 1000.0
+    raise argparse.ArgumentTypeError(f"Invalid latency spec: {spec}")
+
+
+def filler_text(words: int) -> str:
+    return " ".join(random.choice(FILLER_WORDS) for _ in range(words)).capitalize() + "."
+
+
+class ProviderBehaviour:
+    """Latency and failure injection for one stand-in provider"""
+
+    def __init__(self, name: str, latency: Callable[[], float], error_rate: float, rate_limit_rate: float):
+        self.name = name
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.requests = 0
+        self.injected_errors = 0
+        self.injected_rate_limits = 0
+
+    async def simulate(self) -> Optional[JSONResponse]:
+        """Sleep for a sampled latency; return an error response to inject, or None"""
+        self.requests += 1
+        await asyncio.sleep(self.latency())
+
+        roll = random.random()
+        if roll < self.rate_limit_rate:
+            self.injected_rate_limits += 1
+            return JSONResponse(
+                status_code=429,
+                content={"type": "error", "error": {"type": "rate_limit_error", "message": "Stand-in rate limit"}},
+                headers={"Retry-After": "1"}
+            )
+        if roll < self.rate_limit_rate + self.error_rate:
+            self.injected_errors += 1
+            return JSONResponse(
+                status_code=random.choice([500, 502, 503]),
+                content={"type": "error", "error": {"type": "api_error", "message": "Stand-in server error"}}
+            )
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "injected_errors": self.injected_errors,
+            "injected_rate_limits": self.injected_rate_limits
+        }
+
+
+def create_app(args) -> FastAPI:
+    app = FastAPI(title="SOLACE provider stand-ins")
+    vapi = ProviderBehaviour("vapi", args.vapi_latency, args.vapi_error_rate, args.vapi_rate_limit_rate)
+    claude = ProviderBehaviour("anthropic", args.anthropic_latency, args.anthropic_error_rate, args.anthropic_rate_limit_rate)
+    uploaded_files: Dict[str, Dict[str, Any]] = {}
+
+    # ===== VAPI =====
+
+    @app.post("/file")
+    async def vapi_upload_file(file: UploadFile = File(...)):
+        size = 0
+        while True:
+            chunk = await file.read(1024 * 1024)
+            if not chunk:
+                break
+            size += len(chunk)
+
+        error = await vapi.simulate()
+        if error:
+            return error
+
+        file_id = str(uuid.uuid4())
+        record = {
+            "id": file_id,
+            "name": file.filename,
+            "originalName": file.filename,
+            "bytes": size,
+            "mimetype": file.content_type,
+            "status": "done",
+            "createdAt": datetime.utcnow().isoformat() + "Z",
+            "parsedTextUrl": None
+        }
+        uploaded_files[file_id] = record
+        return record
+
+    @app.get("/file")
+    async def vapi_list_files():
+        error = await vapi.simulate()
+        if error:
+            return error
+        return list(uploaded_files.values())[-100:]
+
+    # ===== ANTHROPIC =====
+
+    @app.post("/v1/messages")
+    async def anthropic_messages(request: Request):
+        body = await request.json()
+        error = await claude.simulate()
+        if error:
+            return error
+
+        # Reports parse the reply as JSON, so answer with every field either report asks for
+        words = args.completion_words
+        content = {
+            "summary": filler_text(words),
+            "executive_summary": filler_text(words),
+            "key_insights": [filler_text(12) for _ in range(3)],
+            "recommendations": [filler_text(12) for _ in range(3)],
+            "notable_trends": [filler_text(10) for _ in range(2)],
+            "outcome_trends": [filler_text(10) for _ in range(3)],
+            "success_factors": [filler_text(10) for _ in range(3)],
+            "improvement_areas": [filler_text(10) for _ in range(3)],
+            "strategic_recommendations": [filler_text(12) for _ in range(3)],
+            "performance_indicators": {
+                "client_satisfaction_trend": "positive",
+                "case_resolution_efficiency": "improved",
+                "workload_management": "optimal"
+            },
+            "service_available": True
+        }
+        prompt_chars = sum(len(str(message.get("content", ""))) for message in body.get("messages", []))
+        text = json.dumps(content)
+        return {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "standin"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": prompt_chars // 4, "output_tokens": len(text) // 4}
+        }
+
+    # ===== STAND-IN STATUS =====
+
+    @app.get("/standin/stats")
+    async def standin_stats():
+        return {"vapi": vapi.stats(), "anthropic": claude.stats()}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run local Vapi / Anthropic stand-in servers")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+    parser.add_argument("--vapi-latency", type=parse_latency, default=parse_latency("lognormal:300:2000"))
+    parser.add_argument("--vapi-error-rate", type=float, default=0.0, help="Share of 5xx responses")
+    parser.add_argument("--vapi-rate-limit-rate", type=float, default=0.0, help="Share of 429 responses")
+    parser.add_argument("--anthropic-latency", type=parse_latency, default=parse_latency("lognormal:1500:8000"))
+    parser.add_argument("--anthropic-error-rate", type=float, default=0.0, help="Share of 5xx responses")
+    parser.add_argument("--anthropic-rate-limit-rate", type=float, default=0.0, help="Share of 429 responses")
+    parser.add_argument("--completion-words", type=int, default=60, help="Words per summary field in Claude replies")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    import uvicorn
+
+    print(f"🧪 Provider stand-ins listening on http://{args.host}:{args.port}", file=sys.stderr)
+    print(f"   VAPI_API_BASE=http://{args.host}:{args.port}", file=sys.stderr)
+    print(f"   ANTHROPIC_BASE_URL=http://{args.host}:{args.port}", file=sys.stderr)
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
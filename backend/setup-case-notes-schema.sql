@@ -100,6 +100,11 @@ CREATE INDEX IF NOT EXISTS idx_case_notes_category ON case_notes(category);
 CREATE INDEX IF NOT EXISTS idx_case_notes_priority ON case_notes(priority);
 CREATE INDEX IF NOT EXISTS idx_case_notes_status ON case_notes(status);
 
+-- Keyset pagination: listings walk (created_at, id) newest first within one
+-- social worker or client, so each page is a single index range scan
+CREATE INDEX IF NOT EXISTS idx_case_notes_worker_created_id ON case_notes(social_worker_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_case_notes_client_created_id ON case_notes(client_id, created_at DESC, id DESC);
+
 CREATE INDEX IF NOT EXISTS idx_voice_sessions_vapi_session ON voice_sessions(vapi_session_id);
 CREATE INDEX IF NOT EXISTS idx_voice_sessions_client_id ON voice_sessions(client_id);
 CREATE INDEX IF NOT EXISTS idx_voice_sessions_social_worker ON voice_sessions(social_worker_id);
@@ -108,3 +113,257 @@ CREATE INDEX IF NOT EXISTS idx_voice_sessions_started_at ON voice_sessions(start
 CREATE INDEX IF NOT EXISTS idx_voice_transcripts_session ON voice_transcripts(voice_session_id);
 CREATE INDEX IF NOT EXISTS idx_voice_transcripts_case_note ON voice_transcripts(case_note_id);
 CREATE INDEX IF NOT EXISTS idx_voice_transcripts_speaker ON voice_transcripts(speaker);
+
+-- Webhook ingestion: redelivered utterances are ignored, and sessions first seen
+-- through a Vapi webhook are created before a social worker is attached
+CREATE UNIQUE INDEX IF NOT EXISTS idx_voice_transcripts_session_start ON voice_transcripts(voice_session_id, start_time_seconds);
+ALTER TABLE voice_sessions ALTER COLUMN social_worker_id DROP NOT NULL;
+
+-- Classifier tags for case notes (written by scripts/backfill_case_note_tags.py)
+CREATE TABLE IF NOT EXISTS case_note_tags (
+    case_note_id UUID PRIMARY KEY REFERENCES case_notes(id) ON DELETE CASCADE,
+    category VARCHAR(50) NOT NULL,
+    score DECIMAL(5,4), -- Classifier confidence for the chosen category
+    label_scores JSONB, -- Score for every candidate label
+    model VARCHAR(100),
+    tagged_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_case_note_tags_category ON case_note_tags(category);
+
+-- Progress checkpoints for resumable batch jobs
+CREATE TABLE IF NOT EXISTS job_checkpoints (
+    job_name VARCHAR(100) PRIMARY KEY,
+    last_key TEXT, -- Last keyset pagination key fully processed
+    rows_processed BIGINT DEFAULT 0,
+    state JSONB,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Full-text search over case notes: title (weight A), tags (B) and content (C)
+-- in one generated tsvector behind a GIN index. array_to_string is only STABLE,
+-- so tags go through an IMMUTABLE wrapper to be usable in a generated column.
+CREATE OR REPLACE FUNCTION case_note_tags_text(tags TEXT[]) RETURNS TEXT
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    AS $$ SELECT coalesce(array_to_string(tags, ' '), '') $$;
+
+ALTER TABLE case_notes ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', case_note_tags_text(tags)), 'B') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'C')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_case_notes_search ON case_notes USING GIN (search_vector);
+
+-- Ranked search with highlighted snippets (called through PostgREST rpc).
+-- p_query is a to_tsquery expression built by CaseNotesService, e.g. 'evict:* & hous:*'.
+-- Snippets are generated only for the returned page, since ts_headline re-parses content.
+CREATE OR REPLACE FUNCTION search_case_notes(
+    p_social_worker_id UUID,
+    p_query TEXT,
+    p_client_id UUID DEFAULT NULL,
+    p_category TEXT DEFAULT NULL,
+    p_priority TEXT DEFAULT NULL,
+    p_status TEXT DEFAULT NULL,
+    p_limit INTEGER DEFAULT 50
+) RETURNS TABLE (note JSONB, rank REAL, snippet TEXT)
+    LANGUAGE sql STABLE
+    AS $$
+    WITH query AS (
+        SELECT to_tsquery('english', p_query) AS q
+    ), ranked AS (
+        SELECT n.*, ts_rank_cd(n.search_vector, query.q) AS search_rank
+        FROM case_notes n, query
+        WHERE n.social_worker_id = p_social_worker_id
+          AND n.search_vector @@ query.q
+          AND (p_client_id IS NULL OR n.client_id = p_client_id)
+          AND (p_category IS NULL OR n.category = p_category)
+          AND (p_priority IS NULL OR n.priority = p_priority)
+          AND (p_status IS NULL OR n.status = p_status)
+        ORDER BY search_rank DESC, n.created_at DESC, n.id DESC
+        LIMIT p_limit
+    )
+    SELECT
+        to_jsonb(ranked) - 'search_vector' - 'search_rank',
+        ranked.search_rank,
+        ts_headline('english', ranked.content, query.q,
+                    'StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2')
+    FROM ranked, query
+    ORDER BY ranked.search_rank DESC, ranked.created_at DESC, ranked.id DESC
+$$;
+
+-- Bulk sync: a client-generated key per note, unique per social worker, so
+-- retried uploads are skipped by ON CONFLICT DO NOTHING (NULL keys never conflict)
+ALTER TABLE case_notes ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(100);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_case_notes_idempotency ON case_notes(social_worker_id, idempotency_key);
+
+-- Daily analytics rollup: note counts per social worker, UTC day, category,
+-- priority and intake method. Statement-level triggers fold each INSERT /
+-- UPDATE / DELETE into the rollup as signed deltas (one grouped upsert per
+-- statement, so a bulk insert costs one rollup write per group, not per row),
+-- and any `days` window is answered by summing rollup rows.
+CREATE TABLE IF NOT EXISTS case_note_daily_stats (
+    social_worker_id UUID NOT NULL,
+    day DATE NOT NULL,
+    category VARCHAR(50) NOT NULL,
+    priority VARCHAR(20) NOT NULL,
+    intake_method VARCHAR(20) NOT NULL,
+    notes INTEGER NOT NULL DEFAULT 0,
+    voice_notes INTEGER NOT NULL DEFAULT 0, -- has_voice_recording or voice intake
+    tts_notes INTEGER NOT NULL DEFAULT 0, -- tts_generated
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (social_worker_id, day, category, priority, intake_method)
+);
+
+CREATE OR REPLACE FUNCTION case_note_daily_stats_refresh() RETURNS TRIGGER
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    changed TEXT;
+BEGIN
+    changed := CASE TG_OP
+        WHEN 'INSERT' THEN 'SELECT n.*, 1 AS sign FROM new_rows n'
+        WHEN 'DELETE' THEN 'SELECT o.*, -1 AS sign FROM old_rows o'
+        ELSE 'SELECT o.*, -1 AS sign FROM old_rows o UNION ALL SELECT n.*, 1 AS sign FROM new_rows n'
+    END;
+
+    -- Edits that do not move a note between groups net to zero and write nothing
+    EXECUTE format($sql$
+        INSERT INTO case_note_daily_stats AS s
+            (social_worker_id, day, category, priority, intake_method, notes, voice_notes, tts_notes)
+        SELECT
+            social_worker_id,
+            (created_at AT TIME ZONE 'UTC')::date,
+            coalesce(category, 'general'),
+            coalesce(priority, 'medium'),
+            coalesce(intake_method, 'manual'),
+            sum(sign),
+            coalesce(sum(sign) FILTER (WHERE has_voice_recording OR intake_method = 'voice'), 0),
+            coalesce(sum(sign) FILTER (WHERE tts_generated), 0)
+        FROM (%s) AS changed
+        WHERE status IS DISTINCT FROM 'deleted'
+        GROUP BY 1, 2, 3, 4, 5
+        HAVING sum(sign) <> 0
+            OR sum(sign) FILTER (WHERE has_voice_recording OR intake_method = 'voice') <> 0
+            OR sum(sign) FILTER (WHERE tts_generated) <> 0
+        ON CONFLICT (social_worker_id, day, category, priority, intake_method) DO UPDATE SET
+            notes = s.notes + EXCLUDED.notes,
+            voice_notes = s.voice_notes + EXCLUDED.voice_notes,
+            tts_notes = s.tts_notes + EXCLUDED.tts_notes,
+            updated_at = NOW()
+    $sql$, changed);
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_case_note_daily_stats_insert ON case_notes;
+CREATE TRIGGER trg_case_note_daily_stats_insert AFTER INSERT ON case_notes
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION case_note_daily_stats_refresh();
+
+DROP TRIGGER IF EXISTS trg_case_note_daily_stats_update ON case_notes;
+CREATE TRIGGER trg_case_note_daily_stats_update AFTER UPDATE ON case_notes
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION case_note_daily_stats_refresh();
+
+DROP TRIGGER IF EXISTS trg_case_note_daily_stats_delete ON case_notes;
+CREATE TRIGGER trg_case_note_daily_stats_delete AFTER DELETE ON case_notes
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION case_note_daily_stats_refresh();
+
+-- Recompute the whole rollup from case_notes (initial backfill, or repair)
+CREATE OR REPLACE FUNCTION rebuild_case_note_daily_stats() RETURNS VOID
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    LOCK TABLE case_notes IN SHARE MODE;
+    DELETE FROM case_note_daily_stats;
+    INSERT INTO case_note_daily_stats
+        (social_worker_id, day, category, priority, intake_method, notes, voice_notes, tts_notes)
+    SELECT
+        social_worker_id,
+        (created_at AT TIME ZONE 'UTC')::date,
+        coalesce(category, 'general'),
+        coalesce(priority, 'medium'),
+        coalesce(intake_method, 'manual'),
+        count(*),
+        count(*) FILTER (WHERE has_voice_recording OR intake_method = 'voice'),
+        count(*) FILTER (WHERE tts_generated)
+    FROM case_notes
+    WHERE status IS DISTINCT FROM 'deleted'
+    GROUP BY 1, 2, 3, 4, 5;
+END
+$$;
+
+SELECT rebuild_case_note_daily_stats();
+
+-- Analytics for the last p_days UTC days (today included), from the rollup only
+CREATE OR REPLACE FUNCTION case_note_analytics(p_social_worker_id UUID, p_days INTEGER)
+    RETURNS JSONB
+    LANGUAGE sql STABLE
+    AS $$
+    WITH window_rows AS (
+        SELECT *
+        FROM case_note_daily_stats
+        WHERE social_worker_id = p_social_worker_id
+          AND day > (NOW() AT TIME ZONE 'UTC')::date - p_days
+    )
+    SELECT jsonb_build_object(
+        'total_notes', (SELECT coalesce(sum(notes), 0) FROM window_rows),
+        'voice_notes', (SELECT coalesce(sum(voice_notes), 0) FROM window_rows),
+        'tts_generated', (SELECT coalesce(sum(tts_notes), 0) FROM window_rows),
+        'category_distribution', (
+            SELECT coalesce(jsonb_object_agg(category, total), '{}'::jsonb)
+            FROM (SELECT category, sum(notes) AS total FROM window_rows GROUP BY category HAVING sum(notes) > 0) AS c
+        ),
+        'priority_distribution', (
+            SELECT coalesce(jsonb_object_agg(priority, total), '{}'::jsonb)
+            FROM (SELECT priority, sum(notes) AS total FROM window_rows GROUP BY priority HAVING sum(notes) > 0) AS p
+        ),
+        'intake_method_distribution', (
+            SELECT coalesce(jsonb_object_agg(intake_method, total), '{}'::jsonb)
+            FROM (SELECT intake_method, sum(notes) AS total FROM window_rows GROUP BY intake_method HAVING sum(notes) > 0) AS m
+        )
+    )
+$$;
+
+-- Case-file export pages transcripts and tasks in (created_at, id) order
+CREATE INDEX IF NOT EXISTS idx_voice_transcripts_created_id ON voice_transcripts(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_client_created_id ON tasks(client_id, created_at, id);
+
+-- Near-duplicate notes found by scripts/cluster_near_duplicate_notes.py;
+-- the canonical note is the oldest note of its cluster
+CREATE TABLE IF NOT EXISTS case_note_duplicates (
+    case_note_id UUID PRIMARY KEY REFERENCES case_notes(id) ON DELETE CASCADE,
+    canonical_note_id UUID NOT NULL REFERENCES case_notes(id) ON DELETE CASCADE,
+    similarity REAL NOT NULL,
+    detected_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_case_note_duplicates_canonical ON case_note_duplicates(canonical_note_id);
+
+-- Incremental client summaries (ReportAnalysisService.generate_client_case_summary):
+-- the rolling summary per client and the notes it covers up to the watermark
+CREATE TABLE IF NOT EXISTS client_summaries (
+    social_worker_id UUID NOT NULL,
+    client_id UUID NOT NULL REFERENCES clients(id) ON DELETE CASCADE,
+    summary TEXT NOT NULL,
+    last_note_created_at TIMESTAMP WITH TIME ZONE,
+    last_note_id UUID,
+    notes_summarized INTEGER DEFAULT 0,
+    model VARCHAR(100),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (social_worker_id, client_id)
+);
+
+-- Chunk, merge and fold summaries keyed by a hash of prompt version, model and input
+CREATE TABLE IF NOT EXISTS case_summary_cache (
+    content_hash CHAR(64) PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL CHECK (kind IN ('chunk', 'merge', 'fold')),
+    summary TEXT NOT NULL,
+    model VARCHAR(100),
+    input_tokens INTEGER DEFAULT 0,
+    output_tokens INTEGER DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
@@ -0,0 +1,125 @@
+"""
+Shared HTTP client for outbound provider calls (Vapi, etc.)
+"""
+
+import os
+import asyncio
+import logging
+import weakref
+import aiohttp
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# Shared HTTP sessions, one per event loop (normally one per worker process)
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+
+class HttpPoolMetrics:
+    """Connection pool counters collected through aiohttp tracing"""
+
+    def __init__(self):
+        self.requests_started = 0
+        self.requests_failed = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Build a TraceConfig that updates these counters"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            self.requests_started += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+        async def on_request_end(session, context, params):
+            self.in_flight = max(0, self.in_flight - 1)
+
+        async def on_request_exception(session, context, params):
+            self.requests_failed += 1
+            self.in_flight = max(0, self.in_flight - 1)
+
+        async def on_connection_create_end(session, context, params):
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self.connections_reused += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def snapshot(self, pool_limit: int) -> Dict[str, Any]:
+        """Current pool utilisation and connection reuse rate"""
+        connections_total = self.connections_created + self.connections_reused
+        return {
+            "pool_limit": pool_limit,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "pool_utilization": round(self.in_flight / pool_limit, 3) if pool_limit else 0.0,
+            "requests_started": self.requests_started,
+            "requests_failed": self.requests_failed,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "connection_reuse_rate": round(self.connections_reused / connections_total, 3) if connections_total else 0.0
+        }
+
+
+http_metrics = HttpPoolMetrics()
+pool_limit = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+
+
+async def init_http_session() -> aiohttp.ClientSession:
+    """Initialize the shared HTTP session for the current event loop"""
+    connector = aiohttp.TCPConnector(
+        limit=pool_limit,
+        limit_per_host=int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20")),
+        keepalive_timeout=float(os.getenv("HTTP_KEEPALIVE_SECONDS", "30")),
+        use_dns_cache=True,
+        ttl_dns_cache=int(os.getenv("HTTP_DNS_CACHE_TTL_SECONDS", "300")),
+        enable_cleanup_closed=True
+    )
+
+    session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(
+            total=float(os.getenv("HTTP_DEFAULT_TIMEOUT_SECONDS", "30")),
+            connect=float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "10"))
+        ),
+        trace_configs=[http_metrics.trace_config()]
+    )
+    _sessions[asyncio.get_running_loop()] = session
+    logger.info(f"✅ Shared HTTP session initialized (pool limit {pool_limit})")
+    return session
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the shared HTTP session, creating it on first use.
+
+    Sessions are bound to an event loop, so callers running their own loop
+    (scripts, queue workers) get a separate session for that loop.
+    """
+    session = _sessions.get(asyncio.get_running_loop())
+    if session is None or session.closed:
+        return await init_http_session()
+    return session
+
+
+async def close_http_session():
+    """Close the current event loop's HTTP session and its pooled connections"""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+        logger.info("👋 Shared HTTP session closed")
+
+
+def get_http_pool_metrics() -> Dict[str, Any]:
+    """Pool utilisation and connection reuse metrics for health endpoints"""
+    return http_metrics.snapshot(pool_limit)
@@ -0,0 +1,60 @@
+"""
+Job queue configuration for background processing (rq)
+"""
+
+import os
+import logging
+from typing import Optional
+from redis import Redis
+from rq import Queue
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPTION_QUEUE = "transcription"
+
+# Global queue connection
+_queue_connection: Optional[Redis] = None
+_queues = {}
+
+
+def _use_fake_redis() -> bool:
+    """Local mode backed by fakeredis, for tests and single-process development"""
+    return os.getenv("JOB_QUEUE_MODE", "redis").lower() == "fake"
+
+
+def get_queue_connection() -> Redis:
+    """Get the Redis connection used by rq (rq requires a synchronous client)"""
+    global _queue_connection
+
+    if _queue_connection is None:
+        if _use_fake_redis():
+            import fakeredis
+            _queue_connection = fakeredis.FakeStrictRedis()
+            logger.info("🧪 Job queue using fakeredis (JOB_QUEUE_MODE=fake)")
+        else:
+            redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
+            _queue_connection = Redis.from_url(
+                redis_url,
+                socket_connect_timeout=5,
+                socket_timeout=5
+            )
+            logger.info("✅ Job queue connected to Redis")
+
+    return _queue_connection
+
+
+def get_queue(name: str = TRANSCRIPTION_QUEUE) -> Queue:
+    """
+    Get an rq queue by name.
+
+    In fake mode jobs run synchronously in the enqueuing process, so tests
+    see the same job lifecycle without a separate worker.
+    """
+    if name not in _queues:
+        _queues[name] = Queue(
+            name,
+            connection=get_queue_connection(),
+            is_async=not _use_fake_redis(),
+            default_timeout=int(os.getenv("JOB_TIMEOUT_SECONDS", "900"))
+        )
+    return _queues[name]
@@ -0,0 +1,260 @@
+"""
+Outbound call governor for external providers (Vapi, Anthropic)
+
+Each provider gets a concurrency cap, deadline-aware retries with jittered
+exponential backoff, and a circuit breaker. While a breaker is open, calls
+fail immediately with CircuitOpenError so callers drop straight to their
+mock/fallback paths instead of queueing behind a slow provider.
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while its circuit breaker is open"""
+    pass
+
+
+class TransientProviderError(Exception):
+    """A provider failure worth retrying (rate limits, 5xx responses)"""
+    pass
+
+
+DEFAULT_RETRYABLE: Tuple[Type[BaseException], ...] = (
+    TransientProviderError,
+    asyncio.TimeoutError,
+    ConnectionError
+)
+
+
+class ProviderGovernor:
+    """
+    Governs calls to one provider.
+
+    - At most max_concurrency calls in flight per event loop; callers wait
+      for a slot, but never past their deadline.
+    - Retryable failures (see `retryable`) are retried up to max_attempts with
+      full-jitter backoff, as long as the deadline leaves room.
+    - failure_threshold consecutive retryable failures open the circuit for
+      reset_timeout seconds. After that a single trial call is let through
+      (half-open); success closes the circuit, failure re-opens it.
+      Non-retryable errors (e.g. a 400) do not count against the provider.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int = 8,
+        call_timeout: float = 30.0,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.call_timeout = call_timeout
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        # asyncio primitives are bound to one loop; rq jobs run their own loops
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+        self.metrics = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "rejected_open": 0,
+            "times_opened": 0,
+            "in_flight": 0,
+            "waiting": 0,
+            "last_error": None
+        }
+
+    @classmethod
+    def from_env(cls, name: str, prefix: str, **defaults) -> "ProviderGovernor":
+        """
+        Build a governor from {PREFIX}_MAX_CONCURRENCY, {PREFIX}_CALL_TIMEOUT_SECONDS,
+        {PREFIX}_MAX_ATTEMPTS, {PREFIX}_RETRY_BASE_DELAY_SECONDS,
+        {PREFIX}_RETRY_MAX_DELAY_SECONDS, {PREFIX}_BREAKER_FAILURE_THRESHOLD and
+        {PREFIX}_BREAKER_RESET_SECONDS; defaults are keyword arguments of __init__.
+        """
+        settings = {
+            "max_concurrency": ("MAX_CONCURRENCY", int, 8),
+            "call_timeout": ("CALL_TIMEOUT_SECONDS", float, 30.0),
+            "max_attempts": ("MAX_ATTEMPTS", int, 3),
+            "base_delay": ("RETRY_BASE_DELAY_SECONDS", float, 0.5),
+            "max_delay": ("RETRY_MAX_DELAY_SECONDS", float, 8.0),
+            "failure_threshold": ("BREAKER_FAILURE_THRESHOLD", int, 5),
+            "reset_timeout": ("BREAKER_RESET_SECONDS", float, 30.0)
+        }
+        return cls(name=name, **{
+            param: cast(os.getenv(f"{prefix}_{env_key}", str(defaults.get(param, default))))
+            for param, (env_key, cast, default) in settings.items()
+        })
+
+    # ===== CIRCUIT BREAKER =====
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = "half_open"
+            return self._state
+
+    def _before_call(self):
+        """Admit a call or raise CircuitOpenError"""
+        state = self.state
+        with self._lock:
+            if state == "open" or (state == "half_open" and self._trial_in_flight):
+                self.metrics["rejected_open"] += 1
+                raise CircuitOpenError(f"{self.name} circuit is open, failing fast")
+            if state == "half_open":
+                self._trial_in_flight = True
+
+    def _record_success(self):
+        with self._lock:
+            self.metrics["successes"] += 1
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+            if self._state != "closed":
+                logger.info(f"✅ {self.name} circuit closed")
+            self._state = "closed"
+
+    def _record_failure(self, error: BaseException):
+        with self._lock:
+            self.metrics["failures"] += 1
+            self.metrics["last_error"] = f"{type(error).__name__}: {error}"[:200]
+            self._consecutive_failures += 1
+            was_trial = self._trial_in_flight
+            self._trial_in_flight = False
+            if was_trial or self._consecutive_failures >= self.failure_threshold:
+                if self._state != "open":
+                    self.metrics["times_opened"] += 1
+                    logger.warning(f"⚠️ {self.name} circuit opened after {self._consecutive_failures} failures")
+                self._state = "open"
+                self._opened_at = time.monotonic()
+
+    def _release_trial(self):
+        """A half-open trial that ended without a verdict (e.g. non-retryable error)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    # ===== CALLS =====
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    async def call(
+        self,
+        func: Callable[[], Awaitable[T]],
+        deadline: Optional[float] = None,
+        retryable: Tuple[Type[BaseException], ...] = DEFAULT_RETRYABLE
+    ) -> T:
+        """
+        Run func() under this provider's limits.
+
+        deadline is an absolute time.monotonic() value for the whole call
+        including retries; without one, each attempt gets call_timeout.
+        """
+        last_error: Optional[BaseException] = None
+        for attempt in range(self.max_attempts):
+            remaining = deadline - time.monotonic() if deadline else None
+            if remaining is not None and remaining <= 0:
+                break
+
+            self._before_call()
+            semaphore = self._semaphore()
+            self.metrics["waiting"] += 1
+            try:
+                await asyncio.wait_for(semaphore.acquire(), timeout=remaining)
+            except asyncio.TimeoutError:
+                self._release_trial()
+                last_error = asyncio.TimeoutError(f"{self.name}: no free call slot before deadline")
+                break
+            finally:
+                self.metrics["waiting"] -= 1
+
+            self.metrics["calls"] += 1
+            self.metrics["in_flight"] += 1
+            try:
+                timeout = self.call_timeout
+                if deadline:
+                    timeout = min(timeout, max(0.0, deadline - time.monotonic()))
+                result = await asyncio.wait_for(func(), timeout=timeout)
+                self._record_success()
+                return result
+            except retryable as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self.metrics["timeouts"] += 1
+                last_error = e
+                self._record_failure(e)
+            except BaseException:
+                self._release_trial()
+                raise
+            finally:
+                self.metrics["in_flight"] -= 1
+                semaphore.release()
+
+            if attempt + 1 < self.max_attempts:
+                delay = self._backoff(attempt)
+                if deadline and time.monotonic() + delay >= deadline:
+                    break
+                self.metrics["retries"] += 1
+                logger.warning(f"⚠️ {self.name} call failed ({last_error}), retry {attempt + 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+        raise last_error or asyncio.TimeoutError(f"{self.name}: deadline exceeded")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "max_concurrency": self.max_concurrency,
+            **self.metrics
+        }
+
+
+# Shared governors, one per provider
+_governors: Dict[str, ProviderGovernor] = {}
+
+
+def get_governor(name: str, **defaults) -> ProviderGovernor:
+    """The governor for a provider, configured from {NAME}_* environment variables"""
+    if name not in _governors:
+        _governors[name] = ProviderGovernor.from_env(name, name.upper(), **defaults)
+    return _governors[name]
+
+
+def get_governor_metrics() -> Dict[str, Any]:
+    return {name: governor.stats() for name, governor in _governors.items()}
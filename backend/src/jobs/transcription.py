@@ -0,0 +1,155 @@
+"""
+Background transcription jobs (run by rq workers)
+"""
+
+import os
+import asyncio
+import logging
+from typing import Dict, Any, Optional
+from rq import get_current_job
+from rq.job import Job
+from rq.exceptions import NoSuchJobError
+
+from config.job_queue import get_queue, get_queue_connection, TRANSCRIPTION_QUEUE
+
+logger = logging.getLogger(__name__)
+
+
+def job_id_for_session(session_id: str) -> str:
+    """Voice sessions map one-to-one onto transcription jobs"""
+    return f"voice-session:{session_id}"
+
+
+def _set_progress(stage: str, progress: int):
+    """Record the current stage on the running job so status polling can see it"""
+    job = get_current_job()
+    if job is None:
+        return
+    job.meta["stage"] = stage
+    job.meta["progress"] = progress
+    job.save_meta()
+
+
+async def _process_voice_upload(
+    file_path: str,
+    session_id: str,
+    client_id: Optional[str],
+    user_id: str,
+    create_note: bool,
+    content_hash: Optional[str]
+) -> Dict[str, Any]:
+    """Transcribe a stored upload and optionally turn it into a case note"""
+    from services.voice_service import voice_service
+    from services.case_notes_service import CaseNotesService
+    from config.http_client import close_http_session
+    from config.redis_client import init_redis, get_redis
+
+    # Workers never run the API lifespan, so connect Redis here; the client is
+    # bound to this job's event loop, like the HTTP session below. Without it
+    # the transcript cache, note reuse and near-duplicate index fall back to
+    # per-process state.
+    await init_redis()
+    try:
+        _set_progress("transcribing", 10)
+        transcript_result = await voice_service.transcribe_audio_file(file_path, client_id, session_id, content_hash)
+
+        result = {
+            "session_id": session_id,
+            "transcript": transcript_result
+        }
+
+        note_client_id = client_id or transcript_result.get("client_id")
+        if create_note and note_client_id:
+            _set_progress("creating_note", 80)
+            result["case_note"] = await CaseNotesService().create_note_from_transcript(
+                transcript_result=transcript_result,
+                client_id=note_client_id,
+                user_id=user_id,
+                session_id=session_id
+            )
+
+        _set_progress("completed", 100)
+        return result
+
+    finally:
+        # Each job runs on its own event loop, so release its clients with it
+        await close_http_session()
+        await get_redis().close()
+
+
+def process_voice_upload(
+    file_path: str,
+    session_id: str,
+    client_id: Optional[str],
+    user_id: str,
+    create_note: bool = True,
+    content_hash: Optional[str] = None
+) -> Dict[str, Any]:
+    """rq entry point: process one uploaded recording, then delete the temp file"""
+    logger.info(f"🎙️ Processing voice upload for session {session_id}")
+    try:
+        return asyncio.run(_process_voice_upload(file_path, session_id, client_id, user_id, create_note, content_hash))
+    except Exception as e:
+        _set_progress("failed", 100)
+        logger.error(f"❌ Voice upload job failed for session {session_id}: {e}")
+        raise
+    finally:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def enqueue_voice_upload(
+    file_path: str,
+    session_id: str,
+    client_id: Optional[str],
+    user_id: str,
+    create_note: bool = True,
+    content_hash: Optional[str] = None
+) -> Job:
+    """Queue a stored upload for transcription and return the rq job"""
+    job_id = job_id_for_session(session_id)
+    return get_queue(TRANSCRIPTION_QUEUE).enqueue(
+        process_voice_upload,
+        file_path,
+        session_id,
+        client_id,
+        user_id,
+        create_note,
+        content_hash,
+        job_id=job_id,
+        meta={"user_id": user_id, "stage": "queued", "progress": 0},
+        result_ttl=int(os.getenv("JOB_RESULT_TTL_SECONDS", "86400")),
+        failure_ttl=int(os.getenv("JOB_FAILURE_TTL_SECONDS", "86400"))
+    )
+
+
+def get_voice_upload_status(session_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    """Look up the transcription job for a session; None if missing or not owned by user"""
+    try:
+        job = Job.fetch(job_id_for_session(session_id), connection=get_queue_connection())
+    except NoSuchJobError:
+        return None
+
+    if job.meta.get("user_id") != user_id:
+        return None
+
+    status = job.get_status(refresh=True)
+    status_value = getattr(status, "value", status)
+    response = {
+        "session_id": session_id,
+        "job_id": job.id,
+        "status": status_value,
+        "stage": job.meta.get("stage"),
+        "progress": job.meta.get("progress", 0),
+        "enqueued_at": job.enqueued_at.isoformat() if job.enqueued_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "ended_at": job.ended_at.isoformat() if job.ended_at else None
+    }
+
+    if status_value == "finished":
+        response["result"] = job.result
+    elif status_value == "failed":
+        error_lines = (job.exc_info or "").strip().splitlines()
+        response["error"] = error_lines[-1] if error_lines else "Unknown error"
+
+    return response
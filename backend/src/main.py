@@ -2,6 +2,8 @@ import sys
 import os
 from pathlib import Path
 import logging
+import asyncio
+from contextlib import asynccontextmanager
 from typing import Dict, Any
 
 # Add the current directory to the Python path
@@ -27,7 +29,13 @@ import uvicorn
 
 # Import our modules
 from config.database import get_supabase, test_database_connection
-from routers import clients, case_notes, tasks, reports, google_calendar, classify
+from config.redis_client import init_redis, get_redis
+from config.http_client import init_http_session, close_http_session, get_http_pool_metrics
+from config.outbound_governor import get_governor_metrics
+from services.webhook_ingestion import vapi_webhook_ingestor
+from services.semantic_index import semantic_search_service
+from services.near_duplicates import near_duplicate_index
+from routers import clients, case_notes, case_notes_public, tasks, reports, google_calendar, classify
 from middleware.auth import get_current_user
 
 # Log startup information
@@ -60,6 +68,38 @@ logger.info("🔍 Testing database connection...")
 db_status = test_database_connection()
 logger.info(f"🔧 Database Status: {'✅ Connected' if db_status else '❌ Failed'}")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown hooks"""
+    # One pooled HTTP session per worker for outbound provider calls
+    await init_http_session()
+    
+    # Redis backs shared caches (falls back to a no-op client when unavailable)
+    await init_redis()
+    
+    # Batched writer for Vapi webhooks
+    vapi_webhook_ingestor.start()
+    
+    # Background embedding of new/updated notes (SEMANTIC_SEARCH_ENABLED)
+    semantic_search_service.start()
+    
+    # Warm up the zero-shot classifier so the first request doesn't pay for it
+    if os.getenv("CLASSIFIER_WARMUP", "true").lower() == "true":
+        from services.classification_service import classification_service
+        logger.info("🔥 Warming up classification model...")
+        try:
+            warmup_seconds = await asyncio.to_thread(classification_service.warmup)
+            logger.info(f"✅ Classifier warmup finished in {warmup_seconds:.2f}s")
+        except Exception as e:
+            logger.warning(f"⚠️ Classifier warmup failed: {e}")
+
+    yield
+    
+    await vapi_webhook_ingestor.stop()
+    await semantic_search_service.stop()
+    await close_http_session()
+    await get_redis().close()
+
 # Create FastAPI app
 app = FastAPI(
     title="SOLACE Backend API",
@@ -67,7 +107,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    redirect_slashes=False  # Disable automatic slash redirects
+    redirect_slashes=False,  # Disable automatic slash redirects
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -80,6 +121,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Location", "Upload-Offset", "Upload-Length", "X-Next-Cursor"],  # Resumable uploads, keyset paging
 )
 
 # Health check endpoint (no authentication required)
@@ -100,7 +142,12 @@ async def health_check():
             "case_notes": True,
             "tasks": True,
             "reports": True
-        }
+        },
+        "http_pool": get_http_pool_metrics(),
+        "vapi_webhooks": vapi_webhook_ingestor.stats(),
+        "semantic_search": semantic_search_service.stats(),
+        "near_duplicates": near_duplicate_index.stats(),
+        "outbound_providers": get_governor_metrics()
     }
     
     logger.info(f"📊 Health Status: {health_status}")
@@ -123,6 +170,13 @@ app.include_router(
     dependencies=[Depends(get_current_user)]
 )
 
+# No router-level auth: these routes authenticate each request themselves
+app.include_router(
+    case_notes_public.router,
+    prefix="/api/case-notes",
+    tags=["case_notes"]
+)
+
 app.include_router(
     tasks.router,
     prefix="/api/tasks",
@@ -178,6 +178,16 @@ class CaseNoteCreate(CaseNoteBase):
     voice_quality_score: Optional[float] = Field(None, ge=0.0, le=1.0)
 
 
+class CaseNoteBulkItem(CaseNoteCreate):
+    """One note in a bulk create; the key makes retries of the same note no-ops"""
+    idempotency_key: str = Field(..., min_length=1, max_length=100)
+
+
+class CaseNoteBulkCreate(BaseModel):
+    """Bulk case note creation request (offline sync)"""
+    notes: List[Dict[str, Any]] = Field(..., min_length=1)
+
+
 class CaseNoteUpdate(BaseModel):
     """Case note update model"""
     title: Optional[str] = Field(None, min_length=1, max_length=200)
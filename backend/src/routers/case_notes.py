@@ -2,43 +2,82 @@
 Case notes API endpoints with voice integration
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, UploadFile, File, Form
+import os
+import json
+import uuid
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, UploadFile, File, Form, Header, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import Dict, Any, List, Optional
 from middleware.auth import get_current_user
+from models.case_note import CaseNoteBulkCreate
 from services.case_notes_service import CaseNotesService
-from services.voice_service import voice_service
+from services.voice_service import voice_service, AudioFileTooLargeError
+from services.resumable_upload import (
+    resumable_upload_service, UploadNotFoundError, UploadOffsetMismatchError, UploadLockedError
+)
+from utils.pagination import InvalidCursorError
+from services.semantic_index import semantic_search_service
+from services.case_export import case_file_exporter, EXPORT_FORMATS
+from jobs.transcription import enqueue_voice_upload, get_voice_upload_status
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # Initialize service
 case_notes_service = CaseNotesService()
 
+ALLOWED_AUDIO_TYPES = ["audio/wav", "audio/mp3", "audio/m4a", "audio/mp4", "audio/webm", "audio/mpeg", "audio/x-m4a", "audio/x-wav", "audio/x-mp3"]
+
+# Files from one batch upload transcribed at the same time
+VOICE_BATCH_MAX_FILES = int(os.getenv("VOICE_BATCH_MAX_FILES", "20"))
+VOICE_BATCH_CONCURRENCY = int(os.getenv("VOICE_BATCH_CONCURRENCY", "3"))
+
+CASE_NOTE_BULK_MAX_NOTES = int(os.getenv("CASE_NOTE_BULK_MAX_NOTES", "1000"))
+
 # ===== CASE NOTES CRUD ENDPOINTS =====
 
 @router.get("/", response_model=List[Dict[str, Any]])
 async def get_case_notes(
+    response: Response,
     client_id: Optional[str] = Query(None),
-    skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     category: Optional[str] = Query(None),
     priority: Optional[str] = Query(None),
-    status: str = Query("active"),
+    note_status: Optional[str] = Query("active", alias="status"),
     search: Optional[str] = Query(None),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
-    """Get case notes with optional filtering"""
+    """
+    Get case notes with optional filtering, newest first.
+    
+    The body stays a plain list; when more notes exist, the X-Next-Cursor
+    response header carries the token to pass as ?cursor= for the next page.
+    With ?search=, the best-ranked full-text matches are returned instead
+    (prefix matching, search_rank and a highlighted search_snippet per note).
+    """
     try:
-        case_notes = await case_notes_service.get_case_notes(
+        page = await case_notes_service.get_case_notes(
             user_id=current_user["id"],
             client_id=client_id,
-            skip=skip,
             limit=limit,
+            cursor=cursor,
             category=category,
             priority=priority,
-            status=status,
+            status=note_status,
             search=search
         )
-        return case_notes
+        if page["next_cursor"]:
+            response.headers["X-Next-Cursor"] = page["next_cursor"]
+        return page["items"]
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -73,6 +112,112 @@ async def create_case_note(
             detail=f"Failed to create case note: {str(e)}"
         )
 
+@router.post("/bulk", response_model=Dict[str, Any])
+async def bulk_create_case_notes(
+    request_data: CaseNoteBulkCreate,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Create many case notes in one request (offline sync).
+    
+    Each note needs a client-generated idempotency_key. Results come back per
+    item, in input order: created, existing (the key was already stored, so
+    the stored note is returned), invalid (with validation errors) or failed.
+    Retrying the whole request is always safe.
+    """
+    if len(request_data.notes) > CASE_NOTE_BULK_MAX_NOTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {CASE_NOTE_BULK_MAX_NOTES} notes per request"
+        )
+    try:
+        return await case_notes_service.bulk_create_case_notes(request_data.notes, current_user["id"])
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create case notes: {str(e)}"
+        )
+
+@router.get("/export")
+async def export_case_file(
+    request: Request,
+    client_id: Optional[str] = Query(None),
+    from_date: Optional[date] = Query(None, description="First day included (UTC)"),
+    to_date: Optional[date] = Query(None, description="Last day included (UTC)"),
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Stream a case file: the client record, case notes, voice transcripts and
+    tasks for a client and/or date range, as NDJSON or CSV. The body is
+    gzip-encoded when the client accepts it. Rows are paged from the database
+    as they are sent, so exports of any size use constant memory.
+    """
+    if not client_id and not from_date and not to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Specify client_id and/or a from_date/to_date range"
+        )
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="from_date must not be after to_date"
+        )
+    
+    date_from = datetime.combine(from_date, time.min, tzinfo=timezone.utc) if from_date else None
+    date_to = datetime.combine(to_date + timedelta(days=1), time.min, tzinfo=timezone.utc) if to_date else None
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "").lower()
+    
+    file_name = f"case-file-{client_id or 'all'}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.{export_format}"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{file_name}"',
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "no-store"
+    }
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    
+    return StreamingResponse(
+        case_file_exporter.stream(
+            current_user["id"],
+            export_format=export_format,
+            gzip=use_gzip,
+            client_id=client_id,
+            date_from=date_from,
+            date_to=date_to
+        ),
+        media_type=EXPORT_FORMATS[export_format],
+        headers=headers
+    )
+
+@router.get("/semantic-search", response_model=List[Dict[str, Any]])
+async def semantic_search_case_notes(
+    q: str = Query(..., min_length=2, max_length=500),
+    client_id: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Find notes by meaning rather than keywords ("client worried about losing
+    apartment" finds eviction notes). Results are the user's notes, best
+    match first, each with a semantic_score (cosine similarity).
+    """
+    if not semantic_search_service.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Semantic search is not enabled"
+        )
+    try:
+        hits = await semantic_search_service.search(current_user["id"], q, client_id=client_id, k=limit)
+        return await case_notes_service.get_case_notes_by_ids(
+            current_user["id"], [note_id for note_id, _ in hits], scores=dict(hits)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Semantic search failed: {str(e)}"
+        )
+
 @router.get("/{note_id}/", response_model=Dict[str, Any])
 async def get_case_note(
     note_id: str,
@@ -136,29 +281,64 @@ async def upload_voice_session_audio(
     session_id: str,
     audio_file: UploadFile = File(...),
     client_id: Optional[str] = Form(None),
+    async_processing: Optional[bool] = Form(None),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Upload audio file for voice transcription"""
     try:
         # Validate file type
-        allowed_types = ["audio/wav", "audio/mp3", "audio/m4a", "audio/mp4", "audio/webm", "audio/mpeg", "audio/x-m4a", "audio/x-wav", "audio/x-mp3"]
-        if audio_file.content_type not in allowed_types:
+        if audio_file.content_type not in ALLOWED_AUDIO_TYPES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported file type: {audio_file.content_type}. Allowed: {', '.join(allowed_types)}"
+                detail=f"Unsupported file type: {audio_file.content_type}. Allowed: {', '.join(ALLOWED_AUDIO_TYPES)}"
             )
         
-        # Read audio file
-        audio_content = await audio_file.read()
-        
-        # Transcribe using voice service
-        from services.voice_service import voice_service
-        transcript_result = await voice_service.transcribe_audio_buffer(
-            audio_buffer=audio_content,
-            filename=audio_file.filename,
-            client_id=client_id,
-            session_id=session_id
-        )
+        # Stream audio to disk, then read its headers to reject or route it before transcription
+        temp_path, _, content_hash = await voice_service.save_upload_to_temp_file(audio_file)
+        enqueued = False
+        try:
+            audio_metadata = await voice_service.probe_audio(temp_path)
+            
+            if async_processing is None:
+                async_processing = (
+                    os.getenv("VOICE_ASYNC_UPLOADS", "false").lower() == "true"
+                    or voice_service.should_route_async(audio_metadata)
+                )
+            
+            if async_processing:
+                # Hand the stored upload to a transcription worker
+                job = await asyncio.to_thread(
+                    enqueue_voice_upload,
+                    temp_path,
+                    session_id,
+                    client_id,
+                    current_user["id"],
+                    content_hash=content_hash
+                )
+                enqueued = True
+                
+                return JSONResponse(
+                    status_code=status.HTTP_202_ACCEPTED,
+                    content={
+                        "message": "Audio accepted for transcription",
+                        "session_id": session_id,
+                        "job_id": job.id,
+                        "status": "queued",
+                        "status_url": f"/api/case-notes/voice-sessions/{session_id}/status",
+                        "audio_metadata": audio_metadata
+                    }
+                )
+            
+            transcript_result = await voice_service.transcribe_audio_file(
+                temp_path,
+                client_id=client_id,
+                session_id=session_id,
+                content_hash=content_hash
+            )
+        finally:
+            # The worker owns the file once the job is queued
+            if not enqueued and os.path.exists(temp_path):
+                os.remove(temp_path)
         
         # Create organized case note from transcript
         organized_note = await case_notes_service.create_note_from_transcript(
@@ -177,12 +357,301 @@ async def upload_voice_session_audio(
         
     except HTTPException:
         raise
+    except AudioFileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to process audio upload: {str(e)}"
         )
 
+@router.post("/voice-uploads/batch")
+async def upload_voice_batch(
+    audio_files: List[UploadFile] = File(...),
+    client_id: Optional[str] = Form(None),
+    auto_create_note: bool = Form(True),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Upload several recordings in one request.
+
+    Each file is streamed to disk, then all files are transcribed concurrently
+    (at most VOICE_BATCH_CONCURRENCY at a time). Results stream back as
+    newline-delimited JSON, one line per file in completion order.
+    """
+    if len(audio_files) > VOICE_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many files: {len(audio_files)}. Maximum per batch: {VOICE_BATCH_MAX_FILES}"
+        )
+    
+    # Stream every file to disk before responding; UploadFiles are closed once the handler returns
+    accepted = []
+    rejected = []
+    for index, audio_file in enumerate(audio_files):
+        if audio_file.content_type not in ALLOWED_AUDIO_TYPES:
+            rejected.append(_batch_failure(index, audio_file.filename, f"Unsupported file type: {audio_file.content_type}"))
+            continue
+        try:
+            temp_path, file_size, content_hash = await voice_service.save_upload_to_temp_file(audio_file)
+            accepted.append({
+                "index": index,
+                "filename": audio_file.filename,
+                "path": temp_path,
+                "size": file_size,
+                "content_hash": content_hash,
+                "session_id": str(uuid.uuid4())
+            })
+        except AudioFileTooLargeError as e:
+            rejected.append(_batch_failure(index, audio_file.filename, str(e)))
+    
+    return StreamingResponse(
+        _stream_batch_results(accepted, rejected, client_id, auto_create_note, current_user["id"]),
+        media_type="application/x-ndjson"
+    )
+
+def _batch_failure(index: int, filename: Optional[str], error: str) -> Dict[str, Any]:
+    return {"type": "result", "index": index, "filename": filename, "status": "failed", "error": error}
+
+async def _process_batch_file(
+    item: Dict[str, Any],
+    client_id: Optional[str],
+    auto_create_note: bool,
+    user_id: str,
+    semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """Transcribe one stored batch file and optionally create its case note"""
+    try:
+        async with semaphore:
+            transcript_result = await voice_service.transcribe_audio_file(
+                item["path"], client_id, item["session_id"], item["content_hash"]
+            )
+            result = {
+                "type": "result",
+                "index": item["index"],
+                "filename": item["filename"],
+                "status": "completed",
+                "session_id": transcript_result.get("session_id", item["session_id"]),
+                "transcript": transcript_result
+            }
+            note_client_id = client_id or transcript_result.get("client_id")
+            if auto_create_note and note_client_id:
+                result["case_note"] = await case_notes_service.create_note_from_transcript(
+                    transcript_result=transcript_result,
+                    client_id=note_client_id,
+                    user_id=user_id,
+                    session_id=result["session_id"]
+                )
+            return result
+    except Exception as e:
+        return _batch_failure(item["index"], item["filename"], str(e))
+    finally:
+        if os.path.exists(item["path"]):
+            os.remove(item["path"])
+
+async def _stream_batch_results(
+    accepted: List[Dict[str, Any]],
+    rejected: List[Dict[str, Any]],
+    client_id: Optional[str],
+    auto_create_note: bool,
+    user_id: str
+):
+    """NDJSON lines: accepted, one result per file as it finishes, then a summary"""
+    semaphore = asyncio.Semaphore(VOICE_BATCH_CONCURRENCY)
+    tasks = [
+        asyncio.create_task(_process_batch_file(item, client_id, auto_create_note, user_id, semaphore))
+        for item in accepted
+    ]
+    completed = 0
+    try:
+        yield json.dumps({"type": "accepted", "files": len(accepted) + len(rejected), "processing": len(accepted)}) + "\n"
+        for failure in rejected:
+            yield json.dumps(failure) + "\n"
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            if result["status"] == "completed":
+                completed += 1
+            yield json.dumps(result, default=str) + "\n"
+        yield json.dumps({
+            "type": "summary",
+            "completed": completed,
+            "failed": len(accepted) + len(rejected) - completed
+        }) + "\n"
+    finally:
+        # Client went away: stop outstanding work and drop files that never started
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for item in accepted:
+            if os.path.exists(item["path"]):
+                os.remove(item["path"])
+
+# Resumable uploads: create, then PATCH chunks at the current offset;
+# GET returns the offset to resume from after a dropped connection.
+
+@router.post("/voice-sessions/{session_id}/uploads", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
+async def create_resumable_upload(
+    session_id: str,
+    response: Response,
+    upload_request: Dict[str, Any] = Body(...),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Start a resumable audio upload for a voice session"""
+    try:
+        if "total_size" not in upload_request:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="total_size is required"
+            )
+        
+        upload = await resumable_upload_service.create_upload(
+            session_id=session_id,
+            user_id=current_user["id"],
+            filename=upload_request.get("filename", "audio.wav"),
+            total_size=int(upload_request["total_size"]),
+            client_id=upload_request.get("client_id")
+        )
+        response.headers["Location"] = f"/api/case-notes/voice-sessions/{session_id}/uploads/{upload['upload_id']}"
+        response.headers["Upload-Offset"] = str(upload["offset"])
+        return upload
+        
+    except HTTPException:
+        raise
+    except AudioFileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create upload: {str(e)}"
+        )
+
+@router.get("/voice-sessions/{session_id}/uploads/{upload_id}", response_model=Dict[str, Any])
+async def get_resumable_upload(
+    session_id: str,
+    upload_id: str,
+    response: Response,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Get the received offset of a resumable upload"""
+    try:
+        upload = await resumable_upload_service.get_offset(upload_id, session_id, current_user["id"])
+        response.headers["Upload-Offset"] = str(upload["offset"])
+        response.headers["Upload-Length"] = str(upload["total_size"])
+        return upload
+    except UploadNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve upload: {str(e)}"
+        )
+
+@router.patch("/voice-sessions/{session_id}/uploads/{upload_id}", response_model=Dict[str, Any])
+async def append_resumable_upload_chunk(
+    session_id: str,
+    upload_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Append a raw chunk (request body) starting at Upload-Offset"""
+    try:
+        upload = await resumable_upload_service.append_chunk(
+            upload_id=upload_id,
+            session_id=session_id,
+            user_id=current_user["id"],
+            offset=upload_offset,
+            chunks=request.stream()
+        )
+        response.headers["Upload-Offset"] = str(upload["offset"])
+        if upload["status"] == "completed":
+            response.status_code = status.HTTP_202_ACCEPTED
+        return upload
+        
+    except UploadNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except UploadOffsetMismatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+            headers={"Upload-Offset": str(e.expected_offset)}
+        )
+    except UploadLockedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_423_LOCKED,
+            detail=str(e)
+        )
+    except AudioFileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to store upload chunk: {str(e)}"
+        )
+
+@router.delete("/voice-sessions/{session_id}/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_resumable_upload(
+    session_id: str,
+    upload_id: str,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Abort a resumable upload and discard received data"""
+    try:
+        await resumable_upload_service.abort_upload(upload_id, session_id, current_user["id"])
+    except UploadNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to abort upload: {str(e)}"
+        )
+
+@router.get("/voice-sessions/{session_id}/status", response_model=Dict[str, Any])
+async def get_voice_session_status(
+    session_id: str,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Get the progress of a queued voice transcription"""
+    try:
+        job_status = await asyncio.to_thread(get_voice_upload_status, session_id, current_user["id"])
+        if not job_status:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No transcription job found for this voice session"
+            )
+        return job_status
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve voice session status: {str(e)}"
+        )
+
 @router.post("/transcribe-audio/", response_model=Dict[str, Any])
 async def transcribe_audio_direct(
     audio_file: UploadFile = File(...),
@@ -193,21 +662,15 @@ async def transcribe_audio_direct(
     """Direct audio transcription endpoint"""
     try:
         # Validate file type
-        allowed_types = ["audio/wav", "audio/mp3", "audio/m4a", "audio/mp4", "audio/webm", "audio/mpeg", "audio/x-m4a", "audio/x-wav", "audio/x-mp3"]
-        if audio_file.content_type not in allowed_types:
+        if audio_file.content_type not in ALLOWED_AUDIO_TYPES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported file type: {audio_file.content_type}. Allowed: {', '.join(allowed_types)}"
+                detail=f"Unsupported file type: {audio_file.content_type}. Allowed: {', '.join(ALLOWED_AUDIO_TYPES)}"
             )
         
-        # Read audio file
-        audio_content = await audio_file.read()
-        
-        # Transcribe using voice service
-        from services.voice_service import voice_service
-        transcript_result = await voice_service.transcribe_audio_buffer(
-            audio_buffer=audio_content,
-            filename=audio_file.filename,
+        # Stream audio to disk and transcribe using voice service
+        transcript_result = await voice_service.transcribe_upload(
+            audio_file,
             client_id=client_id
         )
         
@@ -230,6 +693,11 @@ async def transcribe_audio_direct(
         
     except HTTPException:
         raise
+    except AudioFileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -309,32 +777,3 @@ async def check_voice_service_health(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Voice service health check failed: {str(e)}"
         )
-
-# ===== WEBHOOK ENDPOINTS (for Vapi integration) =====
-
-@router.post("/webhooks/vapi/", response_model=Dict[str, Any])
-async def handle_vapi_webhook(
-    webhook_data: Dict[str, Any] = Body(...)
-):
-    """Handle webhooks from Vapi for voice session updates"""
-    try:
-        # Process the webhook (this would typically not require authentication)
-        # as it's coming from Vapi's servers
-        
-        # Log the webhook for debugging
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(f"🔔 Received Vapi webhook: {webhook_data.get('event_type', 'unknown')}")
-        
-        # TODO: Process webhook data and update database records
-        
-        return {
-            "message": "Webhook processed successfully",
-            "status": "received"
-        }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process webhook: {str(e)}"
-        ) 
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""
+Case notes endpoints mounted without the Bearer dependency.
+
+HTTPBearer cannot run on WebSocket handshakes, <audio> elements cannot send
+an Authorization header and Vapi's servers hold no user token, so these
+routes check credentials themselves.
+"""
+
+import json
+import asyncio
+import logging
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Header, Request, WebSocket, WebSocketDisconnect
+from fastapi.security import HTTPAuthorizationCredentials
+from pydantic import ValidationError
+from typing import Dict, Any, Optional
+from middleware.auth import get_current_user
+from services.case_notes_service import CaseNotesService
+from services.streaming_transcription import new_stream_session
+from services.tts_cache import tts_audio_cache, TTS_MEDIA_TYPES
+from services.webhook_ingestion import vapi_webhook_ingestor, IngestionQueueFullError
+from utils.file_responses import ranged_file_response
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Initialize service
+case_notes_service = CaseNotesService()
+
+# ===== REAL-TIME VOICE STREAMING =====
+
+@router.websocket("/voice-sessions/{session_id}/stream")
+async def stream_voice_session(
+    websocket: WebSocket,
+    session_id: str,
+    token: str = Query(...),
+    client_id: Optional[str] = Query(None),
+    auto_create_note: bool = Query(True)
+):
+    """
+    Real-time transcription for a voice session.
+
+    The client sends binary audio frames (16 kHz 16-bit mono PCM) and a
+    {"type": "stop"} text message when the call ends. The server pushes
+    "partial" transcripts, a "final" message with running analysis for each
+    finalised segment, and a "completed" message with the full transcript
+    and case note. Browsers cannot set headers on WebSockets, so the access
+    token is passed as a query parameter.
+    """
+    try:
+        current_user = await get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+    except HTTPException:
+        await websocket.close(code=4401, reason="Authentication failed")
+        return
+    
+    await websocket.accept()
+    stream = new_stream_session(session_id, client_id)
+    events_task = None
+    
+    async def forward_events():
+        async for event in stream.provider.events():
+            if event["type"] == "final":
+                await websocket.send_json(stream.add_final_segment(event))
+            else:
+                await websocket.send_json(event)
+    
+    try:
+        await stream.provider.connect()
+        events_task = asyncio.create_task(forward_events())
+        await websocket.send_json({"type": "ready", "session_id": stream.session_id, "provider": stream.provider.name})
+        
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes"):
+                await stream.send_audio(message["bytes"])
+            elif message.get("text") and json.loads(message["text"]).get("type") == "stop":
+                break
+        
+        # Flush the provider's last segment, then build the note from the running analysis
+        await stream.provider.finish()
+        await events_task
+        transcript_result = stream.transcript_result()
+        response = {"type": "completed", "session_id": stream.session_id, "transcript": transcript_result}
+        
+        note_client_id = client_id or transcript_result.get("client_id")
+        if auto_create_note and note_client_id and transcript_result["transcript"]:
+            response["case_note"] = await case_notes_service.create_note_from_transcript(
+                transcript_result=transcript_result,
+                client_id=note_client_id,
+                user_id=current_user["id"],
+                session_id=stream.session_id
+            )
+        
+        await websocket.send_json(json.loads(json.dumps(response, default=str)))
+        await websocket.close()
+        
+    except WebSocketDisconnect:
+        logger.info(f"🔌 Voice stream {session_id} disconnected by client")
+    except Exception as e:
+        logger.error(f"❌ Voice stream {session_id} failed: {e}")
+        try:
+            await websocket.send_json({"type": "error", "detail": f"Streaming transcription failed: {str(e)}"})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+    finally:
+        if events_task and not events_task.done():
+            events_task.cancel()
+        await stream.provider.close()
+
+# ===== TTS AUDIO =====
+
+@router.get("/tts-audio/{file_name}")
+async def get_tts_audio(
+    file_name: str,
+    request: Request,
+    expires: int = Query(...),
+    signature: str = Query(...)
+):
+    """
+    Serve cached TTS audio with range requests and conditional GETs.
+
+    generate-tts returns the URL with `expires` and `signature` (an HMAC of
+    file name and expiry), so an <audio src> can play it without an
+    Authorization header until the link expires.
+    """
+    if not tts_audio_cache.verify_signature(file_name, expires, signature):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="TTS audio link is invalid or has expired"
+        )
+    
+    path = await asyncio.to_thread(tts_audio_cache.path, file_name)
+    if not path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="TTS audio not found or expired"
+        )
+    
+    key, _, audio_format = file_name.rpartition(".")
+    return ranged_file_response(
+        request,
+        path,
+        media_type=TTS_MEDIA_TYPES.get(audio_format, "application/octet-stream"),
+        etag=key
+    )
+
+# ===== WEBHOOK ENDPOINTS (for Vapi integration) =====
+
+async def verify_vapi_secret(x_vapi_secret: Optional[str] = Header(None)):
+    """Reject webhook calls without the Vapi server secret before the body is read"""
+    if not vapi_webhook_ingestor.verify_secret(x_vapi_secret):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing Vapi webhook secret"
+        )
+
+@router.post("/webhooks/vapi/", response_model=Dict[str, Any], dependencies=[Depends(verify_vapi_secret)])
+async def handle_vapi_webhook(
+    webhook_data: Dict[str, Any] = Body(...)
+):
+    """
+    Handle webhooks from Vapi for voice session updates.
+
+    Vapi's servers authenticate with the X-Vapi-Secret header, which must
+    match VAPI_WEBHOOK_SECRET. Events are validated and queued; a background
+    writer stores them in batches, so the webhook is acknowledged without
+    waiting on the database.
+    """
+    try:
+        queued = await vapi_webhook_ingestor.submit(webhook_data)
+        
+        return {
+            "message": "Webhook accepted" if queued else "Webhook event type not stored",
+            "status": "queued" if queued else "ignored"
+        }
+        
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid webhook payload: {e.errors()}"
+        )
+    except IngestionQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process webhook: {str(e)}"
+        )
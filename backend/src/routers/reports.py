@@ -31,6 +31,12 @@ async def get_reports(current_user: Dict[str, Any] = Depends(get_current_user)):
                 "name": "Quarterly Outcome Report", 
                 "description": "AI-powered quarterly analysis of client outcomes and trends",
                 "endpoint": "/api/reports/quarterly-outcome"
+            },
+            {
+                "type": "client_case_summary",
+                "name": "Client Case Summary",
+                "description": "Rolling AI summary of a client's case history, refreshed with new notes only",
+                "endpoint": "/api/reports/client-summary/{client_id}"
             }
         ],
         "ai_service_status": "enabled" if report_service.is_healthy() else "disabled",
@@ -134,6 +140,34 @@ async def generate_quarterly_outcome_report(
             detail=f"Failed to generate quarterly outcome report: {str(e)}"
         )
 
+@router.post("/client-summary/{client_id}")
+async def generate_client_case_summary(
+    client_id: str,
+    rebuild: bool = Query(False, description="Summarize the whole history again instead of only new notes"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Refresh the rolling AI summary of one client's case history"""
+    try:
+        report = await report_service.generate_client_case_summary(
+            user_id=current_user["id"],
+            client_id=client_id,
+            rebuild=rebuild
+        )
+        
+        return {
+            "message": "Client case summary generated successfully",
+            "report": report,
+            "generated_for": current_user["name"],
+            "generation_time": datetime.utcnow().isoformat(),
+            "ai_enabled": report_service.is_healthy()
+        }
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate client case summary: {str(e)}"
+        )
+
 @router.get("/service-status")
 async def get_service_status(current_user: Dict[str, Any] = Depends(get_current_user)):
     """Get AI report service health status"""
@@ -144,6 +178,7 @@ async def get_service_status(current_user: Dict[str, Any] = Depends(get_current_
             "available_features": {
                 "monthly_case_summary": report_service.is_healthy(),
                 "quarterly_outcome_report": report_service.is_healthy(),
+                "client_case_summary": report_service.is_healthy(),
                 "real_time_generation": True,
                 "database_integration": True
             },
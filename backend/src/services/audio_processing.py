@@ -0,0 +1,264 @@
+"""
+Audio processing helpers for voice transcription (segmentation, pre-processing)
+"""
+
+import os
+import logging
+import hashlib
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AudioSegmentFile:
+    """A slice of a longer recording, exported to its own file"""
+    index: int
+    start_seconds: float
+    end_seconds: float
+    file_path: str
+    content_hash: str
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.end_seconds - self.start_seconds
+
+
+@dataclass
+class AudioMetadata:
+    """Stream properties read from container headers"""
+    duration_seconds: float
+    codec: str
+    sample_rate: Optional[int]
+    channels: Optional[int]
+    bitrate: Optional[int]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "duration_seconds": round(self.duration_seconds, 2),
+            "codec": self.codec,
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "bitrate": self.bitrate
+        }
+
+
+def probe_audio_metadata(file_path: str) -> Optional[AudioMetadata]:
+    """
+    Read duration, codec, sample rate and channels from the file headers
+    with mutagen, without decoding any audio.
+
+    Returns None for formats mutagen does not recognise (e.g. raw webm), so
+    callers can fall back to their previous behaviour.
+    """
+    import mutagen
+
+    try:
+        audio = mutagen.File(file_path)
+    except mutagen.MutagenError as e:
+        logger.warning(f"⚠️ Could not read audio headers of {os.path.basename(file_path)}: {e}")
+        return None
+    if audio is None or getattr(audio, "info", None) is None:
+        return None
+
+    info = audio.info
+    codec = getattr(info, "codec", None) or type(audio).__name__.lower()
+    return AudioMetadata(
+        duration_seconds=float(getattr(info, "length", 0.0) or 0.0),
+        codec=str(codec),
+        sample_rate=getattr(info, "sample_rate", None),
+        channels=getattr(info, "channels", None),
+        bitrate=getattr(info, "bitrate", None)
+    )
+
+
+def plan_segment_boundaries(
+    nonsilent_ranges: List[List[int]],
+    total_ms: int,
+    max_segment_ms: int
+) -> List[List[int]]:
+    """
+    Group speech ranges into [start_ms, end_ms] segments no longer than max_segment_ms.
+
+    Cuts are placed in the middle of the silence between two speech ranges.
+    A single speech range longer than max_segment_ms is hard-cut.
+    """
+    if total_ms <= 0:
+        return []
+    if not nonsilent_ranges:
+        nonsilent_ranges = [[0, total_ms]]
+
+    # Candidate cut points: midpoints of the silences between speech ranges
+    cut_points = [
+        (nonsilent_ranges[i][1] + nonsilent_ranges[i + 1][0]) // 2
+        for i in range(len(nonsilent_ranges) - 1)
+    ]
+
+    boundaries = []
+    segment_start = 0
+    last_cut = None  # Furthest usable cut within max_segment_ms of segment_start
+    for cut in cut_points + [total_ms]:
+        if cut - segment_start <= max_segment_ms:
+            last_cut = cut
+            continue
+        if last_cut is not None:
+            boundaries.append([segment_start, last_cut])
+            segment_start = last_cut
+        # No silence close enough - hard-cut the remaining speech
+        while cut - segment_start > max_segment_ms:
+            boundaries.append([segment_start, segment_start + max_segment_ms])
+            segment_start += max_segment_ms
+        last_cut = cut
+
+    if segment_start < total_ms:
+        boundaries.append([segment_start, total_ms])
+    return [boundary for boundary in boundaries if boundary[1] > boundary[0]]
+
+
+def split_on_silence_boundaries(
+    file_path: str,
+    output_dir: str,
+    max_segment_seconds: float,
+    min_duration_seconds: float,
+    min_silence_ms: int = 500,
+    silence_offset_db: float = 16.0,
+    output_format: str = "wav",
+    codec: Optional[str] = None,
+    bitrate: Optional[str] = None
+) -> Optional[List[AudioSegmentFile]]:
+    """
+    Split a recording at silence boundaries into bounded segments.
+
+    Segments are exported with output_format/codec/bitrate; pass the
+    pre-processing settings so a compact recording is not re-inflated to WAV.
+    Returns None when the recording is shorter than min_duration_seconds, so
+    short files go through single-file transcription without being re-encoded.
+    This decodes audio and should be run off the event loop.
+    """
+    from pydub import AudioSegment
+    from pydub.silence import detect_nonsilent
+
+    audio = AudioSegment.from_file(file_path)
+    total_ms = len(audio)
+    if total_ms / 1000.0 <= min_duration_seconds:
+        return None
+
+    nonsilent_ranges = detect_nonsilent(
+        audio,
+        min_silence_len=min_silence_ms,
+        silence_thresh=audio.dBFS - silence_offset_db
+    )
+    boundaries = plan_segment_boundaries(nonsilent_ranges, total_ms, int(max_segment_seconds * 1000))
+
+    segments = []
+    base_name = os.path.splitext(os.path.basename(file_path))[0]
+    export_args = _export_args(output_format, codec, bitrate)
+    for index, (start_ms, end_ms) in enumerate(boundaries):
+        chunk = audio[start_ms:end_ms]
+        content_hash = hashlib.sha256(chunk.raw_data).hexdigest()
+        segment_path = os.path.join(output_dir, f"{uuid.uuid4()}_{base_name}_seg{index:03d}.{output_format}")
+        chunk.export(segment_path, **export_args)
+        segments.append(AudioSegmentFile(
+            index=index,
+            start_seconds=start_ms / 1000.0,
+            end_seconds=end_ms / 1000.0,
+            file_path=segment_path,
+            content_hash=content_hash
+        ))
+
+    logger.info(f"✂️ Split {os.path.basename(file_path)} ({total_ms/1000:.0f}s) into {len(segments)} segments")
+    return segments
+
+
+def _export_args(output_format: str, codec: Optional[str], bitrate: Optional[str]) -> Dict[str, Any]:
+    export_args = {"format": output_format}
+    if codec:
+        export_args["codec"] = codec
+    if bitrate:
+        export_args["bitrate"] = bitrate
+    return export_args
+
+
+def find_speech_bounds(audio, frame_ms: int = 10, threshold_db: float = -45.0, padding_ms: int = 200) -> Tuple[int, int]:
+    """
+    Energy-based detector for leading/trailing silence.
+
+    Returns (start_ms, end_ms) of the region between the first and last frame
+    whose RMS level is above threshold_db (dBFS), padded by padding_ms.
+    Frame energies are computed in one numpy pass over the samples.
+    """
+    total_ms = len(audio)
+    samples = np.asarray(audio.get_array_of_samples(), dtype=np.float64)
+    samples = samples[:len(samples) - len(samples) % audio.channels].reshape(-1, audio.channels)
+    if not len(samples):
+        return 0, total_ms
+
+    # Frame starts in samples, at the same millisecond positions as audio[position:position + frame_ms]
+    starts = np.arange(0, total_ms, frame_ms, dtype=np.int64) * audio.frame_rate // 1000
+    starts = starts[starts < len(samples)]
+    energy = np.add.reduceat((samples ** 2).sum(axis=1), starts)
+    counts = np.diff(np.append(starts, len(samples))) * audio.channels
+    # level > threshold_db  <=>  mean square > (max amplitude * 10^(threshold_db/20))^2
+    threshold = (audio.max_possible_amplitude * 10 ** (threshold_db / 20.0)) ** 2
+    loud_frames = np.flatnonzero(energy / counts > threshold)
+    if not len(loud_frames):
+        return 0, total_ms
+
+    start_ms = max(0, int(loud_frames[0]) * frame_ms - padding_ms)
+    end_ms = min(total_ms, (int(loud_frames[-1]) + 1) * frame_ms + padding_ms)
+    return start_ms, end_ms
+
+
+def preprocess_for_transcription(
+    file_path: str,
+    output_dir: str,
+    sample_rate: int = 16000,
+    output_format: str = "ogg",
+    codec: Optional[str] = "libopus",
+    bitrate: Optional[str] = "24k",
+    trim_threshold_db: float = -45.0
+) -> Dict[str, Any]:
+    """
+    Downmix to mono, resample and trim leading/trailing silence, then
+    re-encode in a compact codec. Decodes audio; run off the event loop.
+
+    Returns a report with the processed file path and the bytes/seconds saved.
+    """
+    from pydub import AudioSegment
+
+    started = time.perf_counter()
+    original_bytes = os.path.getsize(file_path)
+    audio = AudioSegment.from_file(file_path)
+    original_duration = len(audio) / 1000.0
+    original_channels = audio.channels
+    original_sample_rate = audio.frame_rate
+
+    audio = audio.set_channels(1).set_frame_rate(sample_rate)
+    start_ms, end_ms = find_speech_bounds(audio, threshold_db=trim_threshold_db)
+    audio = audio[start_ms:end_ms]
+
+    base_name = os.path.splitext(os.path.basename(file_path))[0]
+    output_path = os.path.join(output_dir, f"{uuid.uuid4()}_{base_name}.{output_format}")
+    audio.export(output_path, **_export_args(output_format, codec, bitrate))
+
+    processed_bytes = os.path.getsize(output_path)
+    processed_duration = len(audio) / 1000.0
+    return {
+        "file_path": output_path,
+        "original_bytes": original_bytes,
+        "processed_bytes": processed_bytes,
+        "bytes_saved": original_bytes - processed_bytes,
+        "original_duration_seconds": round(original_duration, 2),
+        "processed_duration_seconds": round(processed_duration, 2),
+        "trimmed_seconds": round(original_duration - processed_duration, 2),
+        "original_channels": original_channels,
+        "original_sample_rate": original_sample_rate,
+        "sample_rate": sample_rate,
+        "format": output_format,
+        "processing_seconds": round(time.perf_counter() - started, 3)
+    }
@@ -0,0 +1,190 @@
+"""
+Streaming case-file export (client record, case notes, transcripts, tasks)
+"""
+
+import io
+import os
+import csv
+import json
+import zlib
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from config.database import get_supabase
+from services.case_notes_service import CASE_NOTE_COLUMNS
+from utils.pagination import keyset_filter
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+# One CSV layout for every record type; fields without a column go to `details`
+CSV_COLUMNS = [
+    "record_type", "id", "client_id", "created_at", "updated_at",
+    "title", "text", "category", "priority", "status", "details"
+]
+CSV_FIELD_MAP = {
+    "client": {"title": "name"},
+    "case_note": {"text": "content"},
+    "voice_transcript": {"text": "text_content", "title": "speaker"},
+    "task": {"text": "description"}
+}
+
+
+class CaseFileExporter:
+    """
+    Streams everything on file for one client and/or date range.
+
+    Each table is read in keyset pages ordered by (created_at, id), and each
+    page is serialised and compressed before the next is fetched, so memory
+    use is bounded by EXPORT_PAGE_SIZE rows whatever the history size.
+    """
+
+    def __init__(self):
+        self.page_size = int(os.getenv("EXPORT_PAGE_SIZE", "500"))
+        self.compression_level = int(os.getenv("EXPORT_GZIP_LEVEL", "6"))
+
+    # ===== READ =====
+
+    def _fetch_page(self, build_query, after: Optional[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """One keyset page (blocking; runs in a worker thread)"""
+        query = build_query()
+        if after:
+            query = query.or_(keyset_filter(*after, descending=False))
+        result = query.order("created_at").order("id").limit(self.page_size).execute()
+        return result.data or []
+
+    async def _paged(self, build_query) -> AsyncIterator[Dict[str, Any]]:
+        after = None
+        while True:
+            rows = await asyncio.to_thread(self._fetch_page, build_query, after)
+            for row in rows:
+                yield row
+            if len(rows) < self.page_size:
+                return
+            after = (rows[-1]["created_at"], rows[-1]["id"])
+
+    def _in_range(self, query, date_from: Optional[datetime], date_to: Optional[datetime]):
+        if date_from:
+            query = query.gte("created_at", date_from.isoformat())
+        if date_to:
+            query = query.lt("created_at", date_to.isoformat())
+        return query
+
+    async def iter_records(
+        self,
+        user_id: str,
+        client_id: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """(record_type, row) for the client record, then notes, transcripts and tasks"""
+        supabase = get_supabase()
+
+        if client_id:
+            result = await asyncio.to_thread(
+                supabase.table("clients").select("*").eq("id", client_id).execute
+            )
+            for row in result.data or []:
+                yield "client", row
+
+        def case_notes():
+            query = supabase.table("case_notes").select(CASE_NOTE_COLUMNS).eq("social_worker_id", user_id)
+            if client_id:
+                query = query.eq("client_id", client_id)
+            return self._in_range(query, date_from, date_to)
+
+        def voice_transcripts():
+            query = supabase.table("voice_transcripts").select(
+                "*, voice_sessions!inner(client_id)"
+            ).eq("voice_sessions.social_worker_id", user_id)
+            if client_id:
+                query = query.eq("voice_sessions.client_id", client_id)
+            return self._in_range(query, date_from, date_to)
+
+        def tasks():
+            query = supabase.table("tasks").select("*").eq("created_by", user_id)
+            if client_id:
+                query = query.eq("client_id", client_id)
+            return self._in_range(query, date_from, date_to)
+
+        async for row in self._paged(case_notes):
+            yield "case_note", row
+        async for row in self._paged(voice_transcripts):
+            session = row.pop("voice_sessions", None) or {}
+            row["client_id"] = session.get("client_id")
+            yield "voice_transcript", row
+        async for row in self._paged(tasks):
+            yield "task", row
+
+    # ===== SERIALISE =====
+
+    @staticmethod
+    def to_ndjson(record_type: str, row: Dict[str, Any]) -> str:
+        return json.dumps({"record_type": record_type, **row}, default=str) + "\n"
+
+    @staticmethod
+    def to_csv_values(record_type: str, row: Dict[str, Any]) -> List[Any]:
+        mapping = {"id": "id", "client_id": "client_id", "created_at": "created_at", "updated_at": "updated_at",
+                   "title": "title", "text": "text", "category": "category", "priority": "priority", "status": "status"}
+        mapping.update(CSV_FIELD_MAP.get(record_type, {}))
+        used = set(mapping.values())
+        details = {key: value for key, value in row.items() if key not in used}
+        values = [record_type] + [row.get(mapping[column]) for column in CSV_COLUMNS[1:-1]]
+        values.append(json.dumps(details, default=str) if details else "")
+        return ["" if value is None else value for value in values]
+
+    async def stream(
+        self,
+        user_id: str,
+        export_format: str = "ndjson",
+        gzip: bool = False,
+        client_id: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> AsyncIterator[bytes]:
+        """Encoded (and optionally gzip-compressed) export body, one chunk per page"""
+        compressor = zlib.compressobj(self.compression_level, zlib.DEFLATED, 31) if gzip else None
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if export_format == "csv" else None
+        if writer:
+            writer.writerow(CSV_COLUMNS)
+
+        records = 0
+        started = datetime.utcnow()
+
+        def drain() -> bytes:
+            data = buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            return compressor.compress(data) if compressor else data
+
+        try:
+            async for record_type, row in self.iter_records(user_id, client_id, date_from, date_to):
+                if writer:
+                    writer.writerow(self.to_csv_values(record_type, row))
+                else:
+                    buffer.write(self.to_ndjson(record_type, row))
+                records += 1
+                if records % self.page_size == 0:
+                    chunk = drain()
+                    if chunk:
+                        yield chunk
+
+            chunk = drain()
+            if compressor:
+                chunk += compressor.flush()
+            if chunk:
+                yield chunk
+        finally:
+            elapsed = (datetime.utcnow() - started).total_seconds()
+            logger.info(f"📦 Exported {records} records for user {user_id} ({export_format}, gzip={gzip}, {elapsed:.1f}s)")
+
+
+# Shared exporter instance
+case_file_exporter = CaseFileExporter()
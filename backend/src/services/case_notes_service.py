@@ -2,21 +2,54 @@
 Case notes service with voice integration and database operations
 """
 
+import os
+import re
+import asyncio
 import logging
 import uuid
+import httpx
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
+from pydantic import ValidationError
 from config.database import get_supabase
+from models.case_note import CaseNoteBulkItem
 from services.voice_service import voice_service
+from services.semantic_index import semantic_search_service
+from services.near_duplicates import near_duplicate_index
+from utils.pagination import InvalidCursorError, encode_cursor, decode_cursor, keyset_filter
 
 logger = logging.getLogger(__name__)
 
+# Every case_notes column except the generated search_vector
+CASE_NOTE_COLUMNS = (
+    "id, client_id, social_worker_id, title, content, category, priority, tags, "
+    "voice_session_id, has_voice_recording, voice_recording_url, voice_duration_seconds, voice_quality_score, "
+    "tts_generated, tts_audio_url, tts_voice_id, intake_method, status, is_confidential, "
+    "follow_up_required, follow_up_date, idempotency_key, created_at, updated_at"
+)
+
+MAX_SEARCH_TERMS = 8
+_SEARCH_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_search_query(search: str) -> Optional[str]:
+    """
+    Turn free text into a prefix-matching to_tsquery expression:
+    "evict hous" -> "evict:* & hous:*". Only word characters survive, so
+    tsquery operators in user input cannot change the query.
+    """
+    terms = _SEARCH_TERM_PATTERN.findall(search.lower())[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
 
 class CaseNotesService:
     """Service for case notes management with voice integration"""
     
     def __init__(self):
         self.logger = logger
+        self.bulk_chunk_size = int(os.getenv("CASE_NOTE_BULK_CHUNK_SIZE", "500"))
     
     def is_healthy(self) -> bool:
         """Check if service is healthy"""
@@ -32,25 +65,126 @@ class CaseNotesService:
         self,
         user_id: str,
         client_id: Optional[str] = None,
-        skip: int = 0,
         limit: int = 50,
+        cursor: Optional[str] = None,
         category: Optional[str] = None,
         priority: Optional[str] = None,
-        status: str = "active",
+        status: Optional[str] = "active",
         search: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """Get list of case notes with optional filtering"""
+    ) -> Dict[str, Any]:
+        """
+        One page of case notes, newest first.
+        
+        Keyset pagination on (created_at, id): the cursor from the previous
+        page becomes a "strictly older than" filter, so every page costs the
+        same index range scan no matter how deep the client has paged.
+        With a search term the page is the best-ranked matches instead (see
+        search_case_notes). Returns {"items": [...], "next_cursor": str | None}.
+        Raises InvalidCursorError for a cursor this service did not issue.
+        """
         try:
+            ts_query = build_search_query(search) if search else None
+            if ts_query:
+                items = await self.search_case_notes(
+                    user_id, ts_query, client_id=client_id, category=category,
+                    priority=priority, status=status, limit=limit
+                )
+                return {"items": items, "next_cursor": None}
+            
             supabase = get_supabase()
             
-            # For now, return empty list until schema is implemented
-            # TODO: Implement actual database queries after schema setup
-            return []
+            query = supabase.table("case_notes").select(CASE_NOTE_COLUMNS).eq("social_worker_id", user_id)
+            
+            # Filters are applied in the database, before the page is cut
+            if client_id:
+                query = query.eq("client_id", client_id)
+            if category:
+                query = query.eq("category", category)
+            if priority:
+                query = query.eq("priority", priority)
+            if status:
+                query = query.eq("status", status)
+            if cursor:
+                query = query.or_(keyset_filter(*decode_cursor(cursor)))
+            
+            # One extra row tells us whether another page exists
+            query = query.order("created_at", desc=True).order("id", desc=True).limit(limit + 1)
+            result = await asyncio.to_thread(query.execute)
+            
+            rows = result.data or []
+            items = rows[:limit]
+            next_cursor = None
+            if len(rows) > limit:
+                next_cursor = encode_cursor(items[-1]["created_at"], items[-1]["id"])
             
+            return {"items": items, "next_cursor": next_cursor}
+            
+        except InvalidCursorError:
+            raise
         except Exception as e:
             self.logger.error(f"❌ Error getting case notes: {e}")
             raise
     
+    async def search_case_notes(
+        self,
+        user_id: str,
+        ts_query: str,
+        client_id: Optional[str] = None,
+        category: Optional[str] = None,
+        priority: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Full-text search through the search_case_notes database function
+        (GIN index on case_notes.search_vector). Each note gets a
+        search_rank and a search_snippet with matches wrapped in <mark>.
+        """
+        supabase = get_supabase()
+        result = await asyncio.to_thread(
+            supabase.rpc("search_case_notes", {
+                "p_social_worker_id": user_id,
+                "p_query": ts_query,
+                "p_client_id": client_id,
+                "p_category": category,
+                "p_priority": priority,
+                "p_status": status or None,
+                "p_limit": limit
+            }).execute
+        )
+        return [
+            {**row["note"], "search_rank": row["rank"], "search_snippet": row["snippet"]}
+            for row in result.data or []
+        ]
+    
+    async def get_case_notes_by_ids(
+        self,
+        user_id: str,
+        note_ids: List[str],
+        scores: Optional[Dict[str, float]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        The user's notes with these ids, in the given order (missing or
+        foreign ids are skipped). With scores, each note gets a semantic_score.
+        """
+        if not note_ids:
+            return []
+        supabase = get_supabase()
+        result = await asyncio.to_thread(
+            supabase.table("case_notes").select(CASE_NOTE_COLUMNS).eq(
+                "social_worker_id", user_id
+            ).in_("id", note_ids).execute
+        )
+        by_id = {row["id"]: row for row in result.data or []}
+        notes = []
+        for note_id in note_ids:
+            if note_id in by_id:
+                note = by_id[note_id]
+                if scores is not None:
+                    note["semantic_score"] = round(scores.get(note_id, 0.0), 4)
+                notes.append(note)
+        return notes
+    
     async def create_case_note(
         self, 
         case_note_data: Dict[str, Any], 
@@ -78,6 +212,9 @@ class CaseNotesService:
                 "updated_at": datetime.utcnow().isoformat()
             }
             
+            # The mock note is not stored, so it stays out of the semantic and
+            # near-duplicate indexes; call _index_stored_notes once it is written
+            
             self.logger.info(f"✅ Mock created case note {mock_note['id']}")
             return mock_note
             
@@ -85,6 +222,140 @@ class CaseNotesService:
             self.logger.error(f"❌ Error creating case note: {e}")
             raise
     
+    async def bulk_create_case_notes(
+        self,
+        notes: List[Dict[str, Any]],
+        user_id: str
+    ) -> Dict[str, Any]:
+        """
+        Create many notes at once (offline sync).
+        
+        Every item is validated on its own against CaseNoteBulkItem, so one bad
+        note does not reject the batch. Valid notes are written as multi-row
+        upserts of bulk_chunk_size that skip rows whose
+        (social_worker_id, idempotency_key) already exists; those items are
+        answered with the stored note instead. A retried sync therefore
+        returns the same notes and never creates duplicates. A chunk the
+        database rejects is split until the offending rows are isolated, so
+        only those fail, each with the database's error.
+        
+        Returns {"results": [...], "summary": {...}} with one result per
+        input item, in input order.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(notes)
+        rows_by_key: Dict[str, Dict[str, Any]] = {}
+        indexes_by_key: Dict[str, List[int]] = {}
+        
+        for index, raw in enumerate(notes):
+            try:
+                item = CaseNoteBulkItem(**raw)
+            except (ValidationError, TypeError) as e:
+                results[index] = {
+                    "index": index,
+                    "idempotency_key": raw.get("idempotency_key") if isinstance(raw, dict) else None,
+                    "status": "invalid",
+                    "errors": e.errors(include_url=False, include_context=False, include_input=False)
+                    if isinstance(e, ValidationError) else [{"msg": str(e)}]
+                }
+                continue
+            
+            # The same key twice in one request is one note
+            indexes_by_key.setdefault(item.idempotency_key, []).append(index)
+            if item.idempotency_key not in rows_by_key:
+                rows_by_key[item.idempotency_key] = {
+                    **item.model_dump(mode="json"),
+                    "social_worker_id": user_id,
+                    "status": "active"
+                }
+        
+        supabase = get_supabase()
+        keys = list(rows_by_key)
+        for start in range(0, len(keys), self.bulk_chunk_size):
+            chunk = keys[start:start + self.bulk_chunk_size]
+            outcomes = await asyncio.to_thread(self._insert_note_rows, supabase, user_id, [rows_by_key[key] for key in chunk])
+            
+            for key in chunk:
+                status, note, error = outcomes.get(key, ("failed", None, None))
+                for index in indexes_by_key[key]:
+                    result = {"index": index, "idempotency_key": key, "status": status}
+                    if note is not None:
+                        result["case_note"] = note
+                    else:
+                        result["error"] = error or "Case note was not stored"
+                    results[index] = result
+        
+        await self._index_stored_notes([result["case_note"] for result in results if result["status"] == "created"])
+        
+        summary = {"total": len(notes)}
+        for result in results:
+            summary[result["status"]] = summary.get(result["status"], 0) + 1
+        
+        self.logger.info(f"✅ Bulk case note sync for {user_id}: {summary}")
+        return {"results": results, "summary": summary}
+    
+    async def _index_stored_notes(self, notes: List[Dict[str, Any]]):
+        """
+        Queue notes written to case_notes for embedding and flag their
+        near-duplicates (sets note["near_duplicates"]). Only stored notes go
+        in, so neither index returns ids that have no note behind them.
+        """
+        semantic_search_service.enqueue_notes(notes)
+        for note in {note["id"]: note for note in notes}.values():
+            # Flagged, not rejected: a near-identical retry may still carry new facts
+            note["near_duplicates"] = await near_duplicate_index.check_and_add(note)
+    
+    def _insert_note_rows(self, supabase, user_id: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Insert rows with _insert_note_chunk, bisecting a chunk the database
+        rejects until the bad rows are alone (blocking; runs in a worker
+        thread). A bad row costs about log2(chunk) extra requests. Transport
+        errors fail the whole chunk, since splitting cannot fix them.
+        Returns {idempotency_key: (status, case_note, error)}.
+        """
+        try:
+            return {
+                key: (status, note, None)
+                for key, (status, note) in self._insert_note_chunk(supabase, user_id, rows).items()
+            }
+        except httpx.TransportError as e:
+            self.logger.error(f"❌ Bulk insert of {len(rows)} case notes failed: {e}")
+            return {row["idempotency_key"]: ("failed", None, "Case note was not stored") for row in rows}
+        except Exception as e:
+            if len(rows) == 1:
+                self.logger.warning(f"⚠️ Case note {rows[0]['idempotency_key']} rejected: {e}")
+                return {rows[0]["idempotency_key"]: ("failed", None, f"Case note was not stored: {e}")}
+            middle = len(rows) // 2
+            return {
+                **self._insert_note_rows(supabase, user_id, rows[:middle]),
+                **self._insert_note_rows(supabase, user_id, rows[middle:])
+            }
+    
+    def _insert_note_chunk(self, supabase, user_id: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        One multi-row insert that skips existing idempotency keys, plus one
+        lookup for the skipped ones. Returns {idempotency_key: (status, case_note)}.
+        """
+        created = supabase.table("case_notes").upsert(
+            rows,
+            on_conflict="social_worker_id,idempotency_key",
+            ignore_duplicates=True
+        ).execute()
+        
+        outcomes = {
+            row["idempotency_key"]: ("created", {key: value for key, value in row.items() if key != "search_vector"})
+            for row in created.data or []
+        }
+        
+        skipped = [row["idempotency_key"] for row in rows if row["idempotency_key"] not in outcomes]
+        if skipped:
+            existing = supabase.table("case_notes").select(CASE_NOTE_COLUMNS).eq(
+                "social_worker_id", user_id
+            ).in_("idempotency_key", skipped).execute()
+            for row in existing.data or []:
+                outcomes[row["idempotency_key"]] = ("existing", row)
+        
+        return outcomes
+    
     # ===== VOICE INTEGRATION OPERATIONS =====
     
     async def start_voice_intake(
@@ -149,6 +420,13 @@ class CaseNotesService:
     ) -> Dict[str, Any]:
         """Create an organized case note from voice transcript"""
         try:
+            # A retried upload of the same audio, by the same worker for the same
+            # client, returns the note created the first time
+            existing_note = await voice_service.find_case_note(transcript_result, user_id, client_id)
+            if existing_note:
+                self.logger.info(f"♻️ Reusing case note {existing_note.get('id')} for duplicate audio")
+                return existing_note
+            
             transcript_text = transcript_result.get("transcript", "")
             analysis = transcript_result.get("analysis", {})
             
@@ -188,6 +466,7 @@ class CaseNotesService:
             }
             
             case_note = await self.create_case_note(case_note_data, user_id)
+            await voice_service.remember_case_note(transcript_result, case_note, user_id, client_id)
             
             self.logger.info(f"✅ Created organized case note from transcript: {case_note['id']}")
             
@@ -278,22 +557,38 @@ class CaseNotesService:
         user_id: str,
         days: int = 30
     ) -> Dict[str, Any]:
-        """Get analytics for case notes"""
+        """
+        Get analytics for case notes over the last `days` UTC days.
+        
+        Counts come from case_note_daily_stats, a per-day rollup the database
+        keeps current on every insert, update and delete, so the cost depends
+        on the window length rather than on how many notes exist.
+        """
         try:
-            # Return mock analytics for now
+            supabase = get_supabase()
+            result = await asyncio.to_thread(
+                supabase.rpc("case_note_analytics", {"p_social_worker_id": user_id, "p_days": days}).execute
+            )
+            counts = result.data or {}
+            
+            total_notes = int(counts.get("total_notes", 0))
+            voice_notes = int(counts.get("voice_notes", 0))
+            tts_generated = int(counts.get("tts_generated", 0))
+            
             analytics = {
-                "total_notes": 0,
-                "voice_notes": 0,
-                "manual_notes": 0,
-                "tts_generated": 0,
-                "voice_adoption_rate": 0.0,
-                "tts_adoption_rate": 0.0,
-                "category_distribution": {},
-                "priority_distribution": {},
+                "total_notes": total_notes,
+                "voice_notes": voice_notes,
+                "manual_notes": total_notes - voice_notes,
+                "tts_generated": tts_generated,
+                "voice_adoption_rate": round(voice_notes / total_notes, 3) if total_notes else 0.0,
+                "tts_adoption_rate": round(tts_generated / total_notes, 3) if total_notes else 0.0,
+                "category_distribution": counts.get("category_distribution", {}),
+                "priority_distribution": counts.get("priority_distribution", {}),
+                "intake_method_distribution": counts.get("intake_method_distribution", {}),
                 "period_days": days
             }
             
-            self.logger.info(f"✅ Generated mock analytics for user {user_id}")
+            self.logger.info(f"✅ Generated analytics for user {user_id} ({total_notes} notes, {days} days)")
             
             return analytics
             
@@ -1,21 +1,86 @@
+import os
+import time
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
 from transformers import pipeline
 
+# Default labels used to exercise the model once at startup
+WARMUP_LABELS = ["housing", "medical", "family", "employment", "financial"]
+WARMUP_TEXT = "Client called regarding housing assistance and a follow-up medical appointment."
+
+
 class ClassificationService:
     def __init__(self):
         """
         Initializes the Classification Service and loads the zero-shot-classification model.
         This is a heavy operation and should only be done once.
         """
+        self.hypothesis_template = os.getenv("CLASSIFIER_HYPOTHESIS_TEMPLATE", "This example is {}.")
+        self.max_pairs_per_forward = int(os.getenv("CLASSIFIER_MAX_PAIRS_PER_FORWARD", "64"))
+        self.is_warm = False
+        self.warmup_seconds: Optional[float] = None
+
+        # Tokenised hypotheses are cached per (label set, template) so repeated
+        # requests with the same candidate_labels skip re-tokenisation
+        label_cache_size = int(os.getenv("CLASSIFIER_LABEL_CACHE_SIZE", "256"))
+        self._encode_hypotheses = lru_cache(maxsize=label_cache_size)(self._tokenize_hypotheses)
+
         try:
             print("Loading Zero-Shot-Classification model...")
             self.classifier = pipeline(
                 "zero-shot-classification",
                 model="facebook/bart-large-mnli"
             )
+            self.entailment_id = self._find_label_id("entail", default=-1)
             print("Model loaded successfully.")
         except Exception as e:
             print(f"Error loading classification model: {e}")
             self.classifier = None
+            self.entailment_id = -1
+
+    def _find_label_id(self, prefix: str, default: int) -> int:
+        """Find the model output index whose label starts with the given prefix"""
+        for label, label_id in self.classifier.model.config.label2id.items():
+            if label.lower().startswith(prefix):
+                return int(label_id)
+        return default
+
+    def _tokenize_hypotheses(self, labels: Tuple[str, ...], template: str) -> Tuple[Tuple[int, ...], ...]:
+        """Tokenise the hypothesis sentence for each label (without special tokens)"""
+        tokenizer = self.classifier.tokenizer
+        return tuple(
+            tuple(tokenizer.encode(template.format(label), add_special_tokens=False))
+            for label in labels
+        )
+
+    def label_cache_info(self) -> dict:
+        """Hit/miss statistics for the tokenised hypothesis cache"""
+        info = self._encode_hypotheses.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize
+        }
+
+    def warmup(self) -> float:
+        """
+        Runs a dummy classification so lazy kernel initialisation and allocator
+        growth happen at startup instead of on the first user request.
+
+        Returns:
+            The warmup duration in seconds.
+        """
+        if not self.classifier:
+            return 0.0
+
+        started = time.perf_counter()
+        self.classify_text(WARMUP_TEXT, WARMUP_LABELS)
+        self.warmup_seconds = time.perf_counter() - started
+        self.is_warm = True
+        print(f"Classifier warmed up in {self.warmup_seconds:.2f}s.")
+        return self.warmup_seconds
 
     def classify_text(self, text: str, candidate_labels: list[str]) -> dict:
         """
@@ -35,7 +100,7 @@ class ClassificationService:
                 "labels": [],
                 "scores": []
             }
-        
+
         if not text or not candidate_labels:
             return {
                 "text": text,
@@ -43,8 +108,95 @@ class ClassificationService:
                 "scores": []
             }
 
-        result = self.classifier(text, candidate_labels)
-        return result
+        return self.classify_batch([text], candidate_labels)[0]
+
+    def classify_batch(self, texts: List[str], candidate_labels: list[str]) -> List[dict]:
+        """
+        Classifies several texts against the same candidate labels.
+
+        Every (text, label) pair is scored in as few forward passes as possible,
+        reusing the cached hypothesis tokens for the label set.
+
+        Args:
+            texts: The texts to classify.
+            candidate_labels: A list of strings representing the possible categories.
+
+        Returns:
+            One result dictionary per text, in input order, shaped like classify_text.
+        """
+        if not self.classifier:
+            return [
+                {"error": "Classifier not available", "text": text, "labels": [], "scores": []}
+                for text in texts
+            ]
+
+        if not texts or not candidate_labels:
+            return [{"text": text, "labels": [], "scores": []} for text in texts]
+
+        if self.entailment_id == -1:
+            # Model does not expose an entailment label; let the pipeline decide
+            return [self.classifier(text, list(candidate_labels)) for text in texts]
+
+        import torch
+
+        labels = tuple(candidate_labels)
+        hypotheses = self._encode_hypotheses(labels, self.hypothesis_template)
+        pairs = self._build_pair_inputs(texts, hypotheses)
+
+        model = self.classifier.model
+        device = self.classifier.device
+        pad_id = self.classifier.tokenizer.pad_token_id or 0
+
+        entail_logits: List[float] = []
+        with torch.no_grad():
+            for start in range(0, len(pairs), self.max_pairs_per_forward):
+                chunk = pairs[start:start + self.max_pairs_per_forward]
+                width = max(len(ids) for ids in chunk)
+                input_ids = torch.full((len(chunk), width), pad_id, dtype=torch.long)
+                attention_mask = torch.zeros((len(chunk), width), dtype=torch.long)
+                for row, ids in enumerate(chunk):
+                    input_ids[row, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+                    attention_mask[row, :len(ids)] = 1
+
+                logits = model(
+                    input_ids=input_ids.to(device),
+                    attention_mask=attention_mask.to(device)
+                ).logits
+                entail_logits.extend(logits[:, self.entailment_id].float().cpu().tolist())
+
+        results = []
+        label_count = len(labels)
+        for index, text in enumerate(texts):
+            row = torch.tensor(entail_logits[index * label_count:(index + 1) * label_count])
+            scores = row.softmax(dim=0).tolist()
+            ranked = sorted(zip(labels, scores), key=lambda item: item[1], reverse=True)
+            results.append({
+                "sequence": text,
+                "labels": [label for label, _ in ranked],
+                "scores": [score for _, score in ranked]
+            })
+        return results
+
+    def _build_pair_inputs(
+        self,
+        texts: List[str],
+        hypotheses: Tuple[Tuple[int, ...], ...]
+    ) -> List[List[int]]:
+        """Combine each premise with every cached hypothesis into model input ids"""
+        tokenizer = self.classifier.tokenizer
+        max_length = tokenizer.model_max_length
+        special_tokens = tokenizer.num_special_tokens_to_add(pair=True)
+
+        pairs = []
+        for text in texts:
+            premise = tokenizer.encode(text, add_special_tokens=False)
+            for hypothesis in hypotheses:
+                # Truncate the premise only, like the pipeline's "only_first" strategy
+                budget = max(0, max_length - special_tokens - len(hypothesis))
+                pairs.append(
+                    tokenizer.build_inputs_with_special_tokens(premise[:budget], list(hypothesis))
+                )
+        return pairs
 
 # Create a single instance of the service to be used by the application
-classification_service = ClassificationService() 
\ No newline at end of file
+classification_service = ClassificationService()
@@ -0,0 +1,272 @@
+"""
+Near-duplicate case note detection with MinHash signatures and LSH banding
+"""
+
+import os
+import re
+import zlib
+import hashlib
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from config.redis_client import get_redis, MockRedis
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Structure added by CaseNotesService._organize_transcript_content; shared by
+# every voice note, so it must not count towards similarity
+_BOILERPLATE_LINE = re.compile(
+    r"^\s*(#{1,6}\s|\*\*(Topics Discussed|Urgency Indicators|Overall Sentiment):\*\*|"
+    r"- \*\*(Duration|Confidence|Word Count|Language):\*\*)"
+)
+
+
+def strip_boilerplate(text: str) -> str:
+    return "\n".join(line for line in text.splitlines() if not _BOILERPLATE_LINE.match(line))
+
+
+class MinHasher:
+    """
+    MinHash over word shingles: each of num_perm universal hash functions
+    keeps its minimum over the note's shingles. The share of equal positions
+    in two signatures estimates the Jaccard similarity of the shingle sets.
+    All permutations are applied in one vectorised numpy pass.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> Set[str]:
+        words = _WORD_PATTERN.findall(strip_boilerplate(text).lower())
+        if len(words) < self.shingle_size:
+            return {" ".join(words)} if words else set()
+        return {" ".join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> np.ndarray:
+        """uint32 signature of length num_perm"""
+        shingles = self.shingles(text)
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+        # uint64 products wrap around, as in the usual MinHash implementations
+        permuted = ((hashes[:, None] * self._a + self._b) % _MERSENNE_PRIME) & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        return float(np.count_nonzero(first == second)) / len(first)
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of note signatures, scoped per (social worker, client).
+
+    A signature is cut into `bands` bands of num_perm / bands rows; notes that
+    share any band bucket are candidates, and candidates whose estimated
+    Jaccard similarity reaches `threshold` are near-duplicates. Lookups touch
+    `bands` buckets, so their cost does not grow with the number of notes.
+
+    Uses Redis when it is available so every worker sees every note, and an
+    in-process index otherwise. scripts/cluster_near_duplicate_notes.py
+    clusters the existing table and can load it into this index.
+
+    Only notes stored in case_notes may be added. An edited note must be
+    re-signed with update() and a deleted one dropped with remove(), or it
+    keeps matching with its old text. The API has no note update or delete
+    endpoint yet; whatever adds one has to call these.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("NEAR_DUP_ENABLED", "true").lower() == "true"
+        self.threshold = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+        self.bands = int(os.getenv("NEAR_DUP_BANDS", "16"))
+        self.hasher = MinHasher(
+            num_perm=int(os.getenv("NEAR_DUP_NUM_PERM", "128")),
+            shingle_size=int(os.getenv("NEAR_DUP_SHINGLE_WORDS", "3"))
+        )
+        if self.hasher.num_perm % self.bands:
+            raise ValueError("NEAR_DUP_NUM_PERM must be a multiple of NEAR_DUP_BANDS")
+        self.rows_per_band = self.hasher.num_perm // self.bands
+
+        self._buckets: Dict[str, Set[str]] = {}
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._scopes: Dict[str, str] = {}
+        self.metrics = {"checked": 0, "flagged": 0, "indexed": 0}
+
+    @staticmethod
+    def scope(social_worker_id: Optional[str], client_id: Optional[str]) -> str:
+        return f"{social_worker_id}:{client_id}"
+
+    def band_keys(self, scope: str, signature: np.ndarray) -> List[str]:
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows_per_band:(band + 1) * self.rows_per_band]
+            digest = hashlib.blake2b(chunk.tobytes(), digest_size=8).hexdigest()
+            keys.append(f"neardup:{scope}:{band}:{digest}")
+        return keys
+
+    def _redis(self):
+        """The shared Redis client, or None when running without Redis"""
+        try:
+            client = get_redis()
+        except RuntimeError:
+            return None
+        return None if isinstance(client, MockRedis) else client
+
+    # ===== LOOKUP / UPDATE =====
+
+    async def _candidates(self, keys: List[str], note_id: Optional[str]) -> Dict[str, np.ndarray]:
+        client = self._redis()
+        if client is not None:
+            try:
+                pipeline = client.pipeline()
+                for key in keys:
+                    pipeline.smembers(key)
+                members = set()
+                for bucket in await pipeline.execute():
+                    members.update(bucket)
+                members.discard(note_id)
+                if not members:
+                    return {}
+                ids = list(members)
+                raw = await client.mget([f"neardup:sig:{candidate}" for candidate in ids])
+                return {
+                    candidate: np.frombuffer(bytes.fromhex(value), dtype=np.uint32)
+                    for candidate, value in zip(ids, raw) if value
+                }
+            except Exception as e:
+                logger.warning(f"⚠️ Near-duplicate lookup in Redis failed, using local index: {e}")
+
+        members = set()
+        for key in keys:
+            members.update(self._buckets.get(key, ()))
+        members.discard(note_id)
+        return {candidate: self._signatures[candidate] for candidate in members if candidate in self._signatures}
+
+    async def add(self, note_id: str, scope: str, signature: np.ndarray):
+        keys = self.band_keys(scope, signature)
+        client = self._redis()
+        if client is not None:
+            try:
+                pipeline = client.pipeline()
+                for key in keys:
+                    pipeline.sadd(key, note_id)
+                # The shared client decodes responses, so signatures are stored as hex
+                pipeline.set(f"neardup:sig:{note_id}", signature.astype(np.uint32).tobytes().hex())
+                # The scope locates the note's band buckets again for remove()
+                pipeline.set(f"neardup:scope:{note_id}", scope)
+                await pipeline.execute()
+                self.metrics["indexed"] += 1
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ Near-duplicate index write to Redis failed, using local index: {e}")
+
+        for key in keys:
+            self._buckets.setdefault(key, set()).add(note_id)
+        self._signatures[note_id] = signature
+        self._scopes[note_id] = scope
+        self.metrics["indexed"] += 1
+
+    async def remove(self, note_id: str):
+        """Drop a deleted (or about to be re-signed) note from the index"""
+        client = self._redis()
+        if client is not None:
+            try:
+                scope, value = await client.mget([f"neardup:scope:{note_id}", f"neardup:sig:{note_id}"])
+                pipeline = client.pipeline()
+                if scope and value:
+                    for key in self.band_keys(scope, np.frombuffer(bytes.fromhex(value), dtype=np.uint32)):
+                        pipeline.srem(key, note_id)
+                pipeline.delete(f"neardup:scope:{note_id}", f"neardup:sig:{note_id}")
+                await pipeline.execute()
+            except Exception as e:
+                logger.warning(f"⚠️ Near-duplicate removal from Redis failed for {note_id}: {e}")
+
+        signature = self._signatures.pop(note_id, None)
+        scope = self._scopes.pop(note_id, None)
+        if signature is not None and scope is not None:
+            for key in self.band_keys(scope, signature):
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(note_id)
+                    if not bucket:
+                        del self._buckets[key]
+
+    async def check_and_add(self, note: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Near-duplicates of a newly written note among earlier notes for the
+        same client (best first), then add the note to the index.
+        """
+        if not self.enabled or not note.get("id"):
+            return []
+        text = f"{note.get('title') or ''}\n{note.get('content') or ''}"
+        signature = self.hasher.signature(text)
+        scope = self.scope(note.get("social_worker_id"), note.get("client_id"))
+        keys = self.band_keys(scope, signature)
+
+        candidates = await self._candidates(keys, note["id"])
+        matches = []
+        for candidate_id, candidate_signature in candidates.items():
+            similarity = self.hasher.similarity(signature, candidate_signature)
+            if similarity >= self.threshold:
+                matches.append({"case_note_id": candidate_id, "similarity": round(similarity, 3)})
+        matches.sort(key=lambda match: match["similarity"], reverse=True)
+
+        await self.add(note["id"], scope, signature)
+        self.metrics["checked"] += 1
+        if matches:
+            self.metrics["flagged"] += 1
+            logger.info(f"🪞 Note {note['id']} is a near-duplicate of {matches[0]['case_note_id']} ({matches[0]['similarity']:.2f})")
+        return matches
+
+    async def update(self, note: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Re-sign an edited note: drop its old buckets, then check and add it again"""
+        if not self.enabled or not note.get("id"):
+            return []
+        await self.remove(note["id"])
+        return await self.check_and_add(note)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "bands": self.bands,
+            "rows_per_band": self.rows_per_band,
+            "local_notes": len(self._signatures),
+            **self.metrics
+        }
+
+
+def cluster_pairs(note_ids: Iterable[str], pairs: Iterable[tuple]) -> List[List[str]]:
+    """Connected components (union-find) of near-duplicate pairs, clusters of 2+"""
+    parent = {note_id: note_id for note_id in note_ids}
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for first, second in pairs:
+        root_first, root_second = find(first), find(second)
+        if root_first != root_second:
+            parent[root_second] = root_first
+
+    clusters: Dict[str, List[str]] = {}
+    for note_id in parent:
+        clusters.setdefault(find(note_id), []).append(note_id)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+# Shared index instance
+near_duplicate_index = NearDuplicateIndex()
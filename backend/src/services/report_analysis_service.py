@@ -3,23 +3,79 @@ AI-powered report analysis service using Claude API
 """
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import json
+import hashlib
+import time
+import asyncio
+import anthropic
 from anthropic import Anthropic
 from config.database import get_supabase
+from config.outbound_governor import get_governor, DEFAULT_RETRYABLE
+from services.near_duplicates import strip_boilerplate
+from utils.pagination import keyset_filter
+
+# Anthropic errors worth retrying; anything else (bad request, auth) fails immediately
+ANTHROPIC_RETRYABLE = DEFAULT_RETRYABLE + (
+    anthropic.APIConnectionError,
+    anthropic.RateLimitError,
+    anthropic.InternalServerError
+)
 
 logger = logging.getLogger(__name__)
 
+# Bump to invalidate every cached summary after changing the prompts below
+SUMMARY_PROMPT_VERSION = "1"
+SUMMARY_PROMPTS = {
+    "chunk": """Summarize these case notes about one social work client, oldest first.
+Keep dates, people, services, risks and agreed actions; drop small talk and repetition.
+Write plain text, at most 250 words.
+
+CASE NOTES:
+{text}""",
+    "merge": """These are summaries of consecutive periods of one social work client's case history, oldest first.
+Merge them into one chronological summary. Keep dates, risks and actions that are still open; note what was resolved.
+Write plain text, at most 400 words.
+
+SUMMARIES:
+{text}""",
+    "fold": """Update a social work client's case summary with their new case activity.
+Keep what is still relevant from the existing summary, add the new developments, and mark issues that are now resolved.
+Write plain text with the sections Background, Current situation, Risks and Open actions, at most 400 words.
+
+{text}"""
+}
+
 class ReportAnalysisService:
     def __init__(self):
         self.logger = logger
         self.anthropic_key = os.getenv("ANTHROPIC_API_KEY")
+        # Override to point at a proxy or the local stand-in (scripts/provider_standins.py)
+        self.api_base = os.getenv("ANTHROPIC_BASE_URL") or None
         self.client = None
         
+        # Concurrency cap, retries and circuit breaker for Claude calls (ANTHROPIC_* settings)
+        self.governor = get_governor("anthropic", call_timeout=60.0, max_concurrency=4)
+        self.deadline_seconds = float(os.getenv("ANTHROPIC_DEADLINE_SECONDS", "120"))
+        
+        # Incremental client summaries (generate_client_case_summary)
+        self.summary_model = os.getenv("CLIENT_SUMMARY_MODEL", "claude-3-5-sonnet-20241022")
+        self.summary_chunk_notes = int(os.getenv("CLIENT_SUMMARY_CHUNK_NOTES", "20"))
+        self.summary_chunk_chars = int(os.getenv("CLIENT_SUMMARY_CHUNK_CHARS", "12000"))
+        self.summary_page_size = int(os.getenv("CLIENT_SUMMARY_PAGE_SIZE", "500"))
+        self.summary_merge_fanout = int(os.getenv("CLIENT_SUMMARY_MERGE_FANOUT", "8"))
+        self.summary_note_max_chars = int(os.getenv("CLIENT_SUMMARY_NOTE_MAX_CHARS", "4000"))
+        
         if self.anthropic_key:
             try:
-                self.client = Anthropic(api_key=self.anthropic_key)
+                # Retries are handled by the governor, not the SDK
+                self.client = Anthropic(
+                    api_key=self.anthropic_key,
+                    base_url=self.api_base,
+                    max_retries=0,
+                    timeout=self.governor.call_timeout
+                )
                 logger.info("✅ Claude AI client initialized")
             except Exception as e:
                 logger.error(f"❌ Failed to initialize Claude AI client: {e}")
@@ -30,6 +86,19 @@ class ReportAnalysisService:
         """Check if service is healthy"""
         return bool(self.anthropic_key and self.client)
     
+    async def _create_message(self, **kwargs):
+        """
+        messages.create through the outbound governor. The SDK client is
+        synchronous, so calls run in a worker thread instead of blocking the loop.
+        Raises CircuitOpenError while Claude is failing, so callers go straight
+        to their fallback responses.
+        """
+        return await self.governor.call(
+            lambda: asyncio.to_thread(self.client.messages.create, **kwargs),
+            deadline=time.monotonic() + self.deadline_seconds,
+            retryable=ANTHROPIC_RETRYABLE
+        )
+    
     async def generate_monthly_case_summary(self, user_id: str, month: int, year: int) -> Dict[str, Any]:
         """Generate AI-powered monthly case summary report"""
         try:
@@ -248,7 +317,7 @@ Provide analysis in this JSON format:
 }}"""
             
             # Call Claude API
-            response = self.client.messages.create(
+            response = await self._create_message(
                 model="claude-3-5-sonnet-20241022",
                 max_tokens=1500,
                 temperature=0.3,
@@ -323,7 +392,7 @@ Provide strategic analysis in this JSON format:
 }}"""
             
             # Call Claude API
-            response = self.client.messages.create(
+            response = await self._create_message(
                 model="claude-3-5-sonnet-20241022",
                 max_tokens=2000,
                 temperature=0.3,
@@ -400,3 +469,238 @@ Provide strategic analysis in this JSON format:
         except Exception as e:
             logger.error(f"❌ Error calculating quarterly metrics: {e}")
             return {}
+    
+    # ===== CLIENT CASE SUMMARIES =====
+    
+    async def generate_client_case_summary(self, user_id: str, client_id: str, rebuild: bool = False) -> Dict[str, Any]:
+        """
+        Rolling summary of a client's whole case history, refreshed incrementally.
+        
+        Only notes created after the stored watermark are read, in keyset pages
+        of CLIENT_SUMMARY_PAGE_SIZE. They are cut into chunks (see
+        _chunk_notes) and each chunk is summarised (map). The chunk summaries
+        are merged CLIENT_SUMMARY_MERGE_FANOUT at a time until one remains
+        (reduce), and that is folded into the stored client summary. Every
+        Claude call is cached by a hash of its input in `case_summary_cache`.
+        Chunk boundaries depend only on the notes, so a retried refresh or a
+        rebuild reuses the chunk summaries of earlier runs; merges and the
+        fold are redone. A refresh costs tokens in proportion to new activity.
+        
+        If Claude fails midway, the last stored summary is returned with
+        status "stale"; finished calls stay cached for the next attempt.
+        Edited or deleted older notes are only picked up by rebuild=True.
+        The watermark only moves after the new summary is stored.
+        """
+        supabase = get_supabase()
+        usage = {"claude_calls": 0, "cache_hits": 0, "input_tokens": 0, "output_tokens": 0}
+        report = {
+            "report_type": "client_case_summary",
+            "client_id": client_id,
+            "generated_at": datetime.utcnow().isoformat()
+        }
+        
+        previous = await asyncio.to_thread(self._load_client_summary, supabase, user_id, client_id)
+        stored = None if rebuild else previous
+        after = (stored["last_note_created_at"], stored["last_note_id"]) if stored and stored.get("last_note_id") else None
+        page = await asyncio.to_thread(self._fetch_client_notes, supabase, user_id, client_id, after, self.summary_page_size)
+        
+        if not page:
+            if not stored:
+                return {**report, "status": "no_data", "message": "No case notes found for this client"}
+            return {
+                **report,
+                "status": "up_to_date",
+                "summary": stored["summary"],
+                "notes_summarized": stored["notes_summarized"],
+                "new_notes": 0,
+                "summary_updated_at": stored["updated_at"],
+                "usage": usage
+            }
+        
+        if not self.client:
+            return {
+                **report,
+                "status": "unavailable",
+                "message": "AI analysis unavailable - Anthropic API key not configured",
+                "summary": previous["summary"] if previous else None,
+                "has_new_notes": True
+            }
+        
+        logger.info(f"🧾 Summarizing new notes for client {client_id} ({'rebuild' if rebuild else 'incremental'})")
+        
+        new_notes, chunk_count, levels = 0, 0, 1
+        open_chunk: List[str] = []
+        summaries: List[str] = []
+        try:
+            # Map: one summary per chunk, page by page; the last chunk of a page stays open
+            while True:
+                new_notes += len(page)
+                last_note = page[-1]
+                chunks = self._chunk_notes(page, open_chunk)
+                if chunks:
+                    summaries += await self._cached_completions(supabase, "chunk", chunks, usage)
+                    chunk_count += len(chunks)
+                if len(page) < self.summary_page_size:
+                    break
+                page = await asyncio.to_thread(
+                    self._fetch_client_notes, supabase, user_id, client_id,
+                    (last_note["created_at"], last_note["id"]), self.summary_page_size
+                )
+                if not page:
+                    break
+            if open_chunk:
+                summaries += await self._cached_completions(supabase, "chunk", ["\n\n".join(open_chunk)], usage)
+                chunk_count += 1
+            
+            # Reduce: merge fanout summaries at a time until one is left
+            while len(summaries) > 1:
+                groups = [
+                    summaries[start:start + self.summary_merge_fanout]
+                    for start in range(0, len(summaries), self.summary_merge_fanout)
+                ]
+                summaries = await self._cached_completions(supabase, "merge", ["\n\n---\n\n".join(group) for group in groups], usage)
+                levels += 1
+            
+            summary = summaries[0]
+            if stored and stored.get("summary"):
+                folded = await self._cached_completions(
+                    supabase, "fold", [f"EXISTING SUMMARY:\n{stored['summary']}\n\nNEW ACTIVITY:\n{summary}"], usage
+                )
+                summary = folded[0]
+        except Exception as e:
+            logger.error(f"❌ Client summary refresh for {client_id} failed, returning the stored summary: {e}")
+            return {
+                **report,
+                "status": "stale",
+                "message": f"AI summary refresh failed: {str(e)}",
+                "summary": previous["summary"] if previous else None,
+                "notes_summarized": previous["notes_summarized"] if previous else 0,
+                "new_notes": new_notes,
+                "summary_updated_at": previous["updated_at"] if previous else None,
+                "usage": usage
+            }
+        
+        notes_summarized = (stored["notes_summarized"] if stored else 0) + new_notes
+        row = {
+            "social_worker_id": user_id,
+            "client_id": client_id,
+            "summary": summary,
+            "last_note_created_at": last_note["created_at"],
+            "last_note_id": last_note["id"],
+            "notes_summarized": notes_summarized,
+            "model": self.summary_model,
+            "updated_at": datetime.utcnow().isoformat()
+        }
+        await asyncio.to_thread(
+            lambda: supabase.table("client_summaries").upsert(row, on_conflict="social_worker_id,client_id").execute()
+        )
+        
+        logger.info(f"✅ Client summary updated for {client_id}: {usage}")
+        return {
+            **report,
+            "status": "completed",
+            "summary": summary,
+            "notes_summarized": notes_summarized,
+            "new_notes": new_notes,
+            "chunks": chunk_count,
+            "reduce_levels": levels,
+            "summary_updated_at": row["updated_at"],
+            "usage": usage
+        }
+    
+    def _load_client_summary(self, supabase, user_id: str, client_id: str) -> Optional[Dict[str, Any]]:
+        result = supabase.table("client_summaries").select("*").eq(
+            "social_worker_id", user_id
+        ).eq("client_id", client_id).limit(1).execute()
+        return result.data[0] if result.data else None
+    
+    def _fetch_client_notes(
+        self,
+        supabase,
+        user_id: str,
+        client_id: str,
+        after: Optional[Tuple[str, str]],
+        page_size: int
+    ) -> List[Dict[str, Any]]:
+        """One page of the client's notes after `after`, oldest first (blocking; runs in a worker thread)"""
+        query = supabase.table("case_notes").select(
+            "id, title, content, category, priority, created_at"
+        ).eq("social_worker_id", user_id).eq("client_id", client_id).neq("status", "deleted")
+        if after:
+            query = query.or_(keyset_filter(*after, descending=False))
+        return query.order("created_at").order("id").limit(page_size).execute().data or []
+    
+    def _is_chunk_boundary(self, note_id: str) -> bool:
+        """True for about one note id in summary_chunk_notes"""
+        return int(hashlib.sha256(str(note_id).encode("utf-8")).hexdigest()[:8], 16) % self.summary_chunk_notes == 0
+    
+    def _chunk_notes(self, notes: List[Dict[str, Any]], current: List[str]) -> List[str]:
+        """
+        Add notes to the open chunk `current` (in place) and return the chunks
+        closed on the way. A chunk closes after a note whose id is a boundary,
+        or before it would pass summary_chunk_chars. Boundaries do not depend
+        on where a run starts, so runs over the same notes cut the same chunks
+        (after a size cut, from the next id boundary on).
+        """
+        chunks = []
+        for note in notes:
+            content = strip_boilerplate(note.get("content") or "").strip()[:self.summary_note_max_chars]
+            text = (
+                f"[{(note.get('created_at') or '')[:10]}] {note.get('title') or 'Untitled'} "
+                f"({note.get('category', 'general')}, {note.get('priority', 'medium')})\n{content}"
+            )
+            if current and sum(len(part) for part in current) + len(text) > self.summary_chunk_chars:
+                chunks.append("\n\n".join(current))
+                current.clear()
+            current.append(text)
+            if self._is_chunk_boundary(note["id"]):
+                chunks.append("\n\n".join(current))
+                current.clear()
+        return chunks
+    
+    def _summary_hash(self, kind: str, text: str) -> str:
+        key = f"{SUMMARY_PROMPT_VERSION}|{self.summary_model}|{kind}|{text}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+    
+    async def _cached_completions(self, supabase, kind: str, texts: List[str], usage: Dict[str, int]) -> List[str]:
+        """
+        Summaries of texts with the `kind` prompt, in order. Cached results are
+        fetched with one query; the rest are requested concurrently (the
+        governor caps how many Claude calls run at once).
+        """
+        hashes = [self._summary_hash(kind, text) for text in texts]
+        cached = await asyncio.to_thread(
+            lambda: supabase.table("case_summary_cache").select("content_hash, summary").in_("content_hash", list(set(hashes))).execute()
+        )
+        found = {row["content_hash"]: row["summary"] for row in cached.data or []}
+        usage["cache_hits"] += sum(1 for content_hash in hashes if content_hash in found)
+        
+        async def summarize(content_hash: str, text: str):
+            response = await self._create_message(
+                model=self.summary_model,
+                max_tokens=800,
+                temperature=0.2,
+                messages=[{"role": "user", "content": SUMMARY_PROMPTS[kind].format(text=text)}]
+            )
+            row = {
+                "content_hash": content_hash,
+                "kind": kind,
+                "summary": response.content[0].text.strip(),
+                "model": self.summary_model,
+                "input_tokens": getattr(response.usage, "input_tokens", 0),
+                "output_tokens": getattr(response.usage, "output_tokens", 0)
+            }
+            # Stored straight away, so finished calls survive a failure elsewhere in the run
+            await asyncio.to_thread(
+                lambda: supabase.table("case_summary_cache").upsert(row, on_conflict="content_hash").execute()
+            )
+            found[content_hash] = row["summary"]
+            usage["claude_calls"] += 1
+            usage["input_tokens"] += row["input_tokens"]
+            usage["output_tokens"] += row["output_tokens"]
+        
+        missing = {content_hash: text for content_hash, text in zip(hashes, texts) if content_hash not in found}
+        if missing:
+            await asyncio.gather(*(summarize(content_hash, text) for content_hash, text in missing.items()))
+        
+        return [found[content_hash] for content_hash in hashes]
@@ -0,0 +1,386 @@
+"""
+Resumable chunked uploads for voice session audio
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+import aiofiles
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator, Callable
+from redis.exceptions import WatchError
+
+from config.redis_client import get_redis, MockRedis
+from services.voice_service import voice_service, AudioFileTooLargeError
+from services.transcript_cache import hash_file
+from jobs.transcription import enqueue_voice_upload
+
+logger = logging.getLogger(__name__)
+
+
+class UploadNotFoundError(Exception):
+    """Raised when an upload id is unknown, expired or owned by another user"""
+    pass
+
+
+class UploadOffsetMismatchError(Exception):
+    """Raised when a chunk does not start at the server's current offset"""
+
+    def __init__(self, expected_offset: int, received_offset: int):
+        self.expected_offset = expected_offset
+        self.received_offset = received_offset
+        super().__init__(f"Chunk starts at byte {received_offset}, expected {expected_offset}")
+
+
+class UploadLockedError(Exception):
+    """Raised when another request is already writing to the same upload"""
+    pass
+
+
+class ResumableUploadService:
+    """
+    Byte-offset resumable uploads (tus-style).
+
+    A client creates an upload with its total size, then sends chunks that
+    each start at the current offset. If the connection drops, it asks for
+    the offset and continues from there. Chunks are written straight into
+    one partial file under AUDIO_TEMP_DIR; upload state (offset, owner,
+    session) lives in Redis so any API worker can accept the next chunk.
+    Without Redis, state falls back to this process only. Partial files
+    whose state has expired are swept when new uploads are created.
+    """
+
+    def __init__(self):
+        self.max_chunk_size = int(os.getenv("VOICE_UPLOAD_MAX_CHUNK_MB", "8")) * 1024 * 1024
+        self.ttl_seconds = int(os.getenv("VOICE_UPLOAD_TTL_SECONDS", str(24 * 3600)))
+        # The lock is extended while data keeps arriving, so slow chunks keep it
+        self.lock_seconds = int(os.getenv("VOICE_UPLOAD_LOCK_SECONDS", "120"))
+        self.sweep_interval_seconds = int(os.getenv("VOICE_UPLOAD_SWEEP_INTERVAL_SECONDS", "600"))
+        self._last_sweep: Optional[float] = None
+        self._local_state: Dict[str, Dict[str, Any]] = {}
+        self._local_locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def _state_key(upload_id: str) -> str:
+        return f"voice-upload:{upload_id}"
+
+    def _redis(self):
+        """The shared Redis client, or None when running without Redis"""
+        try:
+            client = get_redis()
+        except RuntimeError:
+            return None
+        return None if isinstance(client, MockRedis) else client
+
+    async def _load_state(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        client = self._redis()
+        if client is None:
+            state = self._local_state.get(upload_id)
+            if state and datetime.fromisoformat(state["updated_at"]) + timedelta(seconds=self.ttl_seconds) < datetime.utcnow():
+                await self._delete_state(upload_id)
+                return None
+            # A copy, like a Redis read, so unsaved changes never leak into the stored state
+            return dict(state) if state else None
+        raw = await client.get(self._state_key(upload_id))
+        return json.loads(raw) if raw else None
+
+    async def _save_state(self, state: Dict[str, Any]):
+        state["updated_at"] = datetime.utcnow().isoformat()
+        client = self._redis()
+        if client is None:
+            self._local_state[state["upload_id"]] = dict(state)
+            return
+        await client.set(self._state_key(state["upload_id"]), json.dumps(state), ex=self.ttl_seconds)
+
+    async def _delete_state(self, upload_id: str):
+        client = self._redis()
+        if client is None:
+            self._local_state.pop(upload_id, None)
+            self._local_locks.pop(upload_id, None)
+            return
+        await client.delete(self._state_key(upload_id))
+
+    async def _acquire_lock(self, upload_id: str) -> Optional[str]:
+        """One writer per upload; returns a token for _release_lock"""
+        client = self._redis()
+        if client is None:
+            lock = self._local_locks.setdefault(upload_id, asyncio.Lock())
+            if lock.locked():
+                raise UploadLockedError("A chunk for this upload is already being written")
+            await lock.acquire()
+            return None
+
+        token = str(uuid.uuid4())
+        acquired = await client.set(f"{self._state_key(upload_id)}:lock", token, nx=True, ex=self.lock_seconds)
+        if not acquired:
+            raise UploadLockedError("A chunk for this upload is already being written")
+        return token
+
+    async def _extend_lock(self, upload_id: str, token: Optional[str]) -> bool:
+        """Push the lock's expiry out again; False if it expired and was taken"""
+        client = self._redis()
+        if client is None:
+            return True
+
+        return await self._if_lock_held(client, upload_id, token, lambda pipe, key: pipe.expire(key, self.lock_seconds))
+
+    async def _release_lock(self, upload_id: str, token: Optional[str]):
+        client = self._redis()
+        if client is None:
+            lock = self._local_locks.get(upload_id)
+            if lock and lock.locked():
+                lock.release()
+            return
+
+        await self._if_lock_held(client, upload_id, token, lambda pipe, key: pipe.delete(key))
+
+    async def _if_lock_held(self, client, upload_id: str, token: Optional[str], command: Callable) -> bool:
+        """
+        Queue `command` on the lock key and run it only if `token` still holds
+        the lock. WATCH makes the check and the command atomic: if the lock
+        expires and another writer takes it in between, the transaction is
+        aborted instead of touching their lock.
+        """
+        lock_key = f"{self._state_key(upload_id)}:lock"
+        async with client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(lock_key)
+                if await pipe.get(lock_key) != token:
+                    return False
+                pipe.multi()
+                command(pipe, lock_key)
+                await pipe.execute()
+                return True
+            except WatchError:
+                return False
+
+    def _public_state(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        public = {
+            "upload_id": state["upload_id"],
+            "session_id": state["session_id"],
+            "filename": state["filename"],
+            "offset": state["offset"],
+            "total_size": state["total_size"],
+            "status": state["status"],
+            "max_chunk_size": self.max_chunk_size,
+            "expires_at": state["expires_at"]
+        }
+        if state.get("audio_metadata"):
+            public["audio_metadata"] = state["audio_metadata"]
+        if state.get("job_id"):
+            public["job_id"] = state["job_id"]
+            public["status_url"] = f"/api/case-notes/voice-sessions/{state['session_id']}/status"
+        return public
+
+    async def create_upload(
+        self,
+        session_id: str,
+        user_id: str,
+        filename: str,
+        total_size: int,
+        client_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Register a new upload and reserve its partial file"""
+        if total_size <= 0:
+            raise ValueError("total_size must be a positive number of bytes")
+        if total_size > voice_service.max_file_size:
+            raise AudioFileTooLargeError(
+                f"Audio file exceeds limit of {voice_service.max_file_size/1024/1024:.0f}MB"
+            )
+
+        await self._maybe_sweep()
+
+        upload_id = str(uuid.uuid4())
+        safe_name = os.path.basename(filename or "audio.wav")
+        file_path = os.path.join(voice_service.temp_dir, f"{upload_id}_{safe_name}.part")
+        async with aiofiles.open(file_path, "wb"):
+            pass
+
+        state = {
+            "upload_id": upload_id,
+            "session_id": session_id,
+            "user_id": user_id,
+            "client_id": client_id,
+            "filename": safe_name,
+            "file_path": file_path,
+            "total_size": total_size,
+            "offset": 0,
+            "status": "uploading",
+            "created_at": datetime.utcnow().isoformat(),
+            "expires_at": (datetime.utcnow() + timedelta(seconds=self.ttl_seconds)).isoformat()
+        }
+        await self._save_state(state)
+
+        logger.info(f"📤 Created resumable upload {upload_id} for session {session_id} ({total_size/1024:.0f}KB)")
+        return self._public_state(state)
+
+    async def get_upload(self, upload_id: str, session_id: str, user_id: str) -> Dict[str, Any]:
+        """Full upload state, checked against the caller"""
+        state = await self._load_state(upload_id)
+        if not state or state["session_id"] != session_id or state["user_id"] != user_id:
+            raise UploadNotFoundError("Upload not found or expired")
+        return state
+
+    async def get_offset(self, upload_id: str, session_id: str, user_id: str) -> Dict[str, Any]:
+        """Where the client should resume from"""
+        state = await self.get_upload(upload_id, session_id, user_id)
+        return self._public_state(state)
+
+    async def append_chunk(
+        self,
+        upload_id: str,
+        session_id: str,
+        user_id: str,
+        offset: int,
+        chunks: AsyncIterator[bytes]
+    ) -> Dict[str, Any]:
+        """
+        Write a chunk that starts at `offset` and advance the upload.
+
+        The chunk is streamed to disk at its offset; a previously interrupted
+        write past the recorded offset is overwritten and truncated, so
+        retrying the same chunk is safe.
+        """
+        token = await self._acquire_lock(upload_id)
+        try:
+            state = await self.get_upload(upload_id, session_id, user_id)
+            if state["status"] != "uploading" or offset != state["offset"]:
+                raise UploadOffsetMismatchError(state["offset"], offset)
+
+            written = 0
+            lock_extended_at = time.monotonic()
+            async with aiofiles.open(state["file_path"], "r+b") as part_file:
+                await part_file.seek(offset)
+                try:
+                    async for data in chunks:
+                        if not data:
+                            continue
+                        if time.monotonic() - lock_extended_at > self.lock_seconds / 3:
+                            if not await self._extend_lock(upload_id, token):
+                                raise UploadLockedError("Upload lock expired while the chunk was being written")
+                            lock_extended_at = time.monotonic()
+                        if written + len(data) > self.max_chunk_size:
+                            raise AudioFileTooLargeError(
+                                f"Chunk exceeds limit of {self.max_chunk_size/1024/1024:.0f}MB"
+                            )
+                        if offset + written + len(data) > state["total_size"]:
+                            raise AudioFileTooLargeError("Chunk extends past the declared upload size")
+                        await part_file.write(data)
+                        written += len(data)
+                except (AudioFileTooLargeError, UploadLockedError):
+                    raise
+                except Exception:
+                    # Connection dropped mid-chunk: keep what arrived so the client resumes from there
+                    if written:
+                        await part_file.truncate(offset + written)
+                        state["offset"] = offset + written
+                        await self._save_state(state)
+                        logger.warning(f"⚠️ Upload {upload_id} interrupted at byte {state['offset']}")
+                    raise
+                await part_file.truncate(offset + written)
+
+            state["offset"] = offset + written
+            if state["offset"] == state["total_size"]:
+                await self._start_transcription(state)
+            else:
+                await self._save_state(state)
+            return self._public_state(state)
+        finally:
+            await self._release_lock(upload_id, token)
+
+    async def _start_transcription(self, state: Dict[str, Any]):
+        """
+        Assemble the finished upload and queue it for transcription.
+
+        If probing or queueing fails, the partial file is put back and the
+        stored offset is left as it was, so the client retries the last chunk.
+        """
+        part_path = state["file_path"]
+        final_path = part_path[:-len(".part")]
+        os.replace(part_path, final_path)
+
+        try:
+            # Reject over-length audio before it reaches a worker
+            audio_metadata = await voice_service.probe_audio(final_path)
+            content_hash = await asyncio.to_thread(hash_file, final_path)
+            job = await asyncio.to_thread(
+                enqueue_voice_upload,
+                final_path,
+                state["session_id"],
+                state.get("client_id"),
+                state["user_id"],
+                content_hash=content_hash
+            )
+        except AudioFileTooLargeError:
+            os.remove(final_path)
+            state["status"] = "rejected"
+            await self._save_state(state)
+            raise
+        except Exception:
+            os.replace(final_path, part_path)
+            raise
+
+        state["file_path"] = final_path
+        state["audio_metadata"] = audio_metadata
+
+        # Keep the state so offset queries and retried final chunks see the outcome
+        state["status"] = "completed"
+        state["job_id"] = job.id
+        await self._save_state(state)
+        logger.info(f"✅ Resumable upload {state['upload_id']} complete, queued job {job.id}")
+
+    async def _maybe_sweep(self):
+        """Sweep abandoned partial files at most once per sweep interval"""
+        if self._last_sweep is not None and time.monotonic() - self._last_sweep < self.sweep_interval_seconds:
+            return
+        self._last_sweep = time.monotonic()
+        try:
+            await self.sweep_stale_parts()
+        except Exception as e:
+            logger.warning(f"⚠️ Sweeping abandoned uploads failed: {e}")
+
+    async def sweep_stale_parts(self) -> int:
+        """
+        Delete partial files untouched for longer than the upload TTL whose
+        state is gone. Every chunk refreshes both the file and the state
+        expiry, so these uploads can no longer be resumed.
+        """
+        candidates = await asyncio.to_thread(self._stale_part_files, time.time() - self.ttl_seconds)
+        removed = 0
+        for upload_id, path in candidates:
+            if await self._load_state(upload_id) is not None:
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        if removed:
+            logger.info(f"🧹 Removed {removed} abandoned partial uploads from {voice_service.temp_dir}")
+        return removed
+
+    @staticmethod
+    def _stale_part_files(cutoff: float) -> List[Tuple[str, str]]:
+        """(upload_id, path) of .part files last modified before cutoff"""
+        stale = []
+        with os.scandir(voice_service.temp_dir) as entries:
+            for entry in entries:
+                upload_id, separator, _ = entry.name.partition("_")
+                if (entry.name.endswith(".part") and separator and len(upload_id) == 36
+                        and entry.is_file() and entry.stat().st_mtime < cutoff):
+                    stale.append((upload_id, entry.path))
+        return stale
+
+    async def abort_upload(self, upload_id: str, session_id: str, user_id: str):
+        """Discard an upload and its partial file"""
+        state = await self.get_upload(upload_id, session_id, user_id)
+        if state["status"] == "uploading" and os.path.exists(state["file_path"]):
+            os.remove(state["file_path"])
+        await self._delete_state(upload_id)
+
+
+# Shared service instance
+resumable_upload_service = ResumableUploadService()
@@ -0,0 +1,495 @@
+"""
+Local semantic search over case notes
+
+Notes are embedded on CPU with a small sentence-embedding model and stored
+as L2-normalised float16 rows in a memory-mapped matrix on local disk.
+Queries are embedded the same way and answered by a vectorised cosine
+(dot product) scan over the rows owned by the caller, then top-k.
+"""
+
+import os
+import json
+import time
+import fcntl
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAX_EMBED_CHARS = 4000
+
+
+def note_text(note: Dict[str, Any]) -> str:
+    """The text that represents a note in the index"""
+    title = (note.get("title") or "").strip()
+    content = (note.get("content") or "").strip()
+    return f"{title}. {content}"[:MAX_EMBED_CHARS] if title else content[:MAX_EMBED_CHARS]
+
+
+class TextEmbedder:
+    """Mean-pooled sentence embeddings from a local transformers model (loaded on first use)"""
+
+    def __init__(self):
+        self.model_name = os.getenv("SEMANTIC_MODEL_NAME", "sentence-transformers/all-MiniLM-L6-v2")
+        self.max_length = int(os.getenv("SEMANTIC_MAX_TOKENS", "256"))
+        self.batch_size = int(os.getenv("SEMANTIC_EMBED_BATCH_SIZE", "32"))
+        self._tokenizer = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._model is not None:
+                return
+            from transformers import AutoTokenizer, AutoModel
+
+            logger.info(f"🧠 Loading embedding model {self.model_name}...")
+            started = time.perf_counter()
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            self._model = AutoModel.from_pretrained(self.model_name)
+            self._model.eval()
+            logger.info(f"✅ Embedding model loaded in {time.perf_counter() - started:.1f}s")
+
+    @property
+    def dim(self) -> int:
+        self._load()
+        return int(self._model.config.hidden_size)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), dim) float32, L2-normalised (blocking)"""
+        import torch
+
+        self._load()
+        batches = []
+        with torch.inference_mode():
+            for start in range(0, len(texts), self.batch_size):
+                encoded = self._tokenizer(
+                    texts[start:start + self.batch_size],
+                    padding=True,
+                    truncation=True,
+                    max_length=self.max_length,
+                    return_tensors="pt"
+                )
+                hidden = self._model(**encoded).last_hidden_state
+                mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                batches.append(torch.nn.functional.normalize(pooled, dim=1).cpu().numpy())
+        if not batches:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.vstack(batches).astype(np.float32, copy=False)
+
+
+class SemanticIndex:
+    """
+    float16 vectors in `vectors.f16` (np.memmap, grown by doubling) plus an
+    append-only `rows.jsonl` log mapping rows to note id, owner and client.
+
+    Updating a note overwrites its row in place; deleting tombstones it.
+    Rows are scoped by interned owner/client codes held in int32 arrays, so
+    the scope filter is one vectorised comparison. A scan of a million
+    384-d rows takes tens of milliseconds.
+
+    Several processes on one host may share the directory (API workers and
+    scripts/build_semantic_index.py). Writers hold an exclusive flock on
+    `index.lock` while they replay log lines written by other processes,
+    allocate rows, write vectors and append to the log, so a row number is
+    never handed out twice. Searches replay new log lines first. clear()
+    bumps the `generation` in meta.json, which tells every other process to
+    drop its rows and replay the new log from the start. flock is
+    not reliable on network filesystems, so SEMANTIC_INDEX_DIR must be on
+    local disk.
+    """
+
+    def __init__(self, directory: str, dim: int, model_name: str = ""):
+        self.directory = directory
+        self.dim = dim
+        self.model_name = model_name
+        self.scan_chunk_rows = int(os.getenv("SEMANTIC_SCAN_CHUNK_ROWS", "65536"))
+
+        self._lock = threading.Lock()
+        self._reset()
+        self._load()
+
+    # ===== STORAGE =====
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, "vectors.f16")
+
+    @property
+    def _log_path(self) -> str:
+        return os.path.join(self.directory, "rows.jsonl")
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    @property
+    def _lock_path(self) -> str:
+        return os.path.join(self.directory, "index.lock")
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Cross-process lock on the index directory"""
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _code(self, key: Optional[str]) -> int:
+        if key is None:
+            return -1
+        if key not in self._codes:
+            self._codes[key] = len(self._codes)
+        return self._codes[key]
+
+    def _reset(self):
+        """Forget everything held in memory (the files are left alone)"""
+        self._vectors: Optional[np.memmap] = None
+        self._capacity = 0
+        self._count = 0
+        self._note_ids: List[Optional[str]] = []
+        self._row_of: Dict[str, int] = {}
+        self._owners = np.zeros(0, dtype=np.int32)
+        self._clients = np.zeros(0, dtype=np.int32)
+        self._codes: Dict[str, int] = {}
+        self._log_offset = 0
+        self._generation = None
+
+    def _read_meta(self) -> Dict[str, Any]:
+        if not os.path.exists(self._meta_path):
+            return {}
+        with open(self._meta_path) as meta_file:
+            return json.load(meta_file)
+
+    def _write_meta(self, generation: int):
+        """Replace meta.json atomically, so readers without the lock never see half a file"""
+        temp_path = f"{self._meta_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as meta_file:
+            json.dump({"dim": self.dim, "model": self.model_name, "generation": generation}, meta_file)
+        os.replace(temp_path, self._meta_path)
+
+    def _load(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock, self._file_lock(exclusive=True):
+            meta = self._read_meta()
+            if meta and (meta.get("dim") != self.dim or meta.get("model") != self.model_name):
+                logger.warning(f"⚠️ Semantic index was built with {meta.get('model')} ({meta.get('dim')}d), starting a new one")
+                for path in (self._vectors_path, self._log_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                self._write_meta(meta.get("generation", 0) + 1)
+            elif not meta:
+                self._write_meta(0)
+
+            self._apply_log()
+        logger.info(f"✅ Semantic index loaded: {len(self._row_of)} notes in {self.directory}")
+
+    def _apply_log(self):
+        """Replay log lines appended since the last call, by this or any other process"""
+        generation = self._read_meta().get("generation", 0)
+        if generation != self._generation:
+            # First load, or the index was cleared elsewhere (rebuild): replay the new log from the start
+            self._reset()
+            self._grow(1024)
+            self._generation = generation
+        size = os.path.getsize(self._log_path) if os.path.exists(self._log_path) else 0
+        if size == self._log_offset:
+            return
+        with open(self._log_path, "rb") as log_file:
+            log_file.seek(self._log_offset)
+            data = log_file.read(size - self._log_offset)
+        complete = data.rfind(b"\n") + 1  # a crashed writer may leave a partial last line
+        for line in data[:complete].splitlines():
+            if line.strip():
+                self._apply_entry(json.loads(line))
+        self._log_offset += complete
+
+    def _apply_entry(self, entry: Dict[str, Any]):
+        row = entry["row"]
+        if row >= self._count:
+            self._grow(row + 1)
+            self._note_ids.extend([None] * (row + 1 - self._count))
+            self._count = row + 1
+        previous = self._note_ids[row]
+        if previous is not None and self._row_of.get(previous) == row:
+            del self._row_of[previous]
+        if entry.get("deleted"):
+            self._note_ids[row] = None
+            self._owners[row] = -1
+            return
+        self._note_ids[row] = entry["note_id"]
+        self._row_of[entry["note_id"]] = row
+        self._owners[row] = self._code(entry["owner"])
+        self._clients[row] = self._code(entry.get("client"))
+
+    def _grow(self, min_capacity: int):
+        """Extend the memory-mapped matrix and row arrays to at least min_capacity rows"""
+        if min_capacity <= self._capacity:
+            return
+        capacity = max(min_capacity, self._capacity * 2)
+        if self._vectors is not None:
+            self._vectors.flush()
+            del self._vectors
+        # Only ever extend: another process may already have grown the file further
+        with open(self._vectors_path, "ab") as vector_file:
+            if os.path.getsize(self._vectors_path) < capacity * self.dim * 2:
+                vector_file.truncate(capacity * self.dim * 2)
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float16, mode="r+", shape=(capacity, self.dim))
+
+        owners = np.full(capacity, -1, dtype=np.int32)
+        owners[:len(self._owners)] = self._owners
+        clients = np.full(capacity, -1, dtype=np.int32)
+        clients[:len(self._clients)] = self._clients
+        self._owners, self._clients = owners, clients
+        self._capacity = capacity
+
+    def _append_log(self, log_lines: List[str]):
+        """Append our own entries (caller holds the exclusive file lock)"""
+        with open(self._log_path, "a") as log_file:
+            log_file.write("\n".join(log_lines) + "\n")
+        self._log_offset = os.path.getsize(self._log_path)
+
+    def _refresh(self):
+        """Pick up rows written by other processes, if the log or its generation has changed"""
+        size = os.path.getsize(self._log_path) if os.path.exists(self._log_path) else 0
+        if size != self._log_offset or self._read_meta().get("generation", 0) != self._generation:
+            with self._file_lock(exclusive=False):
+                self._apply_log()
+
+    # ===== UPDATES =====
+
+    def upsert(self, records: List[Tuple[str, str, Optional[str]]], vectors: np.ndarray):
+        """Store (note_id, owner_id, client_id) rows with their vectors (blocking)"""
+        with self._lock, self._file_lock(exclusive=True):
+            self._apply_log()
+            log_lines = []
+            for (note_id, owner_id, client_id), vector in zip(records, vectors):
+                row = self._row_of.get(note_id)
+                if row is None:
+                    row = self._count
+                    self._grow(row + 1)
+                    self._count += 1
+                    self._note_ids.append(note_id)
+                    self._row_of[note_id] = row
+                self._vectors[row] = vector.astype(np.float16)
+                self._owners[row] = self._code(owner_id)
+                self._clients[row] = self._code(client_id)
+                log_lines.append(json.dumps({"row": row, "note_id": note_id, "owner": owner_id, "client": client_id}))
+            self._vectors.flush()
+            self._append_log(log_lines)
+
+    def remove(self, note_id: str):
+        with self._lock, self._file_lock(exclusive=True):
+            self._apply_log()
+            row = self._row_of.pop(note_id, None)
+            if row is None:
+                return
+            self._owners[row] = -1
+            self._note_ids[row] = None
+            self._append_log([json.dumps({"row": row, "deleted": True})])
+
+    def clear(self):
+        """Empty the index for every process sharing the directory (rebuilds)"""
+        with self._lock, self._file_lock(exclusive=True):
+            # Only the log defines rows; vectors.f16 stays mapped by other
+            # processes, so it is reused rather than shrunk
+            if os.path.exists(self._log_path):
+                os.truncate(self._log_path, 0)
+            self._write_meta(self._read_meta().get("generation", 0) + 1)
+            self._apply_log()
+
+    # ===== SEARCH =====
+
+    def search(
+        self,
+        query: np.ndarray,
+        owner_id: str,
+        client_id: Optional[str] = None,
+        k: int = 10
+    ) -> List[Tuple[str, float]]:
+        """Top-k (note_id, cosine score) among the owner's notes (blocking)"""
+        with self._lock:
+            self._refresh()
+            owner_code = self._codes.get(owner_id)
+            if owner_code is None or self._count == 0:
+                return []
+            mask = self._owners[:self._count] == owner_code
+            if client_id:
+                client_code = self._codes.get(client_id)
+                if client_code is None:
+                    return []
+                mask &= self._clients[:self._count] == client_code
+            rows = np.flatnonzero(mask)
+            if len(rows) == 0:
+                return []
+
+            # Score in chunks so the float32 copy never exceeds scan_chunk_rows x dim
+            query = query.astype(np.float32).reshape(-1)
+            scores = np.empty(len(rows), dtype=np.float32)
+            for start in range(0, len(rows), self.scan_chunk_rows):
+                block = rows[start:start + self.scan_chunk_rows]
+                scores[start:start + len(block)] = self._vectors[block].astype(np.float32) @ query
+
+            k = min(k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self._note_ids[rows[i]], float(scores[i])) for i in top]
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "notes": len(self._row_of),
+            "rows": self._count,
+            "capacity": self._capacity,
+            "dim": self.dim,
+            "bytes_on_disk": self._capacity * self.dim * 2
+        }
+
+
+class SemanticSearchService:
+    """
+    Keeps the index current and answers queries.
+
+    Created or updated notes are queued; a background task embeds them in
+    batches (one model forward per batch) and writes them to the index, so
+    note writes never wait for the model. Notes changed outside the API are
+    picked up by scripts/build_semantic_index.py.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("SEMANTIC_SEARCH_ENABLED", "false").lower() == "true"
+        self.index_dir = os.getenv("SEMANTIC_INDEX_DIR", os.path.join(os.getcwd(), "semantic-index"))
+        self.batch_size = int(os.getenv("SEMANTIC_INDEX_BATCH_SIZE", "64"))
+        self.flush_interval = float(os.getenv("SEMANTIC_INDEX_FLUSH_INTERVAL_SECONDS", "1.0"))
+        self.max_queue_size = int(os.getenv("SEMANTIC_INDEX_QUEUE_SIZE", "10000"))
+
+        self.embedder = TextEmbedder()
+        self._index: Optional[SemanticIndex] = None
+        self._index_lock = threading.Lock()
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self.metrics = {"queued": 0, "dropped": 0, "indexed": 0, "failed": 0, "searches": 0}
+
+    @property
+    def index(self) -> SemanticIndex:
+        """The on-disk index, opened on first use (loads the model to learn its dimension)"""
+        with self._index_lock:
+            if self._index is None:
+                self._index = SemanticIndex(self.index_dir, self.embedder.dim, self.embedder.model_name)
+            return self._index
+
+    # ===== LIFECYCLE =====
+
+    def start(self):
+        if not self.enabled or self._writer_task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._writer_task = asyncio.create_task(self._writer())
+        logger.info(f"✅ Semantic indexer started ({self.index_dir})")
+
+    async def stop(self):
+        if self._writer_task is None:
+            return
+        await self._queue.join()
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        self._writer_task = None
+        logger.info("🛑 Semantic indexer stopped")
+
+    # ===== INDEXING =====
+
+    def enqueue_notes(self, notes: List[Dict[str, Any]]):
+        """Queue created or updated notes for embedding; never blocks the caller"""
+        if self._queue is None:
+            return
+        for note in notes:
+            if not note.get("id") or not note.get("social_worker_id"):
+                continue
+            try:
+                self._queue.put_nowait(note)
+                self.metrics["queued"] += 1
+            except asyncio.QueueFull:
+                # The catch-up script re-embeds anything missed
+                self.metrics["dropped"] += 1
+
+    def index_notes(self, notes: List[Dict[str, Any]]) -> int:
+        """Embed and store notes (blocking); deleted notes are removed"""
+        live = [note for note in notes if note.get("status") != "deleted"]
+        for note in notes:
+            if note.get("status") == "deleted":
+                self.index.remove(note["id"])
+        if not live:
+            return 0
+        vectors = self.embedder.encode([note_text(note) for note in live])
+        self.index.upsert(
+            [(note["id"], note["social_worker_id"], note.get("client_id")) for note in live],
+            vectors
+        )
+        return len(live)
+
+    async def _next_batch(self) -> List[Dict[str, Any]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _writer(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                self.metrics["indexed"] += await asyncio.to_thread(self.index_notes, batch)
+            except Exception as e:
+                self.metrics["failed"] += len(batch)
+                logger.error(f"❌ Failed to index {len(batch)} notes: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    # ===== SEARCH =====
+
+    async def search(
+        self,
+        user_id: str,
+        query: str,
+        client_id: Optional[str] = None,
+        k: int = 10
+    ) -> List[Tuple[str, float]]:
+        """Top-k (note_id, score) for free text, among the user's notes"""
+        def run():
+            vector = self.embedder.encode([query])[0]
+            return self.index.search(vector, user_id, client_id=client_id, k=k)
+
+        self.metrics["searches"] += 1
+        return await asyncio.to_thread(run)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            **self.metrics,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "index": self._index.stats() if self._index else None
+        }
+
+
+# Shared service instance
+semantic_search_service = SemanticSearchService()
@@ -0,0 +1,268 @@
+"""
+Real-time streaming transcription for live voice sessions
+"""
+
+import os
+import json
+import uuid
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional, List, AsyncIterator
+
+from services.transcript_analyzer import transcript_analyzer
+
+logger = logging.getLogger(__name__)
+
+# Linear PCM assumed by the byte-based timing of the local stand-in
+STREAM_SAMPLE_RATE = 16000
+STREAM_BYTES_PER_SECOND = STREAM_SAMPLE_RATE * 2  # 16-bit mono
+
+STANDIN_SCRIPT = [
+    "Client called regarding housing assistance.",
+    "They are currently staying with friends but need permanent housing within the next two weeks.",
+    "Discussed available programs and scheduled follow-up appointment for next Monday.",
+    "Client reports the situation is stable and the children are safe."
+]
+
+
+class StreamingProvider:
+    """
+    A streaming transcription connection.
+
+    Audio frames go in with send_audio(); transcript events come out of
+    events() as dicts: {"type": "partial" | "final", "text", "start", "end",
+    "confidence"}. finish() signals end of audio; events() ends once the
+    provider has flushed its last final segment.
+    """
+
+    name = "base"
+
+    async def connect(self):
+        pass
+
+    async def send_audio(self, frame: bytes):
+        raise NotImplementedError
+
+    async def finish(self):
+        raise NotImplementedError
+
+    def events(self) -> AsyncIterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class WebSocketStreamingProvider(StreamingProvider):
+    """
+    Forwards audio to a streaming speech-to-text service over a WebSocket.
+
+    Binary frames carry audio; the service replies with JSON messages in the
+    event format above, and a {"type": "end"} text message closes the stream.
+    """
+
+    name = "websocket"
+
+    def __init__(self, url: str, api_key: Optional[str] = None, language: str = "en"):
+        self.url = url
+        self.api_key = api_key
+        self.language = language
+        self._connection = None
+
+    async def connect(self):
+        import websockets
+
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        separator = "&" if "?" in self.url else "?"
+        self._connection = await websockets.connect(
+            f"{self.url}{separator}language={self.language}&sample_rate={STREAM_SAMPLE_RATE}",
+            extra_headers=headers,
+            max_size=2 ** 20
+        )
+        logger.info(f"🎙️ Connected to streaming transcription at {self.url}")
+
+    async def send_audio(self, frame: bytes):
+        await self._connection.send(frame)
+
+    async def finish(self):
+        await self._connection.send(json.dumps({"type": "end"}))
+
+    async def events(self) -> AsyncIterator[Dict[str, Any]]:
+        async for message in self._connection:
+            if isinstance(message, bytes):
+                continue
+            event = json.loads(message)
+            if event.get("type") in ("partial", "final"):
+                yield event
+            elif event.get("type") == "end":
+                break
+
+    async def close(self):
+        if self._connection is not None:
+            await self._connection.close()
+
+
+class LocalStreamingProvider(StreamingProvider):
+    """
+    In-process stand-in for development and tests (no network).
+
+    Emits a partial transcript every partial_seconds of received audio and
+    finalises a segment every segment_seconds, drawing text from a script.
+    Timing is derived from byte counts of 16 kHz 16-bit mono PCM.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        script: Optional[List[str]] = None,
+        segment_seconds: float = 3.0,
+        partial_seconds: float = 1.0
+    ):
+        self.script = script or STANDIN_SCRIPT
+        self.segment_bytes = int(segment_seconds * STREAM_BYTES_PER_SECOND)
+        self.partial_bytes = int(partial_seconds * STREAM_BYTES_PER_SECOND)
+        self._queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+        self._received = 0
+        self._segment_start = 0
+        self._last_partial = 0
+        self._segment_index = 0
+
+    def _segment_text(self) -> str:
+        return self.script[self._segment_index % len(self.script)]
+
+    def _seconds(self, byte_count: int) -> float:
+        return round(byte_count / STREAM_BYTES_PER_SECOND, 3)
+
+    async def _emit_final(self):
+        await self._queue.put({
+            "type": "final",
+            "text": self._segment_text(),
+            "start": self._seconds(self._segment_start),
+            "end": self._seconds(self._received),
+            "confidence": 0.92
+        })
+        self._segment_index += 1
+        self._segment_start = self._received
+        self._last_partial = self._received
+
+    async def send_audio(self, frame: bytes):
+        self._received += len(frame)
+
+        if self._received - self._last_partial >= self.partial_bytes:
+            words = self._segment_text().split()
+            progress = min(1.0, (self._received - self._segment_start) / self.segment_bytes)
+            await self._queue.put({
+                "type": "partial",
+                "text": " ".join(words[:max(1, int(len(words) * progress))]),
+                "start": self._seconds(self._segment_start),
+                "end": self._seconds(self._received),
+                "confidence": 0.8
+            })
+            self._last_partial = self._received
+
+        if self._received - self._segment_start >= self.segment_bytes:
+            await self._emit_final()
+
+    async def finish(self):
+        if self._received > self._segment_start:
+            await self._emit_final()
+        await self._queue.put(None)
+
+    async def events(self) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            event = await self._queue.get()
+            if event is None:
+                break
+            yield event
+
+
+def create_streaming_provider(language: str = "en") -> StreamingProvider:
+    """The configured streaming provider, or the local stand-in"""
+    url = os.getenv("STREAMING_TRANSCRIPTION_URL")
+    provider = os.getenv("STREAMING_TRANSCRIPTION_PROVIDER", "websocket" if url else "local")
+    if provider == "websocket" and url:
+        return WebSocketStreamingProvider(url, os.getenv("STREAMING_TRANSCRIPTION_API_KEY"), language)
+    return LocalStreamingProvider()
+
+
+class StreamingTranscriptionSession:
+    """
+    One live transcription: collects finalised segments and keeps a running
+    analysis, so the full transcript_result is ready as soon as audio stops.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        client_id: Optional[str],
+        provider: StreamingProvider,
+        language: str = "en"
+    ):
+        self.session_id = session_id
+        self.client_id = client_id
+        self.provider = provider
+        self.language = language
+        self.segments: List[Dict[str, Any]] = []
+        self.analysis = transcript_analyzer.incremental()
+        self.audio_bytes = 0
+        self.started_at = datetime.utcnow()
+
+    async def send_audio(self, frame: bytes):
+        self.audio_bytes += len(frame)
+        await self.provider.send_audio(frame)
+
+    def add_final_segment(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Record a finalised segment and analyze it; returns the message for the client"""
+        segment = {
+            "index": len(self.segments),
+            "text": event.get("text", "").strip(),
+            "start": event.get("start"),
+            "end": event.get("end"),
+            "confidence": event.get("confidence")
+        }
+        self.segments.append(segment)
+        segment_analysis = self.analysis.add_segment(segment["text"])
+
+        running = self.analysis.result()
+        return {
+            "type": "final",
+            "segment": segment,
+            "segment_analysis": {
+                "keywords": segment_analysis["keywords"],
+                "urgency_indicators": segment_analysis["urgency_indicators"],
+                "sentiment": segment_analysis["sentiment"]
+            },
+            "analysis": {k: v for k, v in running.items() if k not in ("keyword_hits", "urgency_hits")}
+        }
+
+    def transcript_result(self) -> Dict[str, Any]:
+        """Same shape as VoiceService.transcribe_audio_file, for create_note_from_transcript"""
+        confidences = [segment["confidence"] for segment in self.segments if segment["confidence"] is not None]
+        ends = [segment["end"] for segment in self.segments if segment["end"] is not None]
+        return {
+            "session_id": self.session_id,
+            "client_id": self.client_id,
+            "transcript": " ".join(segment["text"] for segment in self.segments if segment["text"]),
+            "confidence": round(sum(confidences) / len(confidences), 3) if confidences else 0.0,
+            "duration_seconds": max(ends) if ends else 0.0,
+            "language": self.language,
+            "analysis": self.analysis.result(),
+            "status": "completed",
+            "message": "Audio transcribed in real time",
+            "segments": self.segments,
+            "streaming_provider": self.provider.name,
+            "is_mock": isinstance(self.provider, LocalStreamingProvider)
+        }
+
+
+def new_stream_session(session_id: Optional[str], client_id: Optional[str]) -> StreamingTranscriptionSession:
+    """A streaming session on the configured provider"""
+    language = os.getenv("VAPI_TRANSCRIPTION_LANGUAGE", "en")
+    return StreamingTranscriptionSession(
+        session_id=session_id or str(uuid.uuid4()),
+        client_id=client_id,
+        provider=create_streaming_provider(language),
+        language=language
+    )
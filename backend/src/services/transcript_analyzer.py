@@ -0,0 +1,212 @@
+"""
+Single-pass transcript analysis engine for voice case notes
+"""
+
+import string
+from typing import Dict, Any, List, Tuple, Iterable
+
+# Keyword lexicons (order is preserved in results; the first hit drives note titles)
+CASE_KEYWORDS = [
+    "emergency", "urgent", "crisis", "help", "assistance",
+    "housing", "food", "medical", "mental health", "family",
+    "children", "safety", "abuse", "neglect", "domestic violence"
+]
+
+URGENCY_WORDS = ["emergency", "urgent", "crisis", "immediate", "asap", "help"]
+
+# Sentiment lexicon weights (positive > 0, negative < 0)
+SENTIMENT_WEIGHTS = {
+    "good": 1.0,
+    "better": 1.0,
+    "improving": 1.0,
+    "stable": 1.0,
+    "safe": 1.0,
+    "progress": 1.0,
+    "bad": -1.0,
+    "worse": -1.0,
+    "crisis": -1.5,
+    "danger": -1.5,
+    "unsafe": -1.5,
+    "problems": -1.0
+}
+
+# Punctuation (except apostrophes) becomes whitespace, so str.split() tokenises
+_PUNCTUATION_TO_SPACE = str.maketrans({char: " " for char in string.punctuation.replace("'", "")})
+
+
+class TranscriptAnalyzer:
+    """
+    Tokenises a transcript once and matches every lexicon in a single pass.
+
+    Lexicon terms (including multi-word phrases) are compiled into a table
+    keyed by their first token, so each transcript token costs one dict lookup
+    regardless of lexicon size. Tokenisation is a C-level translate + split.
+    Matches respect word boundaries: "help" does not match "helpful".
+    """
+
+    def __init__(
+        self,
+        keywords: Iterable[str] = CASE_KEYWORDS,
+        urgency_words: Iterable[str] = URGENCY_WORDS,
+        sentiment_weights: Dict[str, float] = SENTIMENT_WEIGHTS
+    ):
+        self.keywords = list(keywords)
+        self.urgency_words = list(urgency_words)
+        self.sentiment_weights = dict(sentiment_weights)
+
+        self._keyword_order = {term: index for index, term in enumerate(self.keywords)}
+        self._urgency_order = {term: index for index, term in enumerate(self.urgency_words)}
+
+        # first token -> [(remaining phrase tokens, term, is keyword, is urgency, weight)], longest first
+        self._phrase_table: Dict[str, List[Tuple[List[str], str, bool, bool, float]]] = {}
+        for term in dict.fromkeys(self.keywords + self.urgency_words + list(self.sentiment_weights)):
+            tokens = self.tokenize(term)
+            if not tokens:
+                continue
+            self._phrase_table.setdefault(tokens[0], []).append((
+                tokens[1:],
+                term,
+                term in self._keyword_order,
+                term in self._urgency_order,
+                self.sentiment_weights.get(term, 0.0)
+            ))
+        for candidates in self._phrase_table.values():
+            candidates.sort(key=lambda candidate: len(candidate[0]), reverse=True)
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Lowercase word tokens"""
+        return text.lower().translate(_PUNCTUATION_TO_SPACE).split()
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        """
+        Analyze one transcript.
+
+        Hits are reported with their word position (token index) in the transcript.
+        """
+        if not text:
+            return {
+                "word_count": 0,
+                "keywords": [],
+                "sentiment": "neutral",
+                "sentiment_score": 0.0,
+                "urgency_indicators": [],
+                "keyword_hits": [],
+                "urgency_hits": []
+            }
+
+        tokens = self.tokenize(text)
+        keyword_hits, urgency_hits, positive_weight, negative_weight = self._scan(tokens)
+        return self._build_result(len(tokens), keyword_hits, urgency_hits, positive_weight, negative_weight)
+
+    def _scan(self, tokens: List[str], position_offset: int = 0) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], float, float]:
+        """Match all lexicons over tokens; returns (keyword hits, urgency hits, positive weight, negative weight)"""
+        phrase_table = self._phrase_table
+        keyword_hits = []
+        urgency_hits = []
+        positive_weight = 0.0
+        negative_weight = 0.0
+        next_position = 0
+
+        for position, token in enumerate(tokens):
+            candidates = phrase_table.get(token)
+            if candidates is None or position < next_position:
+                continue
+
+            for tail, term, is_keyword, is_urgency, weight in candidates:
+                if tail and tokens[position + 1:position + 1 + len(tail)] != tail:
+                    continue
+                hit = {"term": term, "position": position + position_offset}
+                if is_keyword:
+                    keyword_hits.append(hit)
+                if is_urgency:
+                    urgency_hits.append(hit)
+                if weight > 0:
+                    positive_weight += weight
+                elif weight < 0:
+                    negative_weight -= weight
+                next_position = position + 1 + len(tail)
+                break
+
+        return keyword_hits, urgency_hits, positive_weight, negative_weight
+
+    def _build_result(
+        self,
+        word_count: int,
+        keyword_hits: List[Dict[str, Any]],
+        urgency_hits: List[Dict[str, Any]],
+        positive_weight: float,
+        negative_weight: float
+    ) -> Dict[str, Any]:
+        total_weight = positive_weight + negative_weight
+        sentiment_score = (positive_weight - negative_weight) / total_weight if total_weight else 0.0
+        if sentiment_score > 0:
+            sentiment = "positive"
+        elif sentiment_score < 0:
+            sentiment = "negative"
+        else:
+            sentiment = "neutral"
+
+        return {
+            "word_count": word_count,
+            "keywords": sorted({hit["term"] for hit in keyword_hits}, key=self._keyword_order.get),
+            "sentiment": sentiment,
+            "sentiment_score": round(sentiment_score, 3),
+            "urgency_indicators": sorted({hit["term"] for hit in urgency_hits}, key=self._urgency_order.get),
+            "keyword_hits": keyword_hits,
+            "urgency_hits": urgency_hits
+        }
+
+    def incremental(self) -> "IncrementalAnalysis":
+        """Running analysis that is updated one finalised segment at a time"""
+        return IncrementalAnalysis(self)
+
+    def analyze_many(self, texts: Iterable[str]) -> List[Dict[str, Any]]:
+        """Analyze a batch of transcripts with the same compiled lexicons"""
+        return [self.analyze(text) for text in texts]
+
+
+class IncrementalAnalysis:
+    """
+    Accumulates analysis over transcript segments as they are finalised.
+
+    Each segment is scanned once; totals are kept so the analysis of the
+    whole transcript is available at any point without re-reading it.
+    Hit positions are word offsets in the concatenated transcript. A phrase
+    split across two segments is not matched.
+    """
+
+    def __init__(self, analyzer: TranscriptAnalyzer):
+        self.analyzer = analyzer
+        self.word_count = 0
+        self.keyword_hits: List[Dict[str, Any]] = []
+        self.urgency_hits: List[Dict[str, Any]] = []
+        self.positive_weight = 0.0
+        self.negative_weight = 0.0
+
+    def add_segment(self, text: str) -> Dict[str, Any]:
+        """Fold one finalised segment in; returns the analysis of that segment alone"""
+        tokens = self.analyzer.tokenize(text or "")
+        keyword_hits, urgency_hits, positive_weight, negative_weight = self.analyzer._scan(tokens, self.word_count)
+
+        self.word_count += len(tokens)
+        self.keyword_hits.extend(keyword_hits)
+        self.urgency_hits.extend(urgency_hits)
+        self.positive_weight += positive_weight
+        self.negative_weight += negative_weight
+
+        return self.analyzer._build_result(len(tokens), keyword_hits, urgency_hits, positive_weight, negative_weight)
+
+    def result(self) -> Dict[str, Any]:
+        """Analysis of everything added so far (same shape as TranscriptAnalyzer.analyze)"""
+        return self.analyzer._build_result(
+            self.word_count,
+            list(self.keyword_hits),
+            list(self.urgency_hits),
+            self.positive_weight,
+            self.negative_weight
+        )
+
+
+# Shared analyzer instance
+transcript_analyzer = TranscriptAnalyzer()
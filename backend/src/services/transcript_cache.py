@@ -0,0 +1,126 @@
+"""
+Transcript cache keyed by audio content hash, for deduplicating repeated uploads
+"""
+
+import os
+import json
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from config.redis_client import get_redis, MockRedis
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: str) -> str:
+    """SHA-256 of a file, read in chunks (blocking; run off the event loop)"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """
+    Stores transcription results by (content hash, language, provider).
+
+    Entries hold only what the audio determines (transcript, analysis), so
+    they are safe to share between users. The case note created from a
+    transcript is stored separately, scoped to (user, client), so only the
+    same worker re-uploading for the same client gets that note back.
+
+    Uses Redis when it is available so every worker shares the cache, and an
+    in-process LRU otherwise.
+    """
+
+    def __init__(self):
+        self.ttl_seconds = int(os.getenv("TRANSCRIPT_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+        self.max_local_entries = int(os.getenv("TRANSCRIPT_CACHE_LOCAL_SIZE", "1000"))
+        self._local: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(content_hash: str, language: str, provider: str) -> str:
+        return f"transcript:{provider}:{language}:{content_hash}"
+
+    @staticmethod
+    def make_note_key(content_hash: str, user_id: str, client_id: str) -> str:
+        return f"transcript-note:{user_id}:{client_id}:{content_hash}"
+
+    def _redis(self):
+        """The shared Redis client, or None when running without Redis"""
+        try:
+            client = get_redis()
+        except RuntimeError:
+            return None
+        return None if isinstance(client, MockRedis) else client
+
+    async def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = None
+
+        client = self._redis()
+        if client is not None:
+            try:
+                raw = await client.get(key)
+                entry = json.loads(raw) if raw else None
+            except Exception as e:
+                logger.warning(f"⚠️ Transcript cache read failed, using local cache: {e}")
+
+        if entry is None and key in self._local:
+            self._local.move_to_end(key)
+            entry = self._local[key]
+        return entry
+
+    async def _write(self, key: str, entry: Dict[str, Any]):
+        self._local[key] = entry
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+
+        client = self._redis()
+        if client is not None:
+            try:
+                await client.set(key, json.dumps(entry, default=str), ex=self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"⚠️ Transcript cache write failed: {e}")
+
+    async def get(self, content_hash: str, language: str, provider: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached transcription result"""
+        entry = await self._read(self.make_key(content_hash, language, provider))
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def set(self, content_hash: str, language: str, provider: str, entry: Dict[str, Any]):
+        """Store a transcription result"""
+        await self._write(self.make_key(content_hash, language, provider), entry)
+
+    async def get_case_note(self, content_hash: str, user_id: str, client_id: str) -> Optional[Dict[str, Any]]:
+        """The note this user already created from this audio for this client"""
+        entry = await self._read(self.make_note_key(content_hash, user_id, client_id))
+        return entry.get("case_note") if entry else None
+
+    async def set_case_note(self, content_hash: str, user_id: str, client_id: str, case_note: Dict[str, Any]):
+        await self._write(self.make_note_key(content_hash, user_id, client_id), {"case_note": case_note})
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "local_entries": len(self._local),
+            "shared": self._redis() is not None
+        }
+
+
+# Shared cache instance
+transcript_cache = TranscriptCache()
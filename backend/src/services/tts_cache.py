@@ -0,0 +1,191 @@
+"""
+Content-addressed disk cache for synthesized TTS audio
+"""
+
+import os
+import hmac
+import json
+import time
+import uuid
+import hashlib
+import logging
+import secrets
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+TTS_MEDIA_TYPES = {
+    "mp3": "audio/mpeg",
+    "wav": "audio/wav",
+    "ogg": "audio/ogg"
+}
+
+
+class TTSAudioCache:
+    """
+    Stores synthesized audio on local disk, named by a hash of everything
+    that affects the output (text, voice, speed, pitch, format), so the same
+    note is synthesized once no matter how often it is played.
+
+    The directory is shared by every API worker and is the source of truth:
+    lookups check the disk, so audio written by one worker is served by all,
+    and eviction scans the directory. Total size is capped at
+    TTS_CACHE_MAX_MB; the least recently used files are evicted first.
+    Recency is recorded in file access times, so every worker (and a
+    restart) sees the same LRU order; mtime stays the write time, which
+    Last-Modified is derived from. The in-memory index is this process's
+    snapshot of the directory, for stats.
+
+    Files are served to <audio> elements, which cannot send an Authorization
+    header, so playback URLs carry an expiry and an HMAC of file name and
+    expiry (signed_query / verify_signature) instead.
+    """
+
+    def __init__(self):
+        self.cache_dir = os.getenv("TTS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "solace-tts"))
+        self.max_bytes = int(float(os.getenv("TTS_CACHE_MAX_MB", "512")) * 1024 * 1024)
+        self.url_ttl_seconds = int(os.getenv("TTS_AUDIO_URL_TTL_SECONDS", "3600"))
+        secret = os.getenv("TTS_AUDIO_URL_SECRET") or os.getenv("SUPABASE_JWT_SECRET")
+        if not secret:
+            logger.warning("⚠️ TTS_AUDIO_URL_SECRET not set - TTS audio links only work on the worker that issued them")
+            secret = secrets.token_hex(32)
+        self._url_secret = secret.encode("utf-8")
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(text: str, voice_id: str, speed: float, pitch: float, audio_format: str) -> str:
+        """Content address for one synthesis request"""
+        canonical = json.dumps({
+            "text": text,
+            "voice_id": voice_id,
+            "speed": round(float(speed), 3),
+            "pitch": round(float(pitch), 3),
+            "format": audio_format
+        }, sort_keys=True)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def file_name(key: str, audio_format: str) -> str:
+        return f"{key}.{audio_format}"
+
+    def _signature(self, name: str, expires: int) -> str:
+        return hmac.new(self._url_secret, f"{name}:{expires}".encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def signed_query(self, name: str) -> Dict[str, Any]:
+        """Query parameters that authorise playback of one file until they expire"""
+        expires = int(time.time()) + self.url_ttl_seconds
+        return {"expires": expires, "signature": self._signature(name, expires)}
+
+    def verify_signature(self, name: str, expires: int, signature: str) -> bool:
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(self._signature(name, expires), signature)
+
+    def _scan(self):
+        """(atime, name, size) of every cached file, least recently used first"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entries = []
+        with os.scandir(self.cache_dir) as listing:
+            for entry in listing:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # evicted by another worker meanwhile
+                entries.append((stat.st_atime, entry.name, stat.st_size))
+        return sorted(entries)
+
+    def _load_index(self, entries=None):
+        """Rebuild the LRU index from the cache directory (least recently used first)"""
+        if entries is None:
+            entries = self._scan()
+        self._index = OrderedDict((name, size) for _, name, size in entries)
+        self._total_bytes = sum(self._index.values())
+        self._loaded = True
+
+    def path(self, name: str) -> Optional[str]:
+        """Path of a cached file and mark it recently used, or None (blocking)"""
+        with self._lock:
+            if not self._loaded:
+                self._load_index()
+            if os.path.basename(name) != name or name.startswith("."):
+                self.misses += 1
+                return None
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                self._total_bytes -= self._index.pop(name, 0)
+                self.misses += 1
+                return None
+            if name not in self._index:
+                # Written by another worker since this one scanned the directory
+                self._index[name] = stat.st_size
+                self._total_bytes += stat.st_size
+            self._index.move_to_end(name)
+            # Recency goes to atime only; mtime is the Last-Modified validator
+            os.utime(path, ns=(time.time_ns(), stat.st_mtime_ns))
+            self.hits += 1
+            return path
+
+    def put(self, name: str, audio: bytes) -> str:
+        """Store audio atomically and evict down to the size cap (blocking)"""
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = os.path.join(self.cache_dir, name)
+            partial_path = os.path.join(self.cache_dir, f".{uuid.uuid4()}.part")
+            with open(partial_path, "wb") as audio_file:
+                audio_file.write(audio)
+            os.replace(partial_path, path)
+            self._evict(keep=name)
+            return path
+
+    def _evict(self, keep: str):
+        """
+        Evict least recently used files until the directory fits the cap.
+        Other workers write to the same directory, so the files on disk
+        decide, not this process's index. Never evicts `keep` (the entry
+        just written), even if it alone exceeds the cap.
+        """
+        entries = self._scan()
+        total = sum(size for _, _, size in entries)
+        kept = []
+        for entry in entries:
+            _, name, size = entry
+            if total <= self.max_bytes or name == keep:
+                kept.append(entry)
+                continue
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.evictions += 1
+            logger.info(f"🧹 Evicted TTS audio {name} ({size/1024:.0f}KB)")
+        self._load_index(kept)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._index),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions
+        }
+
+
+# Shared cache instance
+tts_audio_cache = TTSAudioCache()
@@ -4,15 +4,43 @@ Vapi Integration Service for Voice Operations
 
 import os
 import json
+import time
+import hashlib
+import io
+import wave
+import asyncio
 import logging
+import tempfile
 import aiofiles
 import aiohttp
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 import uuid
+from config.http_client import get_http_session, get_http_pool_metrics
+from config.outbound_governor import get_governor, TransientProviderError, DEFAULT_RETRYABLE
+from services.transcript_analyzer import transcript_analyzer
+from services.transcript_cache import transcript_cache, hash_file
+from services.tts_cache import tts_audio_cache
+from services.audio_processing import (
+    AudioSegmentFile, split_on_silence_boundaries, preprocess_for_transcription, probe_audio_metadata
+)
 
 logger = logging.getLogger(__name__)
 
+# Per-upload fields kept out of the shared transcript cache entry
+TRANSCRIPT_CACHE_SCOPED_FIELDS = ("session_id", "client_id", "case_note", "cached", "message")
+
+
+class AudioFileTooLargeError(Exception):
+    """Raised when an uploaded audio file exceeds MAX_AUDIO_FILE_SIZE_MB"""
+    pass
+
+
+class AudioTooLongError(AudioFileTooLargeError):
+    """Raised when an audio file's duration exceeds MAX_AUDIO_DURATION_MINUTES"""
+    pass
+
 
 class VoiceService:
     """Service for integrating with Vapi for voice operations"""
@@ -22,6 +50,51 @@ class VoiceService:
         self.api_base = os.getenv("VAPI_API_BASE", "https://api.vapi.ai")
         self.language = os.getenv("VAPI_TRANSCRIPTION_LANGUAGE", "en")
         self.max_file_size = int(os.getenv("MAX_AUDIO_FILE_SIZE_MB", "25")) * 1024 * 1024  # Convert to bytes
+        self.upload_chunk_size = int(os.getenv("AUDIO_UPLOAD_CHUNK_KB", "1024")) * 1024
+        self.temp_dir = os.getenv("AUDIO_TEMP_DIR", tempfile.gettempdir())
+        self.max_duration_seconds = float(os.getenv("MAX_AUDIO_DURATION_MINUTES", "120")) * 60
+        # Synchronous uploads longer than this are handed to the transcription queue
+        self.async_route_seconds = float(os.getenv("VOICE_ASYNC_ROUTE_SECONDS", "600"))
+        
+        # Per-call timeouts for the shared HTTP session
+        self.upload_timeout = aiohttp.ClientTimeout(
+            total=float(os.getenv("VAPI_UPLOAD_TIMEOUT_SECONDS", "120")),
+            connect=float(os.getenv("VAPI_CONNECT_TIMEOUT_SECONDS", "10"))
+        )
+        self.health_timeout = aiohttp.ClientTimeout(
+            total=float(os.getenv("VAPI_HEALTH_TIMEOUT_SECONDS", "5"))
+        )
+        
+        # Concurrency cap, retries and circuit breaker for Vapi calls (VAPI_* settings)
+        self.vapi_governor = get_governor("vapi", call_timeout=self.upload_timeout.total)
+        self.vapi_deadline_seconds = float(os.getenv("VAPI_DEADLINE_SECONDS", "180"))  # per upload, including retries
+        
+        # Long recordings are split at silences and transcribed in parallel
+        self.segmentation_enabled = os.getenv("VOICE_SEGMENTATION_ENABLED", "true").lower() == "true"
+        self.segment_min_duration_seconds = float(os.getenv("VOICE_SEGMENT_MIN_DURATION_SECONDS", "120"))
+        self.max_segment_seconds = float(os.getenv("VOICE_MAX_SEGMENT_SECONDS", "60"))
+        self.segment_min_silence_ms = int(os.getenv("VOICE_SEGMENT_MIN_SILENCE_MS", "500"))
+        self.segment_concurrency = int(os.getenv("VOICE_SEGMENT_CONCURRENCY", "4"))
+        self.segment_cache_size = int(os.getenv("VOICE_SEGMENT_CACHE_SIZE", "512"))
+        self._segment_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        
+        # Optional pre-processing: mono, resampled, silence-trimmed, compact codec
+        self.preprocess_enabled = os.getenv("VOICE_PREPROCESS_ENABLED", "false").lower() == "true"
+        self.preprocess_sample_rate = int(os.getenv("VOICE_PREPROCESS_SAMPLE_RATE", "16000"))
+        self.preprocess_format = os.getenv("VOICE_PREPROCESS_FORMAT", "ogg")
+        self.preprocess_codec = os.getenv("VOICE_PREPROCESS_CODEC", "libopus") or None
+        self.preprocess_bitrate = os.getenv("VOICE_PREPROCESS_BITRATE", "24k") or None
+        self.preprocess_trim_threshold_db = float(os.getenv("VOICE_PREPROCESS_TRIM_THRESHOLD_DB", "-45"))
+        self._transcribe_seconds_per_audio_second: Optional[float] = None
+        
+        # Repeated uploads of the same recording reuse the first transcript
+        self.transcript_cache_enabled = os.getenv("TRANSCRIPT_CACHE_ENABLED", "true").lower() == "true"
+        
+        # Synthesized speech (the mock synthesizer produces WAV)
+        self.tts_format = "wav"
+        self.tts_max_seconds = float(os.getenv("TTS_MAX_SECONDS", "300"))
+        self._tts_locks: Dict[str, asyncio.Lock] = {}
+        self._tts_lock_users: Dict[str, int] = {}  # callers holding or waiting on each lock
         
         if not self.api_key:
             logger.warning("⚠️ VAPI_API_KEY not configured - voice features will be disabled")
@@ -39,22 +112,141 @@ class VoiceService:
         self, 
         file_path: str,
         client_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Transcribe an audio file, reusing the cached transcript if the same
+        audio (by content hash) was already transcribed.
+
+        The file headers are probed first, so over-length audio is rejected
+        (AudioTooLongError) before any transcription work is spent on it.
+        """
+        audio_metadata = await self.probe_audio(file_path)
+        
+        if not self.transcript_cache_enabled:
+            return await self._transcribe_audio_file_uncached(file_path, client_id, session_id, audio_metadata)
+        
+        if content_hash is None:
+            content_hash = await asyncio.to_thread(hash_file, file_path)
+        
+        cached = await self._get_cached_transcript(content_hash, client_id, session_id)
+        if cached:
+            return cached
+        
+        result = await self._transcribe_audio_file_uncached(file_path, client_id, session_id, audio_metadata)
+        await self._cache_transcript(content_hash, result)
+        return result
+    
+    async def probe_audio(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Header-only metadata (duration, codec, sample rate, channels) of an
+        audio file; None if the format is not recognised. Raises
+        AudioTooLongError when the duration exceeds the configured maximum.
+        """
+        try:
+            metadata = await asyncio.to_thread(probe_audio_metadata, file_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Audio metadata probe unavailable: {e}")
+            return None
+        if metadata is None:
+            return None
+        
+        if metadata.duration_seconds > self.max_duration_seconds:
+            raise AudioTooLongError(
+                f"Audio duration {metadata.duration_seconds/60:.1f} minutes exceeds limit of "
+                f"{self.max_duration_seconds/60:.0f} minutes"
+            )
+        return metadata.to_dict()
+    
+    def should_route_async(self, audio_metadata: Optional[Dict[str, Any]]) -> bool:
+        """Whether a recording is long enough to belong on the transcription queue"""
+        return bool(audio_metadata) and audio_metadata["duration_seconds"] > self.async_route_seconds
+    
+    def _provider_name(self) -> str:
+        return "vapi" if self.is_configured() else "mock"
+    
+    async def _get_cached_transcript(
+        self,
+        content_hash: str,
+        client_id: Optional[str],
         session_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        A previous transcription of identical audio. The entry may come from
+        another user's upload, so session and client always come from the caller.
+        """
+        entry = await transcript_cache.get(content_hash, self.language, self._provider_name())
+        if not entry:
+            return None
+        
+        logger.info(f"♻️ Duplicate audio upload {content_hash[:12]} - reusing transcript")
+        return {
+            **entry,
+            "session_id": session_id or str(uuid.uuid4()),
+            "client_id": client_id,
+            "content_hash": content_hash,
+            "cached": True,
+            "message": "Duplicate upload - returning cached transcript"
+        }
+    
+    async def _cache_transcript(self, content_hash: str, result: Dict[str, Any]):
+        """
+        Store the audio-derived part of a transcription result (never a mock
+        fallback for a real provider); session, client and note stay out of
+        the shared entry.
+        """
+        if result.get("is_mock") and self._provider_name() != "mock":
+            return
+        result["content_hash"] = content_hash
+        entry = {k: v for k, v in result.items() if k not in TRANSCRIPT_CACHE_SCOPED_FIELDS}
+        await transcript_cache.set(content_hash, self.language, self._provider_name(), entry)
+    
+    async def find_case_note(self, transcript_result: Dict[str, Any], user_id: str, client_id: str) -> Optional[Dict[str, Any]]:
+        """The note this user already created for this client from the same audio, if any"""
+        content_hash = transcript_result.get("content_hash")
+        if not self.transcript_cache_enabled or not content_hash or not transcript_result.get("cached"):
+            return None
+        return await transcript_cache.get_case_note(content_hash, user_id, client_id)
+    
+    async def remember_case_note(self, transcript_result: Dict[str, Any], case_note: Dict[str, Any], user_id: str, client_id: str):
+        """Record the note created from a transcript so this user's retries for this client reuse it"""
+        content_hash = transcript_result.get("content_hash")
+        if not self.transcript_cache_enabled or not content_hash:
+            return
+        await transcript_cache.set_case_note(content_hash, user_id, client_id, case_note)
+    
+    async def _transcribe_audio_file_uncached(
+        self, 
+        file_path: str,
+        client_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        audio_metadata: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Transcribe an audio file using Vapi or fallback to mock"""
         try:
             if not self.is_configured():
                 logger.info("🔄 Using mock transcription - Vapi not configured")
-                return await self._mock_transcription(file_path, client_id, session_id)
+                return await self._mock_transcription(file_path, client_id, session_id, audio_metadata)
             
             # Check file size
             file_size = os.path.getsize(file_path)
             if file_size > self.max_file_size:
                 raise Exception(f"File size {file_size/1024/1024:.1f}MB exceeds limit of {self.max_file_size/1024/1024}MB")
             
+            # Optional downmix/resample/trim before upload
+            preprocessing = await self._preprocess_audio(file_path)
+            transcribe_path = preprocessing["file_path"] if preprocessing else file_path
+            
             try:
-                # Upload file to Vapi and get transcription
-                transcript_result = await self._vapi_transcribe_file(file_path)
+                # Upload file to Vapi and get transcription (segmented for long recordings)
+                transcribe_started = time.perf_counter()
+                transcript_result = await self._transcribe_with_segmentation(transcribe_path, audio_metadata, bool(preprocessing))
+                if preprocessing:
+                    self._record_preprocessing_savings(preprocessing, time.perf_counter() - transcribe_started)
+                    # Segments are re-encoded, so count the bytes that were actually uploaded
+                    preprocessing["uploaded_bytes"] = transcript_result.get("uploaded_bytes", preprocessing["processed_bytes"])
+                    preprocessing["bytes_saved"] = preprocessing["original_bytes"] - preprocessing["uploaded_bytes"]
                 
                 # Analyze transcript content
                 analysis = self._analyze_transcript(transcript_result["transcript"])
@@ -68,19 +260,25 @@ class VoiceService:
                     "client_id": client_id,
                     "transcript": transcript_result["transcript"],
                     "confidence": transcript_result.get("confidence", 0.95),
-                    "duration_seconds": transcript_result.get("duration", 0.0),
+                    "duration_seconds": transcript_result.get("duration") or (audio_metadata or {}).get("duration_seconds", 0.0),
                     "language": transcript_result.get("language", self.language),
                     "analysis": analysis,
                     "status": "completed",
                     "message": "Audio transcribed successfully via Vapi",
-                    "vapi_file_id": transcript_result.get("file_id")
+                    "vapi_file_id": transcript_result.get("file_id"),
+                    "segments": transcript_result.get("segments"),
+                    "preprocessing": {k: v for k, v in preprocessing.items() if k != "file_path"} if preprocessing else None,
+                    "audio_metadata": audio_metadata
                 }
                 
             except Exception as vapi_error:
                 logger.warning(f"⚠️ Vapi transcription failed: {vapi_error}")
                 logger.info("🔄 Falling back to mock transcription for development")
                 # Fallback to mock transcription
-                return await self._mock_transcription(file_path, client_id, session_id)
+                return await self._mock_transcription(file_path, client_id, session_id, audio_metadata)
+            finally:
+                if preprocessing and os.path.exists(preprocessing["file_path"]):
+                    os.remove(preprocessing["file_path"])
                     
         except Exception as e:
             logger.error(f"❌ Transcription error: {e}")
@@ -102,14 +300,21 @@ class VoiceService:
             if len(audio_buffer) > self.max_file_size:
                 raise Exception(f"Audio buffer size {len(audio_buffer)/1024/1024:.1f}MB exceeds limit")
             
+            # Skip the temp file entirely for audio we've already transcribed
+            content_hash = hashlib.sha256(audio_buffer).hexdigest()
+            if self.transcript_cache_enabled:
+                cached = await self._get_cached_transcript(content_hash, client_id, session_id)
+                if cached:
+                    return cached
+            
             # Save buffer to temporary file
-            temp_path = f"/tmp/{uuid.uuid4()}_{filename}"
+            temp_path = os.path.join(self.temp_dir, f"{uuid.uuid4()}_{os.path.basename(filename)}")
             async with aiofiles.open(temp_path, "wb") as temp_file:
                 await temp_file.write(audio_buffer)
             
             try:
                 # Transcribe the temporary file
-                result = await self.transcribe_audio_file(temp_path, client_id, session_id)
+                result = await self.transcribe_audio_file(temp_path, client_id, session_id, content_hash)
                 return result
             finally:
                 # Clean up temporary file
@@ -120,51 +325,224 @@ class VoiceService:
             logger.error(f"❌ Buffer transcription error: {e}")
             raise
     
+    async def save_upload_to_temp_file(self, upload_file, filename: Optional[str] = None) -> Tuple[str, int, str]:
+        """
+        Stream an uploaded file to a temporary file chunk by chunk.
+
+        The size limit is enforced while streaming, so an oversized upload is
+        rejected without ever being held in memory. The SHA-256 of the content
+        is computed on the same pass. Returns (path, size_bytes, content_hash).
+        """
+        safe_name = os.path.basename(filename or upload_file.filename or "audio.wav")
+        temp_path = os.path.join(self.temp_dir, f"{uuid.uuid4()}_{safe_name}")
+        total_size = 0
+        digest = hashlib.sha256()
+
+        try:
+            async with aiofiles.open(temp_path, "wb") as temp_file:
+                while True:
+                    chunk = await upload_file.read(self.upload_chunk_size)
+                    if not chunk:
+                        break
+                    total_size += len(chunk)
+                    if total_size > self.max_file_size:
+                        raise AudioFileTooLargeError(
+                            f"Audio file exceeds limit of {self.max_file_size/1024/1024:.0f}MB"
+                        )
+                    digest.update(chunk)
+                    await temp_file.write(chunk)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return temp_path, total_size, digest.hexdigest()
+
+    async def transcribe_upload(
+        self,
+        upload_file,
+        client_id: Optional[str] = None,
+        session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Transcribe an UploadFile by streaming it to disk first (no in-memory copy)"""
+        temp_path, file_size, content_hash = await self.save_upload_to_temp_file(upload_file)
+        logger.info(f"📥 Streamed upload to disk: {os.path.basename(temp_path)} ({file_size/1024:.0f}KB)")
+
+        try:
+            return await self.transcribe_audio_file(temp_path, client_id, session_id, content_hash)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
     def _analyze_transcript(self, text: str) -> Dict[str, Any]:
-        """Basic analysis of transcript content"""
-        if not text:
-            return {
-                "word_count": 0,
-                "keywords": [],
-                "sentiment": "neutral",
-                "urgency_indicators": []
-            }
+        """Single-pass keyword, urgency and sentiment analysis of transcript content"""
+        return transcript_analyzer.analyze(text)
+    
+    async def _preprocess_audio(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Run the pre-processing stage off the event loop; None if disabled or it fails"""
+        if not self.preprocess_enabled:
+            return None
+        
+        try:
+            report = await asyncio.to_thread(
+                preprocess_for_transcription,
+                file_path,
+                self.temp_dir,
+                self.preprocess_sample_rate,
+                self.preprocess_format,
+                self.preprocess_codec,
+                self.preprocess_bitrate,
+                self.preprocess_trim_threshold_db
+            )
+            logger.info(
+                f"🎚️ Pre-processed {os.path.basename(file_path)}: "
+                f"{report['original_bytes']/1024:.0f}KB -> {report['processed_bytes']/1024:.0f}KB, "
+                f"trimmed {report['trimmed_seconds']:.1f}s in {report['processing_seconds']:.2f}s"
+            )
+            return report
+        except Exception as e:
+            logger.warning(f"⚠️ Audio pre-processing failed, uploading original file: {e}")
+            return None
+    
+    def _record_preprocessing_savings(self, report: Dict[str, Any], transcribe_seconds: float):
+        """
+        Estimate transcription time saved by trimming, from a running average
+        of transcription seconds per second of audio.
+        """
+        processed_duration = report.get("processed_duration_seconds") or 0.0
+        if processed_duration > 0:
+            ratio = transcribe_seconds / processed_duration
+            if self._transcribe_seconds_per_audio_second is None:
+                self._transcribe_seconds_per_audio_second = ratio
+            else:
+                self._transcribe_seconds_per_audio_second = 0.8 * self._transcribe_seconds_per_audio_second + 0.2 * ratio
+        
+        ratio = self._transcribe_seconds_per_audio_second or 0.0
+        report["transcription_seconds"] = round(transcribe_seconds, 3)
+        report["estimated_transcription_seconds_saved"] = round(report.get("trimmed_seconds", 0.0) * ratio, 3)
+    
+    async def _transcribe_with_segmentation(
+        self,
+        file_path: str,
+        audio_metadata: Optional[Dict[str, Any]] = None,
+        preprocessed: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Transcribe long recordings as parallel segments, short ones as a single
+        file. Pre-processed recordings keep their compact codec when split.
+        The result's uploaded_bytes is the size of what was sent.
+        """
+        segments = None
+        export_args = {
+            "output_format": self.preprocess_format, "codec": self.preprocess_codec, "bitrate": self.preprocess_bitrate
+        } if preprocessed else {}
+        # Known-short recordings skip the full decode that silence detection needs
+        known_short = bool(audio_metadata) and audio_metadata["duration_seconds"] <= self.segment_min_duration_seconds
+        if self.segmentation_enabled and not known_short:
+            try:
+                segments = await asyncio.to_thread(
+                    split_on_silence_boundaries,
+                    file_path,
+                    self.temp_dir,
+                    self.max_segment_seconds,
+                    self.segment_min_duration_seconds,
+                    self.segment_min_silence_ms,
+                    **export_args
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Audio segmentation unavailable, transcribing as one file: {e}")
+        
+        if not segments:
+            result = await self._vapi_transcribe_file(file_path)
+            return {**result, "uploaded_bytes": os.path.getsize(file_path)}
         
-        words = text.lower().split()
-        word_count = len(words)
+        try:
+            uploaded_bytes = sum(os.path.getsize(segment.file_path) for segment in segments)
+            return {**await self._transcribe_segments(segments), "uploaded_bytes": uploaded_bytes}
+        finally:
+            for segment in segments:
+                if os.path.exists(segment.file_path):
+                    os.remove(segment.file_path)
+    
+    async def _transcribe_segments(self, segments: List[AudioSegmentFile]) -> Dict[str, Any]:
+        """
+        Transcribe segments concurrently (capped) and stitch them back together.
         
-        # Basic keyword detection for case notes
-        case_keywords = [
-            "emergency", "urgent", "crisis", "help", "assistance", 
-            "housing", "food", "medical", "mental health", "family",
-            "children", "safety", "abuse", "neglect", "domestic violence"
-        ]
+        Successful segments are cached by content hash, so if one segment fails
+        a retry of the same recording only re-transcribes the failed segment.
+        """
+        semaphore = asyncio.Semaphore(self.segment_concurrency)
         
-        found_keywords = [keyword for keyword in case_keywords if keyword in text.lower()]
+        async def transcribe_segment(segment: AudioSegmentFile) -> Tuple[Dict[str, Any], bool]:
+            cache_key = f"{self.language}:{segment.content_hash}"
+            cached = self._segment_cache.get(cache_key)
+            if cached is not None:
+                self._segment_cache.move_to_end(cache_key)
+                return cached, True
+            
+            # Retries and backoff happen inside the Vapi governor
+            async with semaphore:
+                try:
+                    result = await self._vapi_transcribe_file(segment.file_path)
+                except Exception as e:
+                    logger.warning(f"⚠️ Segment {segment.index} failed: {e}")
+                    raise
+                self._segment_cache[cache_key] = result
+                while len(self._segment_cache) > self.segment_cache_size:
+                    self._segment_cache.popitem(last=False)
+                return result, False
         
-        # Basic urgency detection
-        urgency_words = ["emergency", "urgent", "crisis", "immediate", "asap", "help"]
-        urgency_indicators = [word for word in urgency_words if word in text.lower()]
+        outcomes = await asyncio.gather(
+            *(transcribe_segment(segment) for segment in segments),
+            return_exceptions=True
+        )
         
-        # Simple sentiment (this could be enhanced with a proper sentiment analysis library)
-        positive_words = ["good", "better", "improving", "stable", "safe", "progress"]
-        negative_words = ["bad", "worse", "crisis", "danger", "unsafe", "problems"]
+        failed = [segment.index for segment, outcome in zip(segments, outcomes) if isinstance(outcome, Exception)]
+        if failed:
+            raise Exception(f"Transcription failed for segments {failed} of {len(segments)} (successful segments cached)")
         
-        positive_count = sum(1 for word in positive_words if word in text.lower())
-        negative_count = sum(1 for word in negative_words if word in text.lower())
+        return self._stitch_segments(segments, outcomes)
+    
+    def _stitch_segments(
+        self,
+        segments: List[AudioSegmentFile],
+        outcomes: List[Tuple[Dict[str, Any], bool]]
+    ) -> Dict[str, Any]:
+        """Join segment transcripts, shifting timings by each segment's offset"""
+        stitched = []
+        words = []
+        weighted_confidence = 0.0
+        total_duration = 0.0
         
-        if positive_count > negative_count:
-            sentiment = "positive"
-        elif negative_count > positive_count:
-            sentiment = "negative"
-        else:
-            sentiment = "neutral"
+        for segment, (result, cached) in zip(segments, outcomes):
+            text = (result.get("transcript") or "").strip()
+            confidence = result.get("confidence", 0.0)
+            stitched.append({
+                "index": segment.index,
+                "start_seconds": segment.start_seconds,
+                "end_seconds": segment.end_seconds,
+                "text": text,
+                "confidence": confidence,
+                "cached": cached,
+                "file_id": result.get("file_id")
+            })
+            for word in result.get("words") or []:
+                words.append({
+                    **word,
+                    "start": word.get("start", 0.0) + segment.start_seconds,
+                    "end": word.get("end", 0.0) + segment.start_seconds
+                })
+            weighted_confidence += confidence * segment.duration_seconds
+            total_duration += segment.duration_seconds
         
         return {
-            "word_count": word_count,
-            "keywords": found_keywords,
-            "sentiment": sentiment,
-            "urgency_indicators": urgency_indicators
+            "transcript": " ".join(part["text"] for part in stitched if part["text"]),
+            "confidence": round(weighted_confidence / total_duration, 4) if total_duration else 0.0,
+            "duration": segments[-1].end_seconds,
+            "language": self.language,
+            "file_id": stitched[0]["file_id"],
+            "words": words or None,
+            "segments": stitched
         }
     
     async def _vapi_transcribe_file(self, file_path: str) -> Dict[str, Any]:
@@ -174,8 +552,10 @@ class VoiceService:
                 "Authorization": f"Bearer {self.api_key}"
             }
             
-            async with aiohttp.ClientSession() as session:
-                # Step 1: Upload the file to Vapi
+            session = await get_http_session()
+            
+            # Step 1: Upload the file to Vapi
+            async def upload_file() -> Dict[str, Any]:
                 with open(file_path, "rb") as file:
                     data = aiohttp.FormData()
                     data.add_field('file', file, filename=os.path.basename(file_path))
@@ -183,36 +563,45 @@ class VoiceService:
                     async with session.post(
                         f"{self.api_base}/file",
                         headers=headers,
-                        data=data
+                        data=data,
+                        timeout=self.upload_timeout
                     ) as response:
+                        if response.status == 429 or response.status >= 500:
+                            error_text = await response.text()
+                            raise TransientProviderError(f"Vapi file upload failed: {response.status} - {error_text}")
                         if response.status != 200:
                             error_text = await response.text()
                             raise Exception(f"Vapi file upload failed: {response.status} - {error_text}")
-                        
-                        file_result = await response.json()
-                        file_id = file_result.get("id")
-                        
-                        if not file_id:
-                            raise Exception("No file ID returned from Vapi upload")
-                
-                logger.info(f"✅ File uploaded to Vapi: {file_id}")
-                
-                # Step 2: Create a transcription session/call
-                # Note: This is a simplified approach. In production, you might want to use Vapi's 
-                # assistant feature for more sophisticated transcription handling
-                
-                # For now, we'll use a simple approach - the file upload itself may include transcription
-                # or we can use Vapi's chat/assistant features to process the audio
-                
-                # Return the basic transcription info
-                # In a real implementation, you'd wait for the transcription to complete
-                return {
-                    "transcript": "This is a placeholder transcript from Vapi file upload. Configure Vapi assistant for actual transcription.",
-                    "confidence": 0.90,
-                    "duration": 0.0,
-                    "language": self.language,
-                    "file_id": file_id
-                }
+                        return await response.json()
+            
+            file_result = await self.vapi_governor.call(
+                upload_file,
+                deadline=time.monotonic() + self.vapi_deadline_seconds,
+                retryable=DEFAULT_RETRYABLE + (aiohttp.ClientConnectionError,)
+            )
+            file_id = file_result.get("id")
+            
+            if not file_id:
+                raise Exception("No file ID returned from Vapi upload")
+            
+            logger.info(f"✅ File uploaded to Vapi: {file_id}")
+            
+            # Step 2: Create a transcription session/call
+            # Note: This is a simplified approach. In production, you might want to use Vapi's 
+            # assistant feature for more sophisticated transcription handling
+            
+            # For now, we'll use a simple approach - the file upload itself may include transcription
+            # or we can use Vapi's chat/assistant features to process the audio
+            
+            # Return the basic transcription info
+            # In a real implementation, you'd wait for the transcription to complete
+            return {
+                "transcript": "This is a placeholder transcript from Vapi file upload. Configure Vapi assistant for actual transcription.",
+                "confidence": 0.90,
+                "duration": 0.0,
+                "language": self.language,
+                "file_id": file_id
+            }
                 
         except Exception as e:
             logger.error(f"❌ Vapi transcription error: {e}")
@@ -222,13 +611,17 @@ class VoiceService:
         self, 
         file_path: str,
         client_id: Optional[str] = None,
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        audio_metadata: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Mock transcription for development when OpenAI is not available"""
         try:
-            # Generate a realistic mock transcript based on filename and duration
-            file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 1024
-            estimated_duration = max(5.0, file_size / (1024 * 50))  # Rough estimate
+            # Real duration from the headers when known, otherwise a guess from file size
+            if audio_metadata:
+                estimated_duration = audio_metadata["duration_seconds"]
+            else:
+                file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 1024
+                estimated_duration = max(5.0, file_size / (1024 * 50))  # Rough estimate
             
             # Mock realistic case note content
             mock_transcripts = [
@@ -262,6 +655,7 @@ class VoiceService:
                 "analysis": analysis,
                 "status": "completed",
                 "message": "Audio transcribed successfully (MOCK - configure OpenAI for real transcription)",
+                "audio_metadata": audio_metadata,
                 "is_mock": True  # Flag to indicate this is mock data
             }
                     
@@ -293,8 +687,9 @@ class VoiceService:
                 "social_worker_id": social_worker_id,
                 "session_type": session_type,
                 "status": "ready_for_upload",
-                "message": "Session ready - please upload audio file for transcription",
-                "upload_url": f"/api/case-notes/voice-sessions/{voice_session_id}/upload"
+                "message": "Session ready - upload an audio file or stream audio for real-time transcription",
+                "upload_url": f"/api/case-notes/voice-sessions/{voice_session_id}/upload",
+                "stream_url": f"/api/case-notes/voice-sessions/{voice_session_id}/stream"
             }
                     
         except Exception as e:
@@ -311,17 +706,44 @@ class VoiceService:
         speed: float = 1.0,
         pitch: float = 1.0
     ) -> Dict[str, Any]:
-        """Generate TTS audio for case note content (mock implementation)"""
+        """
+        Generate TTS audio for case note content.
+
+        Output is cached by a hash of (text, voice, speed, pitch, format), so
+        replaying a note serves the stored file instead of synthesizing again.
+        """
         try:
-            # Mock response since OpenAI doesn't have TTS in Whisper
-            # This could be integrated with other TTS services if needed
-            logger.info(f"✅ Mock TTS generated for case note: {case_note_id}")
+            voice_id = voice_id or "default"
+            key = tts_audio_cache.make_key(text_content, voice_id, speed, pitch, self.tts_format)
+            file_name = tts_audio_cache.file_name(key, self.tts_format)
             
+            # One synthesis per key even when several listeners ask at once
+            lock = self._tts_locks.setdefault(key, asyncio.Lock())
+            self._tts_lock_users[key] = self._tts_lock_users.get(key, 0) + 1
+            try:
+                async with lock:
+                    cached_path = await asyncio.to_thread(tts_audio_cache.path, file_name)
+                    if cached_path:
+                        logger.info(f"♻️ Serving cached TTS audio for case note: {case_note_id}")
+                    else:
+                        audio = await asyncio.to_thread(self._synthesize_speech, text_content, speed)
+                        await asyncio.to_thread(tts_audio_cache.put, file_name, audio)
+                        logger.info(f"✅ Mock TTS generated for case note: {case_note_id}")
+            finally:
+                # Drop the lock only when no other caller still holds or waits on it
+                self._tts_lock_users[key] -= 1
+                if not self._tts_lock_users[key]:
+                    del self._tts_lock_users[key]
+                    del self._tts_locks[key]
+            
+            signed = tts_audio_cache.signed_query(file_name)
             return {
                 "case_note_id": case_note_id,
-                "tts_audio_url": f"https://mock-audio-url.com/{case_note_id}.mp3",
-                "voice_id": voice_id or "default",
-                "duration_seconds": len(text_content) // 10,  # Rough estimate
+                "tts_audio_url": f"/api/case-notes/tts-audio/{file_name}?expires={signed['expires']}&signature={signed['signature']}",
+                "tts_audio_url_expires_at": datetime.utcfromtimestamp(signed["expires"]).isoformat(),
+                "voice_id": voice_id,
+                "duration_seconds": self._estimate_speech_seconds(text_content, speed),
+                "cached": bool(cached_path),
                 "status": "completed",
                 "message": "TTS audio generated successfully (mock)"
             }
@@ -330,6 +752,26 @@ class VoiceService:
             logger.error(f"❌ TTS generation error: {e}")
             raise
     
+    @staticmethod
+    def _estimate_speech_seconds(text: str, speed: float = 1.0) -> float:
+        """Roughly 2.5 spoken words per second at normal speed"""
+        return round(len(text.split()) / 2.5 / max(speed, 0.1), 1)
+    
+    def _synthesize_speech(self, text: str, speed: float) -> bytes:
+        """
+        Mock synthesis: a silent WAV of the estimated spoken length (capped),
+        standing in until a TTS provider is wired up. Blocking.
+        """
+        sample_rate = 8000
+        seconds = min(self._estimate_speech_seconds(text, speed), self.tts_max_seconds)
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframes(b"\x00\x00" * int(sample_rate * seconds))
+        return buffer.getvalue()
+    
     # ===== HEALTH CHECK =====
     
     async def health_check(self) -> Dict[str, Any]:
@@ -360,9 +802,9 @@ class VoiceService:
             # Test API connectivity with a simple request
             try:
                 headers = {"Authorization": f"Bearer {self.api_key}"}
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(f"{self.api_base}/file", headers=headers) as response:
-                        api_accessible = response.status in [200, 401, 403]  # 401/403 means API key issue, but API is accessible
+                session = await get_http_session()
+                async with session.get(f"{self.api_base}/file", headers=headers, timeout=self.health_timeout) as response:
+                    api_accessible = response.status in [200, 401, 403]  # 401/403 means API key issue, but API is accessible
                 
                 return {
                     "status": "healthy" if api_accessible else "error",
@@ -370,6 +812,10 @@ class VoiceService:
                     "configured": True,
                     "api_base": self.api_base,
                     "max_file_size_mb": self.max_file_size // 1024 // 1024,
+                    "http_pool": get_http_pool_metrics(),
+                    "transcript_cache": transcript_cache.stats(),
+                    "tts_cache": tts_audio_cache.stats(),
+                    "vapi_governor": self.vapi_governor.stats(),
                     "features": {
                         "voice_transcription": api_accessible,
                         "real_time_calls": api_accessible,
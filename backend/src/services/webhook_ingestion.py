@@ -0,0 +1,271 @@
+"""
+Batched ingestion of Vapi webhooks into voice_sessions / voice_transcripts
+"""
+
+import os
+import hmac
+import time
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from config.database import get_supabase
+from models.case_note import VapiTranscriptWebhook, VapiSessionWebhook
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_EVENT_TYPES = {"transcript"}
+SESSION_EVENT_TYPES = {"session", "status-update", "end-of-call-report"}
+
+# Vapi speaker roles -> voice_transcripts.speaker
+SPEAKER_MAP = {
+    "user": "client",
+    "customer": "client",
+    "client": "client",
+    "assistant": "system",
+    "bot": "system",
+    "system": "system",
+    "social_worker": "social_worker"
+}
+
+SESSION_STATUS_MAP = {
+    "queued": "pending",
+    "ringing": "pending",
+    "in-progress": "processing",
+    "forwarding": "processing",
+    "ended": "completed",
+    "completed": "completed",
+    "failed": "failed"
+}
+
+
+class IngestionQueueFullError(Exception):
+    """Raised when the ingestion queue stays full; the caller should retry later"""
+    pass
+
+
+class VapiWebhookIngestor:
+    """
+    Acknowledge-then-write pipeline for Vapi webhooks.
+
+    The endpoint validates an event and puts it on a bounded in-process queue.
+    A single writer task drains the queue in batches (up to batch_size events
+    or flush_interval seconds). Each batch is written as a voice_sessions
+    upsert (one per distinct column set, usually one) plus one
+    voice_transcripts upsert. Transcript rows are idempotent
+    on (voice_session_id, start_time_seconds), so redelivered webhooks are
+    no-ops. When the queue is full, submit() waits briefly, then raises
+    IngestionQueueFullError so the endpoint can answer 503 and Vapi retries.
+    """
+
+    def __init__(self):
+        self.max_queue_size = int(os.getenv("VAPI_WEBHOOK_QUEUE_SIZE", "10000"))
+        self.batch_size = int(os.getenv("VAPI_WEBHOOK_BATCH_SIZE", "200"))
+        self.flush_interval = float(os.getenv("VAPI_WEBHOOK_FLUSH_INTERVAL_SECONDS", "0.5"))
+        self.enqueue_timeout = float(os.getenv("VAPI_WEBHOOK_ENQUEUE_TIMEOUT_SECONDS", "0.05"))
+        self.max_retries = int(os.getenv("VAPI_WEBHOOK_MAX_RETRIES", "3"))
+        # Vapi sends the assistant's server secret in the X-Vapi-Secret header
+        self.secret = os.getenv("VAPI_WEBHOOK_SECRET")
+        if not self.secret:
+            logger.warning("⚠️ VAPI_WEBHOOK_SECRET not configured - Vapi webhooks will be rejected")
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self.metrics = {
+            "received": 0,
+            "rejected_full": 0,
+            "ignored": 0,
+            "batches": 0,
+            "transcripts_written": 0,
+            "sessions_written": 0,
+            "duplicates_in_batch": 0,
+            "failed_events": 0,
+            "last_flush_seconds": None
+        }
+
+    # ===== LIFECYCLE =====
+
+    def start(self):
+        """Create the queue and writer task on the running event loop"""
+        if self._writer_task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._writer_task = asyncio.create_task(self._writer())
+        logger.info(f"✅ Vapi webhook writer started (batch={self.batch_size}, queue={self.max_queue_size})")
+
+    async def stop(self):
+        """Flush whatever is queued, then stop the writer"""
+        if self._writer_task is None:
+            return
+        await self._queue.join()
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        self._writer_task = None
+        logger.info("🛑 Vapi webhook writer stopped")
+
+    # ===== INTAKE =====
+
+    def verify_secret(self, secret: Optional[str]) -> bool:
+        """True if the request carries the configured Vapi server secret"""
+        if not self.secret or not secret:
+            return False
+        return hmac.compare_digest(secret.encode(), self.secret.encode())
+
+    def parse_event(self, payload: Dict[str, Any]) -> Optional[Tuple[str, Any]]:
+        """
+        Validate a raw webhook payload.
+
+        Returns ("transcript" | "session", model), or None for event types that
+        are not stored. Raises pydantic.ValidationError for malformed events.
+        """
+        event_type = payload.get("event_type")
+        if event_type in TRANSCRIPT_EVENT_TYPES:
+            return "transcript", VapiTranscriptWebhook(**payload)
+        if event_type in SESSION_EVENT_TYPES:
+            return "session", VapiSessionWebhook(**payload)
+        return None
+
+    async def submit(self, payload: Dict[str, Any]) -> bool:
+        """Validate and enqueue one webhook; False if the event type is not stored"""
+        event = self.parse_event(payload)
+        if event is None:
+            self.metrics["ignored"] += 1
+            return False
+
+        if self._queue is None:
+            self.start()
+        try:
+            await asyncio.wait_for(self._queue.put(event), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            self.metrics["rejected_full"] += 1
+            raise IngestionQueueFullError("Webhook queue is full, retry later")
+
+        self.metrics["received"] += 1
+        return True
+
+    # ===== WRITER =====
+
+    async def _next_batch(self) -> List[Tuple[str, Any]]:
+        """Block for one event, then gather more until the batch is full or the interval ends"""
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _writer(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._flush_with_retry(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush_with_retry(self, batch: List[Tuple[str, Any]]):
+        for attempt in range(self.max_retries + 1):
+            try:
+                started = time.perf_counter()
+                await asyncio.to_thread(self._write_batch, batch)
+                self.metrics["batches"] += 1
+                self.metrics["last_flush_seconds"] = round(time.perf_counter() - started, 4)
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.metrics["failed_events"] += len(batch)
+                    logger.error(f"❌ Dropping {len(batch)} Vapi webhook events after {attempt + 1} attempts: {e}")
+                    return
+                delay = 0.5 * (2 ** attempt)
+                logger.warning(f"⚠️ Webhook batch write failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    def build_rows(self, batch: List[Tuple[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], Dict[Tuple[str, float], Dict[str, Any]]]:
+        """
+        Collapse a batch into one session row per Vapi session and one
+        transcript row per (session, start_time); later events win.
+        """
+        sessions: Dict[str, Dict[str, Any]] = {}
+        transcripts: Dict[Tuple[str, float], Dict[str, Any]] = {}
+
+        for kind, event in batch:
+            session = sessions.setdefault(event.session_id, {"vapi_session_id": event.session_id})
+            if event.call_id:
+                session["vapi_call_id"] = event.call_id
+            session["updated_at"] = datetime.utcnow().isoformat()
+
+            if kind == "session":
+                session["transcript_status"] = SESSION_STATUS_MAP.get(event.status, "processing")
+                if event.duration_seconds is not None:
+                    session["call_duration_seconds"] = event.duration_seconds
+                if event.summary:
+                    session["transcript_summary"] = event.summary
+                if event.sentiment_score is not None:
+                    session["sentiment_score"] = round(max(-1.0, min(1.0, event.sentiment_score)), 2)
+                if session["transcript_status"] == "completed":
+                    session["ended_at"] = event.timestamp.isoformat()
+                continue
+
+            key = (event.session_id, round(event.start_time, 2))
+            if key in transcripts:
+                self.metrics["duplicates_in_batch"] += 1
+            transcripts[key] = {
+                "speaker": SPEAKER_MAP.get(event.speaker.lower(), "client"),
+                "text_content": event.transcript,
+                "confidence_score": round(event.confidence, 2),
+                "start_time_seconds": key[1],
+                "end_time_seconds": round(event.end_time, 2)
+            }
+
+        return sessions, transcripts
+
+    def _write_batch(self, batch: List[Tuple[str, Any]]):
+        """One round trip per table (blocking; runs in a worker thread)"""
+        sessions, transcripts = self.build_rows(batch)
+        supabase = get_supabase()
+
+        # PostgREST bulk upserts send one column list, so rows are grouped by the
+        # columns they set; a missing column must not overwrite stored values with NULL
+        groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+        for row in sessions.values():
+            groups.setdefault(frozenset(row), []).append(row)
+
+        session_ids = {}
+        for rows in groups.values():
+            upserted = supabase.table("voice_sessions").upsert(rows, on_conflict="vapi_session_id").execute()
+            session_ids.update({row["vapi_session_id"]: row["id"] for row in upserted.data or []})
+        self.metrics["sessions_written"] += len(sessions)
+
+        transcript_rows = [
+            {**row, "voice_session_id": session_ids[vapi_session_id]}
+            for (vapi_session_id, _), row in transcripts.items()
+            if vapi_session_id in session_ids
+        ]
+        if transcript_rows:
+            supabase.table("voice_transcripts").upsert(
+                transcript_rows,
+                on_conflict="voice_session_id,start_time_seconds",
+                ignore_duplicates=True
+            ).execute()
+            self.metrics["transcripts_written"] += len(transcript_rows)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_capacity": self.max_queue_size,
+            "running": self._writer_task is not None and not self._writer_task.done()
+        }
+
+
+# Shared ingestor instance
+vapi_webhook_ingestor = VapiWebhookIngestor()
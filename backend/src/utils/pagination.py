@@ -0,0 +1,48 @@
+"""
+Opaque cursors for keyset pagination on (created_at, id)
+"""
+
+import json
+import uuid
+import base64
+import binascii
+from typing import Tuple
+
+from dateutil.parser import isoparse
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+    pass
+
+
+def encode_cursor(created_at: str, row_id: str) -> str:
+    """Cursor pointing just past the row with this (created_at, id)"""
+    payload = json.dumps({"c": created_at, "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    (created_at, id) from a cursor. Both values are validated, since they
+    end up inside a PostgREST filter expression. Timestamps are parsed with
+    isoparse, which accepts any number of fractional digits (PostgREST trims
+    trailing zeros); datetime.fromisoformat only does before Python 3.11.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        created_at = isoparse(payload["c"]).isoformat()
+        row_id = str(uuid.UUID(payload["i"]))
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+    return created_at, row_id
+
+
+def keyset_filter(created_at: str, row_id: str, descending: bool = True) -> str:
+    """
+    PostgREST `or` expression selecting rows after the cursor in
+    (created_at, id) order, newest first unless descending is False.
+    """
+    op = "lt" if descending else "gt"
+    return f'created_at.{op}."{created_at}",and(created_at.eq."{created_at}",id.{op}.{row_id})'
@@ -99,6 +99,28 @@ def start_production():
         print(f"❌ Failed to start server: {e}")
         sys.exit(1)
 
+def start_worker():
+    """Start a background job worker (run as many as needed, independently of the API)"""
+    print("🚀 Starting SOLACE job worker...")
+    
+    # Change to backend directory
+    os.chdir(backend_dir)
+    
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    from rq import Worker
+    from config.job_queue import get_queue, get_queue_connection, TRANSCRIPTION_QUEUE
+    
+    queue_names = sys.argv[2:] or [TRANSCRIPTION_QUEUE]
+    print(f"📋 Listening on queues: {', '.join(queue_names)}")
+    
+    try:
+        worker = Worker([get_queue(name) for name in queue_names], connection=get_queue_connection())
+        worker.work()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down SOLACE job worker...")
+
 def main():
     """Main startup function"""
     print("🎯 SOLACE Backend - Python Edition")
@@ -114,7 +136,9 @@ def main():
     if len(sys.argv) > 1:
         mode = sys.argv[1].lower()
     
-    if mode in ["prod", "production"]:
+    if mode == "worker":
+        start_worker()
+    elif mode in ["prod", "production"]:
         if not env_exists:
             print("❌ .env file required for production mode")
             sys.exit(1)
@@ -0,0 +1,57 @@
+"""
+Silence trimming and segment export (synthetic PCM; no ffmpeg needed)
+"""
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+from services.audio_processing import find_speech_bounds, split_on_silence_boundaries
+
+
+def pcm(seconds_and_amplitudes, frame_rate=16000, channels=1):
+    rng = np.random.default_rng(0)
+    parts = [amplitude * rng.standard_normal(int(seconds * frame_rate) * channels)
+             for seconds, amplitude in seconds_and_amplitudes]
+    samples = np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16)
+    return AudioSegment(samples.tobytes(), frame_rate=frame_rate, sample_width=2, channels=channels)
+
+
+def sliced_speech_bounds(audio, frame_ms=10, threshold_db=-45.0, padding_ms=200):
+    """The pydub-slice detector the numpy version replaces"""
+    total_ms = len(audio)
+    levels = [audio[position:position + frame_ms].dBFS for position in range(0, total_ms, frame_ms)]
+    loud = [index for index, level in enumerate(levels) if level > threshold_db]
+    if not loud:
+        return 0, total_ms
+    return max(0, loud[0] * frame_ms - padding_ms), min(total_ms, (loud[-1] + 1) * frame_ms + padding_ms)
+
+
+@pytest.mark.parametrize("frame_rate,channels", [(16000, 1), (44100, 2), (22050, 1)])
+def test_speech_bounds_match_sliced_dbfs(frame_rate, channels):
+    audio = pcm([(1.234, 0), (0.5, 5), (2.0, 3000), (0.777, 2), (0.3, 0)], frame_rate, channels)
+    bounds = find_speech_bounds(audio)
+    assert bounds == sliced_speech_bounds(audio)
+    assert bounds[0] == pytest.approx(1534, abs=20)
+
+
+def test_speech_bounds_of_silence_keep_everything():
+    audio = pcm([(1.0, 0)])
+    assert find_speech_bounds(audio) == (0, len(audio))
+
+
+def test_segments_are_exported_with_the_requested_codec(tmp_path, monkeypatch):
+    audio = pcm([(3.0, 3000), (1.0, 0), (3.0, 3000)])
+    monkeypatch.setattr(AudioSegment, "from_file", classmethod(lambda cls, path: audio))
+    exports = []
+    monkeypatch.setattr(AudioSegment, "export", lambda self, path, **kwargs: exports.append((path, kwargs)))
+
+    segments = split_on_silence_boundaries(
+        "call.webm", str(tmp_path), max_segment_seconds=4, min_duration_seconds=1,
+        output_format="ogg", codec="libopus", bitrate="24k"
+    )
+
+    assert len(segments) == 2
+    assert [path for path, _ in exports] == [segment.file_path for segment in segments]
+    assert all(path.endswith(".ogg") for path, _ in exports)
+    assert all(kwargs == {"format": "ogg", "codec": "libopus", "bitrate": "24k"} for _, kwargs in exports)
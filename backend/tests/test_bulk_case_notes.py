@@ -0,0 +1,118 @@
+"""
+Bulk case note sync: a row the database rejects fails on its own
+"""
+
+import asyncio
+import uuid
+
+import httpx
+import pytest
+
+from services import case_notes_service as case_notes_module
+from services.case_notes_service import CaseNotesService
+
+
+class FakeQuery:
+    def __init__(self, table, rows=None):
+        self.table = table
+        self.rows = rows
+        self.keys = None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        return self
+
+    def in_(self, column, values):
+        self.keys = set(values)
+        return self
+
+    def execute(self):
+        if self.rows is None:
+            return type("Result", (), {"data": [row for row in self.table.stored if row["idempotency_key"] in self.keys]})
+        self.table.upserts += 1
+        if self.table.offline:
+            raise httpx.ConnectError("connection refused")
+        bad = [row for row in self.rows if "REJECT" in row["content"]]
+        if bad:
+            raise Exception(f'new row for relation "case_notes" violates check constraint ({bad[0]["idempotency_key"]})')
+        existing = {row["idempotency_key"] for row in self.table.stored}
+        created = [{**row, "id": str(uuid.uuid4())} for row in self.rows if row["idempotency_key"] not in existing]
+        self.table.stored.extend(created)
+        return type("Result", (), {"data": created})
+
+
+class FakeTable:
+    def __init__(self):
+        self.stored = []
+        self.upserts = 0
+        self.offline = False
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False):
+        return FakeQuery(self, rows)
+
+    def select(self, columns):
+        return FakeQuery(self)
+
+
+@pytest.fixture
+def notes_table(monkeypatch):
+    table = FakeTable()
+    monkeypatch.setattr(case_notes_module, "get_supabase", lambda: type("Supabase", (), {"table": lambda self, name: table})())
+    return table
+
+
+def make_notes(count, rejected=()):
+    return [
+        {"client_id": "client-1", "title": f"Note {i}", "idempotency_key": f"key-{i}",
+         "content": "REJECT me" if i in rejected else f"Home visit {i}"}
+        for i in range(count)
+    ]
+
+
+def test_rejected_rows_fail_alone_with_reason(notes_table):
+    service = CaseNotesService()
+    service.bulk_chunk_size = 8
+
+    response = asyncio.run(service.bulk_create_case_notes(make_notes(20, rejected={3, 12}), "user-1"))
+
+    statuses = [result["status"] for result in response["results"]]
+    assert statuses.count("created") == 18
+    assert [i for i, status in enumerate(statuses) if status == "failed"] == [3, 12]
+    assert "violates check constraint (key-3)" in response["results"][3]["error"]
+    assert len(notes_table.stored) == 18
+
+    # A retry stores the fixed rows and answers the others with their stored notes
+    retry = make_notes(20)
+    response = asyncio.run(service.bulk_create_case_notes(retry, "user-1"))
+    assert response["summary"] == {"total": 20, "created": 2, "existing": 18}
+
+
+def test_transport_errors_fail_the_chunk_without_bisecting(notes_table):
+    service = CaseNotesService()
+    service.bulk_chunk_size = 8
+    notes_table.offline = True
+
+    response = asyncio.run(service.bulk_create_case_notes(make_notes(8), "user-1"))
+
+    assert response["summary"] == {"total": 8, "failed": 8}
+    assert notes_table.upserts == 1
+
+
+def test_unstored_single_notes_stay_out_of_the_indexes(notes_table, monkeypatch):
+    indexed = []
+    monkeypatch.setattr(case_notes_module.semantic_search_service, "enqueue_notes", lambda notes: indexed.extend(notes))
+
+    async def check_and_add(note):
+        indexed.append(note)
+        return []
+
+    monkeypatch.setattr(case_notes_module.near_duplicate_index, "check_and_add", check_and_add)
+    service = CaseNotesService()
+
+    asyncio.run(service.create_case_note({"title": "Visit", "content": "Home visit", "client_id": "client-1"}, "user-1"))
+    assert indexed == []
+
+    asyncio.run(service.bulk_create_case_notes(make_notes(2), "user-1"))
+    assert {note["idempotency_key"] for note in indexed} == {"key-0", "key-1"}
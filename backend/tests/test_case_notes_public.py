@@ -0,0 +1,134 @@
+"""
+Routes mounted without the Bearer dependency, exercised through main.app so
+the router wiring in main.py is covered too
+"""
+
+import asyncio
+import os
+import time
+from urllib.parse import urlsplit
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+import main
+from routers import case_notes_public
+from services.tts_cache import tts_audio_cache
+from services.voice_service import voice_service
+from services.webhook_ingestion import vapi_webhook_ingestor
+
+# One second of 16 kHz 16-bit mono silence
+PCM_SECOND = b"\x00\x00" * 16000
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def fake_get_current_user(credentials):
+        if credentials.credentials != "valid-token":
+            raise HTTPException(status_code=401, detail="Invalid token")
+        return {"id": "user-1", "name": "Test Worker"}
+
+    monkeypatch.setattr(case_notes_public, "get_current_user", fake_get_current_user)
+    # The local stand-in provider needs no network
+    monkeypatch.delenv("STREAMING_TRANSCRIPTION_URL", raising=False)
+    monkeypatch.delenv("STREAMING_TRANSCRIPTION_PROVIDER", raising=False)
+    return TestClient(main.app)
+
+
+def test_voice_stream_websocket_transcribes(client):
+    url = "/api/case-notes/voice-sessions/session-1/stream?token=valid-token&auto_create_note=false"
+    with client.websocket_connect(url) as websocket:
+        ready = websocket.receive_json()
+        assert ready == {"type": "ready", "session_id": "session-1", "provider": "local"}
+
+        for _ in range(4):
+            websocket.send_bytes(PCM_SECOND)
+        websocket.send_json({"type": "stop"})
+
+        messages = []
+        while not messages or messages[-1]["type"] not in ("completed", "error"):
+            messages.append(websocket.receive_json())
+
+    completed = messages[-1]
+    assert completed["type"] == "completed"
+    assert [m for m in messages if m["type"] == "final"]
+    assert completed["transcript"]["transcript"]
+    assert completed["transcript"]["duration_seconds"] == pytest.approx(4.0)
+    assert "case_note" not in completed
+
+
+def test_voice_stream_websocket_rejects_bad_token(client):
+    url = "/api/case-notes/voice-sessions/session-1/stream?token=wrong"
+    with pytest.raises(WebSocketDisconnect) as excinfo:
+        with client.websocket_connect(url) as websocket:
+            websocket.receive_json()
+    assert excinfo.value.code == 4401
+
+
+@pytest.fixture
+def tts_url(monkeypatch, tmp_path):
+    monkeypatch.setattr(tts_audio_cache, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(tts_audio_cache, "_index", type(tts_audio_cache._index)())
+    monkeypatch.setattr(tts_audio_cache, "_total_bytes", 0)
+    monkeypatch.setattr(tts_audio_cache, "_loaded", False)
+    result = asyncio.run(voice_service.generate_tts("note-1", "Client asked about housing support."))
+    return result["tts_audio_url"]
+
+
+def test_tts_audio_plays_from_signed_url_without_auth_header(client, tts_url):
+    response = client.get(tts_url)
+    assert response.status_code == 200
+    assert response.content
+
+    # A repeat hit must not move Last-Modified, or clients never get a 304
+    time.sleep(1.1)
+    revalidated = client.get(tts_url, headers={"If-Modified-Since": response.headers["Last-Modified"]})
+    assert revalidated.status_code == 304
+
+
+def test_tts_audio_rejects_bad_or_missing_signature(client, tts_url):
+    path = urlsplit(tts_url).path
+    assert client.get(path).status_code == 422
+    assert client.get(f"{path}?expires={int(time.time()) + 60}&signature=forged").status_code == 403
+    expired = tts_audio_cache.signed_query(os.path.basename(path))
+    expired_at = int(time.time()) - 1
+    assert client.get(f"{path}?expires={expired_at}&signature={expired['signature']}").status_code == 403
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    events = []
+
+    async def fake_submit(payload):
+        events.append(payload)
+        return True
+
+    monkeypatch.setattr(vapi_webhook_ingestor, "secret", "vapi-secret")
+    monkeypatch.setattr(vapi_webhook_ingestor, "submit", fake_submit)
+    return events
+
+
+WEBHOOK_EVENT = {"session_id": "call-1", "event_type": "status-update", "timestamp": "2024-01-01T00:00:00Z",
+                 "data": {}, "status": "ended"}
+
+
+def test_vapi_webhook_accepts_server_secret_without_bearer(client, submitted):
+    response = client.post("/api/case-notes/webhooks/vapi/", json=WEBHOOK_EVENT, headers={"X-Vapi-Secret": "vapi-secret"})
+    assert response.status_code == 200
+    assert response.json()["status"] == "queued"
+    assert submitted == [WEBHOOK_EVENT]
+
+
+def test_vapi_webhook_rejects_missing_or_wrong_secret(client, submitted, monkeypatch):
+    url = "/api/case-notes/webhooks/vapi/"
+    assert client.post(url, json=WEBHOOK_EVENT).status_code == 401
+    assert client.post(url, json=WEBHOOK_EVENT, headers={"X-Vapi-Secret": "guess"}).status_code == 401
+    # A user's Bearer token is not a substitute for the Vapi secret
+    assert client.post(url, json=WEBHOOK_EVENT, headers={"Authorization": "Bearer valid-token"}).status_code == 401
+
+    # Without a configured secret every call is refused
+    monkeypatch.setattr(vapi_webhook_ingestor, "secret", None)
+    assert client.post(url, json=WEBHOOK_EVENT, headers={"X-Vapi-Secret": "vapi-secret"}).status_code == 401
+    assert submitted == []
@@ -0,0 +1,152 @@
+"""
+Incremental client summaries: stable chunking across pages and runs, and the
+stale fallback when Claude is unavailable
+"""
+
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from config.outbound_governor import CircuitOpenError
+from services import report_analysis_service as report_module
+from services.report_analysis_service import ReportAnalysisService
+
+
+class FakeQuery:
+    def __init__(self, db, table):
+        self.db, self.table = db, table
+        self.filters, self.after, self.limit_rows, self.keys, self.row = [], None, None, None, None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def neq(self, column, value):
+        return self
+
+    def or_(self, after):
+        self.after = after
+        return self
+
+    def order(self, column):
+        return self
+
+    def limit(self, rows):
+        self.limit_rows = rows
+        return self
+
+    def in_(self, column, values):
+        self.keys = set(values)
+        return self
+
+    def upsert(self, row, on_conflict=None):
+        self.row = row
+        return self
+
+    def execute(self):
+        rows = self.db[self.table]
+        if self.table == "case_summary_cache":
+            if self.row is not None:
+                rows[self.row["content_hash"]] = self.row
+                return type("Result", (), {"data": [self.row]})
+            return type("Result", (), {"data": [rows[key] for key in self.keys if key in rows]})
+        if self.table == "client_summaries":
+            if self.row is not None:
+                rows[:] = [self.row]
+                return type("Result", (), {"data": [self.row]})
+            return type("Result", (), {"data": list(rows)})
+        notes = sorted(rows, key=lambda note: (note["created_at"], note["id"]))
+        if self.after:
+            notes = [note for note in notes if (note["created_at"], note["id"]) > self.after]
+        self.db["pages_read"] += 1
+        return type("Result", (), {"data": notes[:self.limit_rows]})
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = {"case_notes": [], "client_summaries": [], "case_summary_cache": {}, "pages_read": 0}
+    supabase = type("Supabase", (), {"table": lambda self, name: FakeQuery(db, name)})()
+    monkeypatch.setattr(report_module, "get_supabase", lambda: supabase)
+    # Keyset filters are applied by the fake query as (created_at, id) tuples
+    monkeypatch.setattr(report_module, "keyset_filter", lambda created_at, note_id, descending: (created_at, note_id))
+    return db
+
+
+@pytest.fixture
+def service():
+    service = ReportAnalysisService()
+    service.client = object()
+    service.calls = []
+
+    async def create_message(**kwargs):
+        prompt = kwargs["messages"][0]["content"]
+        service.calls.append(prompt.split("\n", 1)[0])
+        text = hashlib.sha256(prompt.encode()).hexdigest()[:12]
+        return type("Response", (), {
+            "content": [type("Block", (), {"text": text})],
+            "usage": type("Usage", (), {"input_tokens": len(prompt), "output_tokens": 12})
+        })
+
+    service._create_message = create_message
+    return service
+
+
+def add_notes(db, start, count):
+    base = datetime(2024, 1, 1)
+    for i in range(start, start + count):
+        db["case_notes"].append({
+            "id": f"note-{i:04d}", "title": f"Visit {i}", "content": f"Discussed housing and benefits, visit {i}.",
+            "category": "general", "priority": "medium",
+            "created_at": (base + timedelta(hours=i)).isoformat()
+        })
+
+
+def chunk_calls(service):
+    return sum(1 for call in service.calls if call.startswith("Summarize these case notes"))
+
+
+def test_rebuild_reuses_chunks_of_incremental_runs_across_page_sizes(db, service):
+    service.summary_page_size = 7
+    add_notes(db, 0, 60)
+    first = asyncio.run(service.generate_client_case_summary("user-1", "client-1"))
+    assert first["status"] == "completed" and first["new_notes"] == 60
+    assert db["pages_read"] == 9
+
+    add_notes(db, 60, 60)
+    second = asyncio.run(service.generate_client_case_summary("user-1", "client-1"))
+    assert second["new_notes"] == 60 and second["notes_summarized"] == 120
+
+    # Same notes, different pages: only chunks that straddled a refresh's edges are new
+    service.calls.clear()
+    service.summary_page_size = 1000
+    rebuilt = asyncio.run(service.generate_client_case_summary("user-1", "client-1", rebuild=True))
+    assert rebuilt["notes_summarized"] == 120
+    assert chunk_calls(service) <= 2 < rebuilt["chunks"]
+
+    service.calls.clear()
+    service.summary_page_size = 13
+    again = asyncio.run(service.generate_client_case_summary("user-1", "client-1", rebuild=True))
+    assert chunk_calls(service) == 0
+    assert again["summary"] == rebuilt["summary"]
+
+
+def test_claude_failure_returns_the_stored_summary_as_stale(db, service):
+    add_notes(db, 0, 10)
+    stored = asyncio.run(service.generate_client_case_summary("user-1", "client-1"))
+
+    async def circuit_open(**kwargs):
+        raise CircuitOpenError("anthropic circuit is open, failing fast")
+
+    service._create_message = circuit_open
+    add_notes(db, 10, 5)
+    result = asyncio.run(service.generate_client_case_summary("user-1", "client-1"))
+
+    assert result["status"] == "stale"
+    assert result["summary"] == stored["summary"]
+    assert result["notes_summarized"] == 10
+    assert db["client_summaries"][0]["last_note_id"] == "note-0009"
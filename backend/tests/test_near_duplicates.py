@@ -0,0 +1,58 @@
+"""
+Near-duplicate index: removal and re-signing, locally and through Redis
+"""
+
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+
+from services import near_duplicates as near_duplicates_module
+from services.near_duplicates import NearDuplicateIndex
+
+VISIT = "Home visit with the client about rent arrears, the landlord's eviction notice and a referral to the housing advice service."
+EDITED = "Phone call with the school about attendance; the client agreed to a meeting with the head of year next Tuesday."
+
+
+def note(note_id, content):
+    return {"id": note_id, "social_worker_id": "worker-1", "client_id": "client-1", "title": "Visit", "content": content}
+
+
+@pytest.fixture(params=["local", "redis"])
+def index(request, monkeypatch):
+    if request.param == "redis":
+        client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        monkeypatch.setattr(near_duplicates_module, "get_redis", lambda: client)
+    else:
+        def no_redis():
+            raise RuntimeError("Redis client not initialized")
+        monkeypatch.setattr(near_duplicates_module, "get_redis", no_redis)
+    return NearDuplicateIndex()
+
+
+def matches(found):
+    return [match["case_note_id"] for match in found]
+
+
+def test_removed_notes_stop_matching(index):
+    async def scenario():
+        await index.check_and_add(note("a", VISIT))
+        assert matches(await index.check_and_add(note("b", VISIT + " Today."))) == ["a"]
+
+        await index.remove("a")
+        await index.remove("b")
+        assert await index.check_and_add(note("c", VISIT)) == []
+        await index.remove("missing")
+
+    asyncio.run(scenario())
+
+
+def test_updated_notes_match_on_their_new_text(index):
+    async def scenario():
+        await index.check_and_add(note("a", VISIT))
+        assert await index.update(note("a", EDITED)) == []
+
+        assert await index.check_and_add(note("b", VISIT)) == []
+        assert matches(await index.check_and_add(note("c", EDITED))) == ["a"]
+
+    asyncio.run(scenario())
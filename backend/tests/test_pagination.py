@@ -0,0 +1,32 @@
+"""
+Keyset pagination cursors
+"""
+
+import pytest
+
+from utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+ROW_ID = "3f2b8c1e-9a4d-4e6f-8b7a-1c2d3e4f5a6b"
+
+
+@pytest.mark.parametrize("created_at,expected", [
+    # PostgREST drops trailing zeros, so any number of fractional digits occurs
+    ("2024-03-01T10:15:30.1+00:00", "2024-03-01T10:15:30.100000+00:00"),
+    ("2024-03-01T10:15:30.12345+00:00", "2024-03-01T10:15:30.123450+00:00"),
+    ("2024-03-01T10:15:30.123456+00:00", "2024-03-01T10:15:30.123456+00:00"),
+    ("2024-03-01T10:15:30Z", "2024-03-01T10:15:30+00:00"),
+    ("2024-03-01T10:15:30.5", "2024-03-01T10:15:30.500000"),
+])
+def test_cursor_round_trip_normalises_timestamps(created_at, expected):
+    assert decode_cursor(encode_cursor(created_at, ROW_ID)) == (expected, ROW_ID)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    encode_cursor("yesterday", ROW_ID),
+    encode_cursor('2024-03-01T10:15:30",id.gt.0', ROW_ID),
+    encode_cursor("2024-03-01T10:15:30", "not-a-uuid"),
+])
+def test_invalid_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
@@ -0,0 +1,135 @@
+"""
+Resumable uploads: failed completion, abandoned partial files, slow chunks
+"""
+
+import asyncio
+import os
+import time
+
+import fakeredis.aioredis
+import pytest
+from redis.asyncio.client import Pipeline
+
+from services import resumable_upload as upload_module
+from services.resumable_upload import ResumableUploadService, UploadLockedError
+from services.voice_service import voice_service
+
+
+async def stream(*parts, delay=0.0):
+    for part in parts:
+        if delay:
+            await asyncio.sleep(delay)
+        yield part
+
+
+@pytest.fixture
+def service(monkeypatch, tmp_path):
+    monkeypatch.setattr(voice_service, "temp_dir", str(tmp_path))
+
+    async def probe_audio(file_path):
+        return {"duration_seconds": 1.0}
+
+    monkeypatch.setattr(voice_service, "probe_audio", probe_audio)
+    return ResumableUploadService()
+
+
+def test_failed_enqueue_keeps_the_upload_resumable(service, monkeypatch, tmp_path):
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("queue unavailable")
+
+    monkeypatch.setattr(upload_module, "enqueue_voice_upload", unavailable)
+
+    async def scenario():
+        upload = await service.create_upload("session-1", "user-1", "call.wav", 8)
+        upload_id = upload["upload_id"]
+        await service.append_chunk(upload_id, "session-1", "user-1", 0, stream(b"1234"))
+        with pytest.raises(ConnectionError):
+            await service.append_chunk(upload_id, "session-1", "user-1", 4, stream(b"5678"))
+
+        state = await service.get_upload(upload_id, "session-1", "user-1")
+        assert state["status"] == "uploading" and state["offset"] == 4
+        assert os.path.exists(state["file_path"])
+
+        monkeypatch.setattr(upload_module, "enqueue_voice_upload", lambda *args, **kwargs: type("Job", (), {"id": "job-1"}))
+        completed = await service.append_chunk(upload_id, "session-1", "user-1", 4, stream(b"5678"))
+        assert completed["status"] == "completed" and completed["job_id"] == "job-1"
+        with open(state["file_path"][:-len(".part")], "rb") as audio:
+            assert audio.read() == b"12345678"
+
+    asyncio.run(scenario())
+
+
+def test_sweep_removes_only_expired_partial_files(service, tmp_path):
+    async def scenario():
+        live = await service.create_upload("session-1", "user-1", "live.wav", 8)
+        live_path = (await service.get_upload(live["upload_id"], "session-1", "user-1"))["file_path"]
+        abandoned = tmp_path / "0b7c2a8e-5f7e-4a53-9a8e-2f1d8c0e6a11_old.wav.part"
+        abandoned.write_bytes(b"partial")
+        unrelated = tmp_path / "notes.part"
+        unrelated.write_bytes(b"keep")
+        stale = time.time() - service.ttl_seconds - 60
+        for path in (live_path, abandoned, unrelated):
+            os.utime(path, (stale, stale))
+
+        assert await service.sweep_stale_parts() == 1
+        assert not abandoned.exists()
+        assert os.path.exists(live_path) and unrelated.exists()
+
+    asyncio.run(scenario())
+
+
+def test_lock_is_extended_while_a_slow_chunk_arrives(service, monkeypatch):
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(upload_module, "get_redis", lambda: client)
+    service.lock_seconds = 1
+
+    async def scenario():
+        upload = await service.create_upload("session-1", "user-1", "call.wav", 10)
+        upload_id = upload["upload_id"]
+        # 2 seconds of data against a 1 second lock
+        result = await service.append_chunk(upload_id, "session-1", "user-1", 0, stream(*[b"ab"] * 4, delay=0.5))
+        assert result["offset"] == 8
+
+        # A writer whose lock was taken over stops instead of writing on
+        async def taken_over():
+            yield b"x"
+            await client.set(f"voice-upload:{upload_id}:lock", "other-writer")
+            await asyncio.sleep(0.4)
+            yield b"y"
+
+        with pytest.raises(UploadLockedError):
+            await service.append_chunk(upload_id, "session-1", "user-1", 8, taken_over())
+        state = await service.get_upload(upload_id, "session-1", "user-1")
+        assert state["offset"] == 8
+
+    asyncio.run(scenario())
+
+
+
+def test_release_never_deletes_a_lock_taken_over_by_another_writer(service, monkeypatch):
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(upload_module, "get_redis", lambda: client)
+    lock_key = "voice-upload:upload-1:lock"
+
+    async def scenario():
+        # Expired and re-acquired before the old writer releases
+        token = await service._acquire_lock("upload-1")
+        await client.delete(lock_key)
+        await client.set(lock_key, "other-writer")
+        await service._release_lock("upload-1", token)
+        assert await client.get(lock_key) == "other-writer"
+        await client.delete(lock_key)
+
+        # Expires and is re-acquired between the old writer's check and its delete
+        token = await service._acquire_lock("upload-1")
+        original_execute = Pipeline.execute
+
+        async def taken_over_before_execute(pipe, *args, **kwargs):
+            await client.set(lock_key, "other-writer")
+            return await original_execute(pipe, *args, **kwargs)
+
+        monkeypatch.setattr(Pipeline, "execute", taken_over_before_execute)
+        await service._release_lock("upload-1", token)
+        assert await client.get(lock_key) == "other-writer"
+
+    asyncio.run(scenario())
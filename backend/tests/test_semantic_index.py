@@ -0,0 +1,74 @@
+"""
+Several processes writing one index directory (API workers plus the build
+script) must never hand out the same row twice
+"""
+
+import multiprocessing
+import zlib
+
+import numpy as np
+
+from services.semantic_index import SemanticIndex
+
+DIM = 16
+WORKERS = 4
+NOTES_PER_WORKER = 200
+
+
+def vector_for(note_id):
+    rng = np.random.default_rng(zlib.crc32(note_id.encode()))
+    vector = rng.standard_normal(DIM).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def write_notes(directory, worker):
+    index = SemanticIndex(directory, DIM, "test")
+    for start in range(0, NOTES_PER_WORKER, 10):
+        ids = [f"w{worker}-n{i}" for i in range(start, start + 10)]
+        index.upsert([(note_id, f"owner-{worker}", None) for note_id in ids], np.stack([vector_for(i) for i in ids]))
+
+
+def test_concurrent_writers_share_one_index(tmp_path):
+    directory = str(tmp_path)
+    already_open = SemanticIndex(directory, DIM, "test")
+
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=write_notes, args=(directory, worker)) for worker in range(WORKERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    reopened = SemanticIndex(directory, DIM, "test")
+    assert len(reopened) == WORKERS * NOTES_PER_WORKER
+    assert reopened.stats()["rows"] == WORKERS * NOTES_PER_WORKER
+
+    for index in (reopened, already_open):
+        for worker in range(WORKERS):
+            for note_id in (f"w{worker}-n0", f"w{worker}-n{NOTES_PER_WORKER - 1}"):
+                (top_id, score), = index.search(vector_for(note_id), f"owner-{worker}", k=1)
+                assert top_id == note_id
+                assert score > 0.99
+
+
+def test_clear_empties_index_for_other_processes(tmp_path):
+    directory = str(tmp_path)
+    writer = SemanticIndex(directory, DIM, "test")
+    writer.upsert([("note-1", "owner-1", None)], np.stack([vector_for("note-1")]))
+    reader = SemanticIndex(directory, DIM, "test")
+    assert reader.search(vector_for("note-1"), "owner-1", k=1)[0][0] == "note-1"
+
+    writer.clear()
+    assert reader.search(vector_for("note-1"), "owner-1", k=1) == []
+
+    writer.upsert([("note-2", "owner-1", None)], np.stack([vector_for("note-2")]))
+    assert reader.search(vector_for("note-2"), "owner-1", k=1)[0][0] == "note-2"
+
+    # A rebuild that writes past the reader's old log offset before it searches again
+    writer.clear()
+    ids = [f"rebuilt-{i}" for i in range(10)]
+    writer.upsert([(note_id, "owner-1", None) for note_id in ids], np.stack([vector_for(i) for i in ids]))
+    assert reader.search(vector_for("rebuilt-7"), "owner-1", k=1)[0][0] == "rebuilt-7"
+    assert {note_id for note_id, _ in reader.search(vector_for("note-2"), "owner-1", k=20)} == set(ids)
+    assert len(reader) == 10
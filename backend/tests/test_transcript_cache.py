@@ -0,0 +1,58 @@
+"""
+Duplicate-audio reuse must stay within one social worker and client: the
+transcript is shared, the case note and client_id are not
+"""
+
+import asyncio
+import wave
+from collections import OrderedDict
+
+import pytest
+
+from services.case_notes_service import CaseNotesService
+from services.transcript_cache import transcript_cache
+from services.voice_service import voice_service
+
+
+@pytest.fixture
+def audio_path(monkeypatch, tmp_path):
+    monkeypatch.setattr(transcript_cache, "_local", OrderedDict())
+    monkeypatch.setattr(voice_service, "transcript_cache_enabled", True)
+    path = tmp_path / "visit.wav"
+    with wave.open(str(path), "wb") as audio:
+        audio.setnchannels(1)
+        audio.setsampwidth(2)
+        audio.setframerate(8000)
+        audio.writeframes(b"\x00\x00" * 8000)
+    return str(path)
+
+
+def transcribe_and_note(path, user_id, client_id):
+    async def run():
+        transcript = await voice_service.transcribe_audio_file(path, client_id)
+        note = await CaseNotesService().create_note_from_transcript(transcript, client_id, user_id)
+        return transcript, note
+    return asyncio.run(run())
+
+
+def test_identical_audio_from_another_user_gets_its_own_note(audio_path):
+    first_transcript, first_note = transcribe_and_note(audio_path, "user-1", "client-a")
+    second_transcript, second_note = transcribe_and_note(audio_path, "user-2", "client-b")
+
+    assert second_transcript["cached"]
+    assert second_transcript["transcript"] == first_transcript["transcript"]
+    assert second_transcript["client_id"] == "client-b"
+    assert second_transcript["session_id"] != first_transcript["session_id"]
+    assert "case_note" not in second_transcript
+    assert second_note["id"] != first_note["id"]
+    assert second_note["client_id"] == "client-b"
+    assert second_note["social_worker_id"] == "user-2"
+
+
+def test_retry_by_same_user_for_same_client_reuses_note(audio_path):
+    _, first_note = transcribe_and_note(audio_path, "user-1", "client-a")
+    _, other_client_note = transcribe_and_note(audio_path, "user-1", "client-b")
+    _, retried_note = transcribe_and_note(audio_path, "user-1", "client-a")
+
+    assert retried_note["id"] == first_note["id"]
+    assert other_client_note["id"] != first_note["id"]
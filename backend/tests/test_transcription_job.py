@@ -0,0 +1,41 @@
+"""
+rq workers never run the API lifespan, so each job must connect Redis itself
+"""
+
+import fakeredis
+
+from config import redis_client as redis_module
+from jobs import transcription
+from services.transcript_cache import transcript_cache
+from services.voice_service import voice_service
+
+
+def test_job_connects_redis_for_its_event_loop(monkeypatch, tmp_path):
+    clients = []
+
+    async def fake_init_redis():
+        client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        clients.append(client)
+        monkeypatch.setattr(redis_module, "redis_client", client)
+        return client
+
+    seen = []
+
+    async def fake_transcribe(file_path, client_id, session_id, content_hash):
+        seen.append(transcript_cache._redis())
+        return {"transcript": "hello", "client_id": client_id}
+
+    monkeypatch.setattr(redis_module, "redis_client", None)
+    monkeypatch.setattr(redis_module, "init_redis", fake_init_redis)
+    monkeypatch.setattr(voice_service, "transcribe_audio_file", fake_transcribe)
+
+    upload = tmp_path / "upload.wav"
+    for session_id in ("session-1", "session-2"):
+        upload.write_bytes(b"audio")
+        result = transcription.process_voice_upload(str(upload), session_id, None, "user-1", create_note=False)
+        assert result["transcript"]["transcript"] == "hello"
+        assert not upload.exists()
+
+    # One client per job, each used by the job's services
+    assert len(clients) == 2
+    assert seen == clients
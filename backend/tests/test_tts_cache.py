@@ -0,0 +1,90 @@
+"""
+TTS audio cache shared by several API workers through one directory
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from services.tts_cache import TTSAudioCache, tts_audio_cache
+from services.voice_service import voice_service
+
+
+@pytest.fixture
+def caches(tmp_path, monkeypatch):
+    monkeypatch.setenv("TTS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("TTS_CACHE_MAX_MB", str(3000 / 1024 / 1024))
+    return TTSAudioCache(), TTSAudioCache()
+
+
+def test_audio_written_by_one_worker_is_served_by_another(caches):
+    a, b = caches
+    assert b.path("k0.wav") is None  # b has scanned the directory already
+
+    a.put("k1.wav", b"x" * 1000)
+    path = b.path("k1.wav")
+    assert path and open(path, "rb").read() == b"x" * 1000
+    assert b.stats()["entries"] == 1
+
+
+def test_eviction_counts_files_from_every_worker(caches):
+    a, b = caches
+    a.put("k1.wav", b"1" * 1000)
+    b.put("k2.wav", b"2" * 1000)
+    # Make k1 the least recently used, whichever worker wrote it
+    past = time.time() - 60
+    os.utime(os.path.join(a.cache_dir, "k1.wav"), (past, past))
+
+    a.put("k3.wav", b"3" * 1500)
+
+    assert sorted(os.listdir(a.cache_dir)) == ["k2.wav", "k3.wav"]
+    assert b.path("k1.wav") is None
+    assert a.stats()["bytes"] == 2500
+
+
+def test_put_never_evicts_the_entry_just_written(caches):
+    a, _ = caches
+    a.put("big.wav", b"b" * 5000)
+    assert a.path("big.wav")
+
+
+def test_failed_synthesis_keeps_one_synthesis_per_key(tmp_path, monkeypatch):
+    monkeypatch.setattr(tts_audio_cache, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(tts_audio_cache, "_loaded", False)
+    running, peak, calls = [0], [0], [0]
+
+    def synthesize(text, speed):
+        calls[0] += 1
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        running[0] -= 1
+        if calls[0] == 1:
+            raise RuntimeError("synthesizer crashed")
+        return b"RIFF" + b"\x00" * 100
+
+    monkeypatch.setattr(voice_service, "_synthesize_speech", synthesize)
+
+    async def scenario():
+        later = []
+
+        async def first():
+            try:
+                await voice_service.generate_tts("note-1", "Same text")
+            except RuntimeError:
+                # Arrives after the failed caller released the lock, while another still waits on it
+                later.append(asyncio.create_task(voice_service.generate_tts("note-1", "Same text")))
+                raise
+
+        results = await asyncio.gather(first(), voice_service.generate_tts("note-1", "Same text"), return_exceptions=True)
+        results.append(await later[0])
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert isinstance(results[0], RuntimeError)
+    assert peak[0] == 1 and calls[0] == 2
+    assert results[2]["cached"] is True
+    assert voice_service._tts_locks == {} and voice_service._tts_lock_users == {}
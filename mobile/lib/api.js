@@ -251,6 +251,18 @@ class APIService {
     });
   }
 
+  /**
+   * Sync notes created offline in one request.
+   * Every note needs an idempotency_key (e.g. its local id), so a retried sync
+   * returns the stored notes instead of creating duplicates.
+   */
+  async bulkCreateCaseNotes(notes) {
+    return await this.makeRequest('/api/case-notes/bulk', {
+      method: 'POST',
+      body: { notes },
+    });
+  }
+
   /**
    * Start voice intake session
    */